@@ -0,0 +1,90 @@
+"""Geometry microbenchmark: operator cost and geometry allocations per frame.
+
+usage: python benchmarks/bench_geometry.py [--controls N]
+
+Prints the time per Point/Size operation and, for a form of N push buttons, the
+Point/Size/Rectangle constructions made by 20 mouse moves plus one full repaint.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'grusin')]
+
+import pygame as pg
+import grusin
+from grusin import Application, LON_SAMELINE, Panel, Point, PushButton, Rectangle, Size, UIRuntime
+
+
+def bench_operators(number: int=200000) -> None:
+    p, q, s = Point(3, 4), Point(5, 6), Size(7, 8)
+    cases = {
+        'Point + Point': lambda: p + q,
+        'Point - Size': lambda: p - s,
+        'Size * int': lambda: s * 2,
+        'Point + tuple': lambda: p + (1, 2),
+        'Point += Point': lambda: p.__iadd__(q),
+    }
+    for name, case in cases.items():
+        seconds: float = min(timeit.repeat(case, number=number, repeat=3))
+        print("{:<16} {:>8.1f} ns".format(name, seconds / number * 1e9))
+
+
+class Counter:
+    """Counts constructions of the geometry types while active."""
+
+    def __init__(self) -> None:
+        self.counts = {}
+        self._originals = {}
+
+    def __enter__(self) -> 'Counter':
+        for cls in (Point, Size, Rectangle):
+            original = cls.__init__
+            self._originals[cls] = original
+            self.counts[cls.__name__] = 0
+
+            def counting(instance, *args, _original=original, _name=cls.__name__, **kwargs):
+                self.counts[_name] += 1
+                _original(instance, *args, **kwargs)
+            cls.__init__ = counting
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for cls, original in self._originals.items():
+            cls.__init__ = original
+
+
+def bench_frame(controls: int) -> None:
+    with Application().setup(headless=True):
+        with Panel(name='form'):
+            grusin.this.size = Size(940, 520)
+            for _ in range(controls):
+                PushButton(layout=LON_SAMELINE)
+    rt: UIRuntime = UIRuntime()
+    rt.validate()
+    moves = [[pg.event.Event(pg.MOUSEMOTION, pos=(20 + i * 40, 20 + i * 20), rel=(40, 20), buttons=(0, 0, 0))]
+             for i in range(20)]
+    with Counter() as counter:
+        for events in moves:
+            rt.process_events(events)
+        rt.validate()
+    print("20 mouse moves + 1 repaint, {} buttons: {}".format(
+        controls, ", ".join("{} {}".format(count, name) for name, count in counter.counts.items())))
+    seconds: float = min(timeit.repeat(rt.validate, number=5, repeat=3)) / 5
+    print("full repaint: {:.1f} ms".format(seconds * 1000))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Geometry microbenchmark.")
+    parser.add_argument('--controls', type=int, default=400)
+    args = parser.parse_args(argv)
+    bench_operators()
+    bench_frame(args.controls)
+
+
+if __name__ == '__main__':
+    main()
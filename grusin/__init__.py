@@ -1,12 +1,32 @@
 import ast
+import asyncio
+import bisect
 import io
+import marshal
+import mmap
+import os
 import sys
+import threading
+import time
+import warnings
+import zlib
 import pygame as pg
-from collections import OrderedDict
+from abc import ABCMeta, abstractmethod
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any, Tuple, Optional, Union, List, Callable, Dict, Type
+from operator import attrgetter
+from typing import Any, Tuple, Optional, Union, List, Callable, Dict, Type, Iterable, Sequence
 from enum import IntFlag, Enum, IntEnum
+from types import MappingProxyType
 from skin import DEFAULT_SKIN
+from skinc import load_skin, validate_skin
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 DEFAULT = object()
 
@@ -17,9 +37,15 @@ MB_RIGHT = 3
 MB_WHEEL_UP = 4
 MB_WHEEL_DOWN = 5
 
+# user events
+UE_INVOKE = pg.USEREVENT + 0    # wakes the main loop when work is queued by UIRuntime.invoke*
+
 class GrUsInRendererError(Exception):
     pass
 
+class SkinReloadWarning(UserWarning):
+    pass
+
 class Message(IntEnum):
     # Mouse related
     MOUSE_FIRST = 0x1
@@ -80,7 +106,11 @@ class Message(IntEnum):
     INITIALIZE = CONTROL_FIRST + 12
     TEXTCHANGED = CONTROL_FIRST + 13
     SIZECHANGED = CONTROL_FIRST + 14
-    CONTROL_LAST = CONTROL_FIRST + 14
+    DESTROYED = CONTROL_FIRST + 15
+    WORK_COMPLETED = CONTROL_FIRST + 16
+    SCROLLED = CONTROL_FIRST + 17
+    SKINCHANGED = CONTROL_FIRST + 18
+    CONTROL_LAST = CONTROL_FIRST + 18
 
     # App related
     APP_FIRST = 0xA0
@@ -383,6 +413,348 @@ class LayoutCursor:
         return [(self._controls[i], self._layout[i]) for i in range(len(self))].__iter__()
 
 
+class ControlList:
+    """Ordered collection of controls (children, topmost controls), back to front.
+
+    Every control gets an increasing order key; the keys are kept sorted, so membership
+    is O(1) and index() a bisection. remove() and move_to_end() (bring to front) leave a
+    tombstone in place of the control instead of shifting the list: meanwhile a Fenwick
+    tree of the live slots keeps index() and indexing O(log n). The tombstones are
+    compacted, in O(n), by the next iteration (itself O(n)) or once they outnumber the
+    controls.
+    """
+
+    __slots__ = '_items', '_order', '_keys', '_next_key', '_version', '_live', '_dead'
+
+    def __init__(self, controls: Any=()) -> None:
+        self._items: List[Optional['Control']] = []     # the controls, in order; None when removed
+        self._order: List[int] = []            # their order keys, ascending
+        self._keys: Dict['Control', int] = {}
+        self._next_key: int = 0
+        self._version: int = 0                 # bumped on every change
+        self._live: Optional[List[int]] = None     # Fenwick tree of the live slots, while tombstones exist
+        self._dead: int = 0                    # tombstones
+        for control in controls:
+            self.append(control)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, control: 'Control') -> bool:
+        return control in self._keys
+
+    def __iter__(self):
+        if self._dead:
+            self._compact()
+        return self._items.__iter__()
+
+    def __reversed__(self):
+        if self._dead:
+            self._compact()
+        return self._items.__reversed__()
+
+    def __getitem__(self, index: Union[int, slice]) -> Union['Control', List['Control']]:
+        if not self._dead:
+            return self._items[index]
+        if isinstance(index, slice):
+            self._compact()
+            return self._items[index]
+        count: int = len(self._keys)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("ControlList index out of range.")
+        return self._items[self._find(index)]
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def append(self, control: 'Control') -> None:
+        if control in self._keys:
+            raise ValueError("Control already in the list.")
+        self._keys[control] = self._next_key
+        self._order.append(self._next_key)
+        self._items.append(control)
+        self._next_key += 1
+        self._version += 1
+        if self._live is not None:
+            # the new node covers the slots (position - lowbit, position]
+            position: int = len(self._items)
+            covered: int = self._count_before(position - 1) - self._count_before(position - (position & -position))
+            self._live.append(covered + 1)
+
+    def index(self, control: 'Control') -> int:
+        if control not in self._keys:
+            raise ValueError("Control not in the list.")
+        position: int = bisect.bisect_left(self._order, self._keys[control])
+        return self._count_before(position) if self._dead else position
+
+    def remove(self, control: 'Control') -> None:
+        if control not in self._keys:
+            raise ValueError("Control not in the list.")
+        position: int = bisect.bisect_left(self._order, self._keys.pop(control))
+        self._items[position] = None
+        self._dead += 1
+        self._version += 1
+        if self._dead > len(self._keys):
+            self._compact()
+            return
+        if self._live is None:
+            self._build_live()
+        else:
+            tree: List[int] = self._live
+            position += 1
+            while position < len(tree):
+                tree[position] -= 1
+                position += position & -position
+
+    def move_to_end(self, control: 'Control') -> None:
+        if self._items and self._items[-1] is control:
+            return
+        self.remove(control)
+        self.append(control)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._order.clear()
+        self._keys.clear()
+        self._live = None
+        self._dead = 0
+        self._version += 1
+
+    def _build_live(self) -> None:
+        tree: List[int] = [0] * (len(self._items) + 1)
+        for position, control in enumerate(self._items, 1):
+            if control is not None:
+                tree[position] += 1
+            parent: int = position + (position & -position)
+            if parent < len(tree):
+                tree[parent] += tree[position]
+        self._live = tree
+
+    def _count_before(self, position: int) -> int:
+        # live controls in the slots [0, position)
+        tree: List[int] = self._live
+        count: int = 0
+        while position > 0:
+            count += tree[position]
+            position &= position - 1
+        return count
+
+    def _find(self, index: int) -> int:
+        # the slot of the index-th live control
+        tree: List[int] = self._live
+        position: int = 0
+        step: int = 1 << (len(tree) - 1).bit_length()
+        while step:
+            node: int = position + step
+            if node < len(tree) and tree[node] <= index:
+                position = node
+                index -= tree[node]
+            step >>= 1
+        return position
+
+    def _compact(self) -> None:
+        items: List[Optional[Control]] = self._items
+        self._order = [key for key, control in zip(self._order, items) if control is not None]
+        self._items = [control for control in items if control is not None]
+        self._live = None
+        self._dead = 0
+
+
+class NameIndex:
+    """Name to control map of a sequence of controls.
+
+    Each name keeps the controls registered under it, in registration order; with
+    repeated names the earliest registered one is found. Adding, removing and renaming
+    cost O(1) for unique names.
+    """
+
+    __slots__ = '_names',
+
+    def __init__(self) -> None:
+        self._names: Dict[str, List['Control']] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def get(self, name: str) -> Optional['Control']:
+        controls: Optional[List[Control]] = self._names.get(name)
+        return controls[0] if controls else None
+
+    def add(self, control: 'Control') -> None:
+        controls: Optional[List[Control]] = self._names.get(control._name)
+        if controls is None:
+            self._names[control._name] = [control]
+        elif control not in controls:
+            controls.append(control)
+
+    def remove(self, control: 'Control', name: Optional[str]=None) -> None:
+        name = control._name if name is None else name
+        controls: Optional[List[Control]] = self._names.get(name)
+        if controls is None:
+            return
+        if len(controls) == 1:
+            if controls[0] is control:
+                del self._names[name]
+        elif control in controls:
+            controls.remove(control)
+
+    def rename(self, control: 'Control', previous: str) -> None:
+        self.remove(control, previous)
+        self.add(control)
+
+    def clear(self) -> None:
+        self._names.clear()
+
+
+def find_path(root: Any, path: str) -> Optional['Control']:
+    # resolves 'name/name/...' from root's find_by_name; non-clients are reachable too
+    control: Any = root
+    for name in path.strip('/').split('/'):
+        found: Optional[Control] = control.find_by_name(name) if hasattr(control, 'find_by_name') else None
+        if found is None and isinstance(control, Control):
+            found = control._nonclients.get(name)
+        if found is None:
+            return None
+        control = found
+    return control
+
+
+# lyt
+LAYOUT_BATCH_THRESHOLD = 64     # below this many controls the plain loop beats building arrays
+
+
+def layout_flow(cursor: LayoutCursor, members: Any, left: int, top: int) -> Tuple[List['Control'], Any, Any, int, int]:
+    """Places the visible members of a layout sequence following the LayoutNext rules.
+
+    Returns the placed controls, their x and y coordinates (in the same order) and the
+    right/bottom extent of the placed content. The controls are not modified. members
+    must support fast membership tests (a ControlList or a set).
+    """
+    controls: List[Control] = []
+    codes: List[int] = []
+    widths: List[int] = []
+    heights: List[int] = []
+    margins: Tuple[List[int], ...] = ([], [], [], [])
+    ml, mt, mr, mb = (column.append for column in margins)
+    for control, layout in cursor:
+        if control._visible and control in members:
+            size: Size = control.measure()
+            margin: Spacing = control._margin
+            controls.append(control)
+            codes.append(layout.value)
+            widths.append(size.width)
+            heights.append(size.height)
+            ml(margin.left)
+            mt(margin.top)
+            mr(margin.right)
+            mb(margin.bottom)
+
+    if not controls:
+        return controls, [], [], left, top
+
+    if np is not None and len(controls) >= LAYOUT_BATCH_THRESHOLD and LON_MANUAL.value not in codes:
+        xs, ys, right, bottom = _solve_layout_batch(codes, widths, heights, margins, left, top)
+    else:
+        xs, ys, right, bottom = _solve_layout(controls, codes, widths, heights, margins, left, top)
+    return controls, xs, ys, right, bottom
+
+
+def place_controls(controls: List['Control'], xs: Any, ys: Any) -> None:
+    """Writes the solved coordinates back to the controls' bounds."""
+    if np is not None and isinstance(xs, np.ndarray):
+        xs, ys = xs.tolist(), ys.tolist()
+    for control, x, y in zip(controls, xs, ys):
+        bounds: Rectangle = control._bounds
+        bounds._left = x
+        bounds._top = y
+    ControlBounds.generation += 1
+    if controls:
+        controls[0]._drop_scroll_backing()     # they are siblings
+
+
+def _solve_layout(controls: List['Control'], codes: List[int], widths: List[int], heights: List[int],
+                  margins: Tuple[List[int], ...], left: int, top: int) -> Tuple[List[int], List[int], int, int]:
+    sameline, below, newline, cascade = LON_SAMELINE.value, LON_BELOW.value, LON_NEWLINE.value, LON_CASCADE.value
+    lefts, tops, rights, bottoms = margins
+    xs: List[int] = []
+    ys: List[int] = []
+    bottom: int = top
+    extent_right: int = left
+    extent_bottom: int = top
+    px = py = pw = ph = pl = pt = pr = pb = 0
+    for i, code in enumerate(codes):
+        w, h, ml, mt, mr, mb = widths[i], heights[i], lefts[i], tops[i], rights[i], bottoms[i]
+        if i == 0 or code == newline:
+            x, y = left + ml, bottom + mt
+        elif code == sameline:
+            x, y = px + pw + pr + ml, py - pt + mt
+        elif code == below:
+            x, y = px - pl + ml, py + ph + pb + mt
+        elif code == cascade:
+            x, y = px + 32, py + 32
+        else:
+            x, y = controls[i]._bounds.left, controls[i]._bounds.top     # LON_MANUAL: keep it where it is
+            extent_bottom = max(extent_bottom, y + h + mb)
+
+        if code != LON_MANUAL.value:
+            bottom = max(bottom, y + h + mb)
+        extent_right = max(extent_right, x + w + mr)
+        xs.append(x)
+        ys.append(y)
+        px, py, pw, ph, pl, pt, pr, pb = x, y, w, h, ml, mt, mr, mb
+
+    return xs, ys, extent_right, max(extent_bottom, bottom)
+
+
+def _solve_layout_batch(codes: List[int], widths: List[int], heights: List[int],
+                        margins: Tuple[List[int], ...], left: int, top: int) -> Tuple[Any, Any, int, int]:
+    # same rules as _solve_layout, for sequences without LON_MANUAL.
+    # Every NEWLINE (and the first control) starts a segment; inside a segment each
+    # coordinate is the previous one plus a delta, so both axes are segmented prefix
+    # sums. The row bottom a NEWLINE starts from is itself a prefix sum over segments.
+    code = np.array(codes, dtype=np.int32)
+    w = np.array(widths, dtype=np.int32)
+    h = np.array(heights, dtype=np.int32)
+    ml, mt, mr, mb = np.array(margins, dtype=np.int32)
+
+    start = code == LON_NEWLINE.value
+    start[0] = True
+    starts = np.flatnonzero(start)
+    segment = np.cumsum(start) - 1
+
+    nxt = code[1:]
+    sameline = nxt == LON_SAMELINE.value
+    below = nxt == LON_BELOW.value
+    dx = np.empty_like(w)
+    dy = np.empty_like(w)
+    dx[1:] = np.where(sameline, w[:-1] + mr[:-1] + ml[1:], np.where(below, ml[1:] - ml[:-1], 32))
+    dy[1:] = np.where(sameline, mt[1:] - mt[:-1], np.where(below, h[:-1] + mb[:-1] + mt[1:], 32))
+    dx[start] = left + ml[start]
+    dy[start] = 0
+
+    def segmented_cumsum(delta):
+        total = np.cumsum(delta)
+        return total - (total - delta)[starts][segment]
+
+    xs = segmented_cumsum(dx)
+    rel_y = segmented_cumsum(dy)    # relative to the segment's first control
+
+    seg_bottom = np.maximum.reduceat(rel_y + h + mb, starts)
+    seg_top = mt[starts]
+    row_bottom = np.empty(len(starts), dtype=np.int64)
+    row_bottom[0] = top
+    np.cumsum(np.maximum(0, seg_top + seg_bottom)[:-1], out=row_bottom[1:])
+    row_bottom[1:] += top
+    ys = rel_y + (row_bottom + seg_top)[segment]
+
+    extent_right = max(left, int((xs + w + mr).max()))
+    extent_bottom = max(top, int((ys + h + mb).max()))
+    return xs, ys, extent_right, extent_bottom
+
+
 # rndr
 class RendererBase:
 
@@ -396,6 +768,7 @@ class RendererBase:
         self._skin: Namespace = None
         self._cliprect_stack: List['Rectangle'] = []
         self._invalidated: List[pg.Rect] = []
+        self._latency: Optional['LatencyMonitor'] = None
         self._render_methods: Dict[str, str] = {
             'PushButton': 'PushButton',
             'CheckBox': 'CheckBox',
@@ -408,46 +781,73 @@ class RendererBase:
             'VSDownButton': 'VSButton',
             'HSlider': 'Slider',
             'VSlider': 'Slider',
+            'VirtualListBox': 'ListBox',
+            'ListRow': 'ListRow',
+            'TextView': 'TextView',
+            'LogConsole': 'LogConsole',
+            'DataGrid': 'DataGrid',
         }
-        if isinstance(skin, (dict, OrderedDict)):
-            self._skin = Namespace(**skin)
-        elif isinstance(skin, str):
-            self._skin = Namespace.load(skin)
-        elif isinstance(skin, Namespace):
-            self._skin = skin
-        else:
-            raise TypeError("Unsupported value type: {cls}".format(cls=skin.__class__.__name__))
-
-        self._guifont: Namespace = Namespace()
-        self._textfont: Namespace = Namespace()
-        self._codefont: Namespace = Namespace()
-        self._images: List[pg.Surface] = []
-
-        if len(self._skin.metrics.image.skin.filenames) != 0:
-            for filename in self._skin.metrics.image.skin.filenames:
-                image: pg.Surface = pg.image.load(filename)
-                self._images.append(image)
-
-        self._icons: pg.Surface = None
-        if self._skin.metrics.image.iconset.using:
-            self._icons = pg.image.load(self._skin.metrics.image.iconset.filename)
-
-        for sizename in self._skin.metrics.font.size:
-            size = self._skin.metrics.font.size[sizename]
-            if self._skin.metrics.font.gui.is_sysfont:
-                self._guifont[sizename] = pg.font.SysFont(self._skin.metrics.font.gui.name, size)
+        # per control class: skin values read on every construction/measure
+        self._layout_defaults: Dict[Type, Tuple[tuple, tuple, tuple, bool]] = {}
+        self._text_styles: Dict[Tuple[Type, str], Tuple[pg.font.Font, bool, bool, bool]] = {}
+        # per skin element: state name -> Palette
+        self._palettes: Dict[str, Dict[str, 'Palette']] = {}
+        self._skin = self._to_skin(skin)
+
+        self._erase_color: Color = Color(*self._skin.metrics.default.erase_color)
+        self._build_palettes()
+
+        self._guifont: Namespace
+        self._textfont: Namespace
+        self._codefont: Namespace
+        self._guifont, self._textfont, self._codefont = self._load_fonts(self._skin)
+        self._images: List[pg.Surface]
+        self._icons: Optional[pg.Surface]
+        self._images, self._icons = self._load_images(self._skin)
+
+    @staticmethod
+    def _load_images(skin: 'FrozenNamespace') -> Tuple[List[pg.Surface], Optional[pg.Surface]]:
+        images: List[pg.Surface] = []
+        for filename in skin.metrics.image.skin.filenames:
+            images.append(pg.image.load(filename))
+
+        icons: Optional[pg.Surface] = None
+        if skin.metrics.image.iconset.using:
+            icons = pg.image.load(skin.metrics.image.iconset.filename)
+        return images, icons
+
+    @staticmethod
+    def _load_fonts(skin: 'FrozenNamespace') -> Tuple['Namespace', 'Namespace', 'Namespace']:
+        guifont: Namespace = Namespace()
+        textfont: Namespace = Namespace()
+        codefont: Namespace = Namespace()
+        for sizename in skin.metrics.font.size:
+            size = skin.metrics.font.size[sizename]
+            if skin.metrics.font.gui.is_sysfont:
+                guifont[sizename] = pg.font.SysFont(skin.metrics.font.gui.name, size)
             else:
-                self._guifont[sizename] = pg.font.Font(self._skin.metrics.font.gui.path, size)
+                guifont[sizename] = pg.font.Font(skin.metrics.font.gui.path, size)
 
-            if self._skin.metrics.font.text.is_sysfont:
-                self._textfont[sizename] = pg.font.SysFont(self._skin.metrics.font.text.name, size)
+            if skin.metrics.font.text.is_sysfont:
+                textfont[sizename] = pg.font.SysFont(skin.metrics.font.text.name, size)
             else:
-                self._textfont[sizename] = pg.font.Font(self._skin.metrics.font.text.path, size)
+                textfont[sizename] = pg.font.Font(skin.metrics.font.text.path, size)
 
-            if self._skin.metrics.font.code.is_sysfont:
-                self._codefont[sizename] = pg.font.SysFont(self._skin.metrics.font.code.name, size)
+            if skin.metrics.font.code.is_sysfont:
+                codefont[sizename] = pg.font.SysFont(skin.metrics.font.code.name, size)
             else:
-                self._codefont[sizename] = pg.font.Font(self._skin.metrics.font.code.path, size)
+                codefont[sizename] = pg.font.Font(skin.metrics.font.code.path, size)
+        return guifont, textfont, codefont
+
+    @staticmethod
+    def _to_skin(skin: Union[dict, OrderedDict, str, 'Namespace']) -> 'FrozenNamespace':
+        if isinstance(skin, (dict, OrderedDict)):
+            return FrozenNamespace(**skin)
+        elif isinstance(skin, str):
+            return FrozenNamespace(**load_skin(skin))    # compiled when up to date, see skinc.py
+        elif isinstance(skin, Namespace):
+            return type(skin).freeze(skin)     # through the class: an entry may be named 'freeze'
+        raise TypeError("Unsupported value type: {cls}".format(cls=skin.__class__.__name__))
 
     @property
     def gui_font(self) -> 'Namespace':
@@ -463,7 +863,7 @@ class RendererBase:
 
     @property
     def erase_color(self) -> 'Color':
-        return Color(*self._skin.metrics.default.erase_color)
+        return self._erase_color
 
     @property
     def default(self) -> 'Namespace':
@@ -471,7 +871,10 @@ class RendererBase:
 
     @erase_color.setter
     def erase_color(self, value: Union['Color', Tuple[int, int, int]]) -> None:
-        self._skin.metrics.default.erase_color = value[0], value[1], value[2]
+        skin: Namespace = FrozenNamespace.thaw(self._skin)
+        skin.metrics.default.erase_color = value[0], value[1], value[2]
+        self._skin = skin.freeze()
+        self._erase_color = Color(value[0], value[1], value[2])
 
     def get_element(self, control: 'Control') -> Optional['Namespace']:
         clsname = control.__class__.__name__
@@ -479,6 +882,98 @@ class RendererBase:
             return self._skin[self._render_methods[clsname]]
         return None
 
+    def get_layout_defaults(self, control: 'Control') -> Tuple[tuple, tuple, tuple, bool]:
+        """The control class' skin margin, padding, size and fit, resolved once per class."""
+        defaults: Optional[Tuple[tuple, tuple, tuple, bool]] = self._layout_defaults.get(control.__class__)
+        if defaults is None:
+            layout: Namespace = self.get_element(control).layout
+            defaults = (tuple(layout.margin), tuple(layout.padding), tuple(layout.size),
+                        bool('fit' in layout and layout.fit))
+            self._layout_defaults[control.__class__] = defaults
+        return defaults
+
+    def get_palette(self, control: 'Control') -> 'Palette':
+        """The colours of the control's element for its current state."""
+        return self._palettes[self._render_methods[control.__class__.__name__]][control.get_state()]
+
+    def _build_palettes(self, element_names: Optional[set]=None) -> None:
+        if element_names is None:
+            self._palettes.clear()
+            element_names = set(self._render_methods.values())
+        self._palettes.update(self._make_palettes(self._skin, element_names))
+
+    @staticmethod
+    def _make_palettes(skin: 'FrozenNamespace', element_names: Iterable[str]) -> Dict[str, Dict[str, 'Palette']]:
+        palettes: Dict[str, Dict[str, Palette]] = {}
+        for element_name in element_names:
+            if element_name not in skin:
+                continue
+            element: Namespace = skin[element_name]
+            states: Dict[str, Palette] = {}
+            for state in ('normal',) + tuple(PALETTE_DERIVED):
+                if state in element:
+                    states[state] = Palette.from_state(element[state])
+            normal: Palette = states.setdefault('normal', Palette.from_state(Namespace()))
+            for state, (toward, ratio) in PALETTE_DERIVED.items():
+                if state not in states:
+                    states[state] = normal.mix(toward, ratio)
+            palettes[element_name] = states
+        return palettes
+
+    def clear_caches(self) -> None:
+        """Forgets the per-class skin values and rebuilds the palettes; call it after changing the skin."""
+        self._layout_defaults.clear()
+        self._text_styles.clear()
+        self._erase_color = Color(*self._skin.metrics.default.erase_color)
+        self._build_palettes()
+
+    def reload_skin(self, skin: Union[dict, OrderedDict, str, 'Namespace']) -> set:
+        """Swaps in a new skin, dropping only what depends on the elements that differ.
+
+        Returns the names of the affected elements; see UIRuntime.apply_skin()."""
+        old: FrozenNamespace = self._skin
+        new: FrozenNamespace = self._to_skin(skin)
+        names: set = set(self._render_methods.values())
+        # everything the new skin needs is loaded first: if any of it raises, the old skin stays whole
+        images: Tuple[List[pg.Surface], Optional[pg.Surface]] = self._images, self._icons
+        fonts: Tuple[Namespace, Namespace, Namespace] = self._guifont, self._textfont, self._codefont
+        erase_color: Color = self._erase_color
+        if old.metrics != new.metrics:
+            if old.metrics.image != new.metrics.image:
+                images = self._load_images(new)
+            if old.metrics.font != new.metrics.font:
+                fonts = self._load_fonts(new)
+            erase_color = Color(*new.metrics.default.erase_color)
+            changed: set = names    # fonts and defaults reach every element
+        else:
+            changed = {name for name in names if old._dict.get(name) != new._dict.get(name)}
+        if not changed:
+            self._skin = new
+            return changed
+        palettes: Dict[str, Dict[str, Palette]] = self._make_palettes(new, changed)
+        for name in changed:
+            if name in new:
+                # what get_layout_defaults() and get_font() read later, outside any error handling
+                element: Namespace = new[name]
+                for key in ('margin', 'padding', 'size'):
+                    if key not in element.layout:
+                        raise KeyError("{}.layout: missing '{}'.".format(name, key))
+                if element.style.size not in fonts[0]:
+                    raise KeyError("{}.style.size: no font size '{}'.".format(name, element.style.size))
+
+        self._skin = new
+        self._images, self._icons = images
+        self._guifont, self._textfont, self._codefont = fonts
+        self._erase_color = erase_color
+        for cls in [cls for cls in self._layout_defaults if self._render_methods.get(cls.__name__) in changed]:
+            del self._layout_defaults[cls]
+        for key in [key for key in self._text_styles if self._render_methods.get(key[0].__name__) in changed]:
+            del self._text_styles[key]
+        for name in changed:
+            self._palettes.pop(name, None)
+        self._palettes.update(palettes)
+        return changed
+
     def get_render_layers(self, control: 'Control') -> RenderLayer:
         layers: RenderLayer = RL_NONE
         element: Optional[Namespace] = self.get_element(control)
@@ -487,37 +982,54 @@ class RendererBase:
                 layers |= RenderLayer[layer_flag]
         return layers
 
+    def get_font(self, control: 'Control', kind: str='gui') -> pg.font.Font:
+        """The font of the given kind ('gui', 'text' or 'code'), styled for the control's element."""
+        style: Optional[Tuple[pg.font.Font, bool, bool, bool]] = self._text_styles.get((control.__class__, kind))
+        if style is None:
+            element: Namespace = self.get_element(control)
+            font: pg.font.Font = {
+                'gui': self._guifont,
+                'text': self._textfont,
+                'code': self._codefont
+            }.get(kind, self._guifont)[element.style.size]
+            style = font, element.style.bold, element.style.italic, element.style.underline
+            self._text_styles[(control.__class__, kind)] = style
+        font, bold, italic, underline = style
+        font.set_bold(bold)
+        font.set_italic(italic)
+        font.set_underline(underline)
+        return font
+
     def measure_text(self, control: 'Control', text: str, **kwargs) -> 'Size':
-        element: Namespace = self.get_element(control)
-        fontkey: str = kwargs.get('kind', 'gui')
-        font: pg.font.Font = {
-            'gui': self._guifont,
-            'text': self._textfont,
-            'code': self._codefont
-        }.get(fontkey, self._guifont)[element.style.size]
-        font.set_bold(element.style.bold)
-        font.set_italic(element.style.italic)
-        font.set_underline(element.style.underline)
-        return Size(*font.size(text))
+        return Size(*self.get_font(control, kwargs.get('kind', 'gui')).size(text))
+
+    def render_text(self, control: 'Control', text: str, kind: str='gui') -> pg.Surface:
+        """The text rasterized in the control's font and current text colour."""
+        return self.get_font(control, kind).render(text, True, self.get_palette(control).color)
 
     def add_renderer(self, cls_name: str, element: str) -> None:
-        if cls not in self._render_methods:
-            self._render_methods[cls] = element
+        if cls_name not in self._render_methods:
+            self._render_methods[cls_name] = element
+            self._build_palettes({element})
 
-    def clear(self, color: 'Color') -> None:
-        pg.display.get_surface().fill(color)
+    def clear(self, color: Union['Color', Tuple[int, int, int]]) -> None:
+        pg.display.get_surface().fill(color.color if isinstance(color, Color) else color)
 
     def add_invalidated_rect(self, rect: 'Rectangle') -> None:
-        self._invalidated.append(pg.Rect(*rect))
+        self._invalidated.append(pg.Rect(rect._left, rect._top, rect._width, rect._height))
 
     def flip(self) -> None:
         self._invalidated.clear()
         pg.display.flip()
+        if self._latency is not None:
+            self._latency.presented()
 
     def update(self) -> None:
         if self._invalidated:
             pg.display.update(self._invalidated)
             self._invalidated.clear()
+        if self._latency is not None:
+            self._latency.presented()
 
     def get_render_target(self) -> Any:
         return pg.display.get_surface()
@@ -564,8 +1076,7 @@ class RendererBase:
     #renderfuncs
     def render_pushbutton(self, control: 'PushButton', element: 'Namespace', surface: pg.Surface,
                           render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
-        state: str = control.get_state()
-        button: Namespace = element[state]
+        button: Palette = self.get_palette(control)
         
         if layer is RL_ABOVE_BACKGROUND or layer is RL_BELOW_FOREGROUND:
             font: pg.font.Font = self.gui_font[element.style.size]
@@ -586,8 +1097,7 @@ class RendererBase:
 
     def render_buttongroup(self, control: 'ButtonGroup', element: 'Namespace', surface: pg.Surface,
                           render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
-        state: str = control.get_state()
-        button: Namespace = element[state]
+        button: Palette = self.get_palette(control)
         
         if layer is RL_ABOVE_BACKGROUND or layer is RL_BELOW_FOREGROUND:
             left: int = 0
@@ -596,7 +1106,7 @@ class RendererBase:
                     # do not forget to render the actual icon image!
                     icon_rect: Rectangle = Rectangle.join(bounds.location + control.padding.top_left, Size(*element.icon_size))
 
-                    pg.draw.rect(surface, RED, icon_rect)
+                    pg.draw.rect(surface, RED.color, icon_rect)
 
                 if control.display is BGD_TEXT or control.display is BGD_BOTH:
                     font: pg.font.Font = self.gui_font[element.style.size]
@@ -619,8 +1129,7 @@ class RendererBase:
 
     def render_panel(self, control: 'Panel', element: 'Namespace', surface: pg.Surface,
                      render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
-        state: str = control.get_state()
-        panel: Namespace = element[state]
+        panel: Palette = self.get_palette(control)
         if layer is RL_BACKGROUND:
             pg.draw.rect(surface, panel.backcolor, bounds, 0)
         if layer is RL_FOREGROUND:
@@ -629,8 +1138,7 @@ class RendererBase:
     def render_checkbox(self, control: 'CheckBox', element: 'Namespace', surface: pg.Surface,
                         render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
         if layer is RL_ABOVE_BACKGROUND or layer is RL_BELOW_FOREGROUND:
-            state: str = control.get_state()
-            checkbox: Namespace = element[state]
+            checkbox: Palette = self.get_palette(control)
             font: pg.font.Font = self.gui_font[element.style.size]
 
             font.set_bold(element.style.bold)
@@ -645,15 +1153,14 @@ class RendererBase:
             pg.draw.rect(surface, checkbox.backcolor, box_rect, 0)
             pg.draw.rect(surface, checkbox.bordercolor, box_rect, 1)
             if control.checked:
-                pg.draw.rect(surface, checkbox.checkmark.color, box_rect.shrink(3), 0)
+                pg.draw.rect(surface, checkbox.checkmark, box_rect.shrink(3), 0)
 
             # pg.draw.rect(surface, RED, bounds, 1)
             surface.blit(s, text_pos)
 
     def render_radiobutton(self, control: 'RadioButton', element: 'Namespace', surface: pg.Surface,
                            render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
-            state: str = control.get_state()
-            radiobutton: Namespace = element[state]
+            radiobutton: Palette = self.get_palette(control)
             font: pg.font.Font = self.gui_font[element.style.size]
 
             font.set_bold(element.style.bold)
@@ -668,7 +1175,7 @@ class RendererBase:
             pg.draw.ellipse(surface, radiobutton.backcolor, box_rect, 0)
             pg.draw.ellipse(surface, radiobutton.bordercolor, box_rect, 1)
             if control.checked:
-                pg.draw.ellipse(surface, radiobutton.checkmark.color, box_rect.shrink(3), 0)
+                pg.draw.ellipse(surface, radiobutton.checkmark, box_rect.shrink(3), 0)
 
             # pg.draw.rect(surface, RED, bounds, 1)
             surface.blit(s, text_pos)
@@ -676,22 +1183,72 @@ class RendererBase:
     def render_vscrollbar(self, control: 'VScrollbar', element: 'Namespace', surface: pg.Surface,
                           render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
         if layer is RL_BACKGROUND:
-            scrollbar = element[control.get_state()]
+            scrollbar: Palette = self.get_palette(control)
             pg.draw.rect(surface, scrollbar.backcolor, bounds, 0)
 
     def render_vscrollbutton(self, control: Union['VSUpButton', 'VSSlider', 'VSDownButton'], element: 'Namespace',
                              surface: pg.Surface, render_bounds: 'Rectangle', bounds: 'Rectangle',
                              layer: RenderLayer) -> None:
         if layer is RL_BACKGROUND:
-            button = element[control.get_state()]
+            button: Palette = self.get_palette(control)
             pg.draw.rect(surface, button.backcolor, bounds, 0)
             pg.draw.rect(surface, button.bordercolor, bounds, 1)
 
+    def render_listbox(self, control: 'VirtualListBox', element: 'Namespace', surface: pg.Surface,
+                       render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
+        listbox: Palette = self.get_palette(control)
+        if layer is RL_BACKGROUND:
+            pg.draw.rect(surface, listbox.backcolor, bounds, 0)
+        if layer is RL_FOREGROUND:
+            pg.draw.rect(surface, listbox.bordercolor, bounds, 1)
+
+    def render_textview(self, control: 'TextView', element: 'Namespace', surface: pg.Surface,
+                        render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
+        textview: Palette = self.get_palette(control)
+        if layer is RL_BACKGROUND:
+            pg.draw.rect(surface, textview.backcolor, bounds, 0)
+        if layer is RL_FOREGROUND:
+            pg.draw.rect(surface, textview.bordercolor, bounds, 1)
+
+    def render_datagrid(self, control: 'DataGrid', element: 'Namespace', surface: pg.Surface,
+                        render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
+        grid: Palette = self.get_palette(control)
+        if layer is RL_BACKGROUND:
+            pg.draw.rect(surface, grid.backcolor, bounds, 0)
+
+        elif layer is RL_ABOVE_BACKGROUND:
+            # the column headers; the cells are drawn by the control, inside its viewport
+            padding: int = control.CELL_PADDING
+            for cell, text, align in control.get_header_cells():
+                pg.draw.rect(surface, grid.forecolor, cell, 0)
+                self.push_cliprect(self.get_cliprect().intersection(cell))
+                x: int = cell.right - padding - text.get_width() if align == 'RIGHT' else cell.left + padding
+                surface.blit(text, (x, cell.top + (cell.height - text.get_height()) // 2))
+                self.pop_cliprect()
+                pg.draw.line(surface, grid.bordercolor, (cell.right - 1, cell.top), (cell.right - 1, cell.bottom - 1))
+                pg.draw.line(surface, grid.bordercolor, (cell.left, cell.bottom - 1), (cell.right - 1, cell.bottom - 1))
+
+        elif layer is RL_FOREGROUND:
+            pg.draw.rect(surface, grid.bordercolor, bounds, 1)
+
+    def render_listrow(self, control: 'VirtualListBox.ListRow', element: 'Namespace', surface: pg.Surface,
+                       render_bounds: 'Rectangle', bounds: 'Rectangle', layer: RenderLayer) -> None:
+        row: Palette = self.get_palette(control)
+        if layer is RL_BACKGROUND:
+            pg.draw.rect(surface, row.backcolor, bounds, 0)
+
+        elif layer is RL_ABOVE_BACKGROUND:
+            font: pg.font.Font = self.gui_font[element.style.size]
+            font.set_bold(element.style.bold)
+            font.set_italic(element.style.italic)
+            font.set_underline(element.style.underline)
+            s: pg.Surface = font.render(control.text, True, row.color)
+            surface.blit(s, (bounds.left + control.padding.left, bounds.top + (bounds.height - s.get_height()) // 2))
+
     def render_slider(self, control: Union['VSlider', 'HSlider'], element: 'Namespace',
                              surface: pg.Surface, render_bounds: 'Rectangle', bounds: 'Rectangle',
                              layer: RenderLayer) -> None:
-        state: str = control.get_state()
-        slider = element[state]
+        slider: Palette = self.get_palette(control)
         if layer is RL_BACKGROUND:
             bar: Rectangle = control.get_bar_rect()
             bar.location = control.client_to_screen(bar.location)
@@ -705,121 +1262,164 @@ class RendererBase:
             # pg.draw.rect(surface, RED, marker, 1)
 
 
+class SkinWatcher:
+    """Polls a skin file's modification time from UIRuntime.validate() and hot-reloads
+    it: only the elements that changed lose their cached values, and only controls
+    drawn with them are re-measured and reflowed.
+
+    A skin that fails to load is reported as a SkinReloadWarning and skipped, leaving
+    the current one in place; the next save is tried again.
+    """
+
+    def __init__(self, filename: str, interval: float=0.5) -> None:
+        self._filename: str = filename
+        self._interval: float = interval
+        self._next_poll: float = 0.0
+        self._stamp: Optional[Tuple[int, int]] = self._get_stamp()
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def start(self) -> 'SkinWatcher':
+        UIRuntime()._skin_watcher = self
+        return self
+
+    def stop(self) -> None:
+        rt: UIRuntime = UIRuntime()
+        if rt._skin_watcher is self:
+            rt._skin_watcher = None
+
+    def _get_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat: os.stat_result = os.stat(self._filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> bool:
+        """Reloads the skin if the file changed since the last poll; returns whether it did."""
+        now: float = time.monotonic()
+        if now < self._next_poll:
+            return False
+        self._next_poll = now + self._interval
+        stamp: Optional[Tuple[int, int]] = self._get_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        return self.reload()
+
+    def reload(self) -> bool:
+        try:
+            skin: dict = validate_skin(load_skin(self._filename))
+        except (OSError, SyntaxError, ValueError, KeyError, AttributeError, zlib.error, pg.error) as error:
+            warnings.warn("Skin reload failed: {}".format(error), SkinReloadWarning, stacklevel=2)
+            return False
+        try:
+            changed: set = Application().get_renderer().reload_skin(skin)
+        except (OSError, ValueError, KeyError, AttributeError, pg.error) as error:
+            warnings.warn("Skin reload failed: {}".format(error), SkinReloadWarning, stacklevel=2)
+            return False
+        if changed:
+            UIRuntime().apply_skin(changed)
+        return True
+
+
+def _vec_pair(value: Any) -> Tuple[Any, Any]:
+    # the two components of an operand: slots of a Point/Size, a number twice, or value[0], value[1]
+    cls: type = value.__class__
+    if cls is Point or cls is Size:
+        return value._pair(value)
+    if cls is int or cls is float:
+        return value, value
+    if isinstance(value, VecBase):
+        return value._pair(value)
+    if isinstance(value, (int, float)):
+        return value, value
+    return value[0], value[1]
+
+
 class VecBase:
+    """Base of the two-component value types, Point and Size.
+
+    The operators are defined once here: they read the subclass' two slots through its
+    `_pair` getter and build results with its constructor, which truncates to int. The
+    other operand may be a Point, a Size, a number or any indexable pair; the reflected
+    operators keep the operand order of the in-order ones.
+    """
+    __slots__ = ()
+
+    _pair: Callable[['VecBase'], Tuple[int, int]] = None     # attrgetter of the two slots
 
     def __add__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] + other), int(self[1] + other))
-        return self.__class__(int(self[0] + other[0]), int(self[1] + other[1]))
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        return self.__class__(x + ox, y + oy)
 
     def __sub__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] - other), int(self[1] - other))
-        return self.__class__(int(self[0] - other[0]), int(self[1] - other[1]))
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        return self.__class__(x - ox, y - oy)
 
     def __floordiv__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] // other), int(self[1] // other))
-        return self.__class__(int(self[0] // other[0]), int(self[1] // other[1]))
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        return self.__class__(x // ox, y // oy)
 
     def __truediv__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] / other), int(self[1] / other))
-        return self.__class__(int(self[0] / other[0]), int(self[1] / other[1]))
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        return self.__class__(x / ox, y / oy)
 
     def __mod__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] % other), int(self[1] % other))
-        return self.__class__(int(self[0] % other[0]), int(self[1] % other[1]))
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        return self.__class__(x % ox, y % oy)
 
     def __mul__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] * other), int(self[1] * other))
-        return self.__class__(int(self[0] * other[0]), int(self[1] * other[1]))
-
-
-    def __radd__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] + other), int(self[1] + other))
-        return self.__class__(int(self[0] + other[0]), int(self[1] + other[1]))
-
-    def __rsub__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] - other), int(self[1] - other))
-        return self.__class__(int(self[0] - other[0]), int(self[1] - other[1]))
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        return self.__class__(x * ox, y * oy)
 
-    def __rfloordiv__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] // other), int(self[1] // other))
-        return self.__class__(int(self[0] // other[0]), int(self[1] // other[1]))
+    __radd__, __rsub__, __rfloordiv__ = __add__, __sub__, __floordiv__
+    __rtruediv__, __rmod__, __rmul__ = __truediv__, __mod__, __mul__
 
-    def __rtruediv__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] / other), int(self[1] / other))
-        return self.__class__(int(self[0] / other[0]), int(self[1] / other[1]))
-
-    def __rmod__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] % other), int(self[1] % other))
-        return self.__class__(int(self[0] % other[0]), int(self[1] % other[1]))
-
-    def __rmul__(self, other):
-        if isinstance(other, (int, float)):
-            return self.__class__(int(self[0] * other), int(self[1] * other))
-        return self.__class__(int(self[0] * other[0]), int(self[1] * other[1]))
+    # in place: the constructor stores the new slot values
 
     def __iadd__(self, other):
-        if isinstance(other, (int, float)):
-            self[0] += other
-            self[1] += other
-        else:
-            self[0] += other[0]
-            self[1] += other[1]
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        self.__init__(x + ox, y + oy)
         return self
 
     def __isub__(self, other):
-        if isinstance(other, (int, float)):
-            self[0] -= other
-            self[1] -= other
-        else:
-            self[0] -= other[0]
-            self[1] -= other[1]
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        self.__init__(x - ox, y - oy)
         return self
 
     def __ifloordiv__(self, other):
-        if isinstance(other, (int, float)):
-            self[0] //= other
-            self[1] //= other
-        else:
-            self[0] //= other[0]
-            self[1] //= other[1]
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        self.__init__(x // ox, y // oy)
         return self
 
     def __itruediv__(self, other):
-        if isinstance(other, (int, float)):
-            self[0] /= other
-            self[1] /= other
-        else:
-            self[0] /= other[0]
-            self[1] /= other[1]
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        self.__init__(x / ox, y / oy)
         return self
 
     def __imod__(self, other):
-        if isinstance(other, (int, float)):
-            self[0] %= other
-            self[1] %= other
-        else:
-            self[0] %= other[0]
-            self[1] %= other[1]
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        self.__init__(x % ox, y % oy)
         return self
 
     def __imul__(self, other):
-        if isinstance(other, (int, float)):
-            self[0] *= other
-            self[1] *= other
-        else:
-            self[0] *= other[0]
-            self[1] *= other[1]
+        x, y = self._pair(self)
+        ox, oy = _vec_pair(other)
+        self.__init__(x * ox, y * oy)
         return self
 
 
@@ -827,6 +1427,8 @@ class VecBase:
 class Point(VecBase):
     __slots__ = '_x', '_y'
 
+    _pair = attrgetter('_x', '_y')
+
     def __init__(self, x: int=0, y: int=0) -> None:
         """Constructor."""
         self._x = int(x)
@@ -837,21 +1439,17 @@ class Point(VecBase):
         return 2
 
     def __getitem__(self, key: int) -> int:
-        assert isinstance(key, int), "int key expected, not {key_type}.".format(
-            key_type=key.__class__.__name__)
-        if 0 <= key < 2:
-            return (self._x, self._y)[key]
-        else:
-            raise IndexError("Index out of bounds.")
+        if key == 0:
+            return self._x
+        elif key == 1:
+            return self._y
+        raise IndexError("Index out of bounds.")
 
     def __setitem__(self, key: int, value: int) -> None:
-        assert isinstance(key, int), "int key expected, not {key_type}.".format(
-            key_type=key.__class__.__name__)
-        if 0 <= key < 2:
-            if key == 0:
-                self._x = int(value)
-            else:
-                self._y = int(value)
+        if key == 0:
+            self._x = int(value)
+        elif key == 1:
+            self._y = int(value)
         else:
             raise IndexError("Index out of bounds.")
 
@@ -884,6 +1482,12 @@ class Point(VecBase):
     def copy(self) -> 'Point':
         return self.__class__(self._x, self._y)
 
+    def set(self, x: int, y: int) -> 'Point':
+        """In place: moves the point to (x, y)."""
+        self._x = int(x)
+        self._y = int(y)
+        return self
+
     def snap(self, width: int, height: int) -> 'Point':
         return self.__class__((self._x // width) * width, (self._y // height) * height)
 
@@ -892,6 +1496,8 @@ class Point(VecBase):
 class Size(VecBase):
     __slots__ = '_width', '_height'
 
+    _pair = attrgetter('_width', '_height')
+
     def __init__(self, width: int=0, height: int=0) -> None:
         """Constructor."""
         self._width = int(width)
@@ -902,23 +1508,19 @@ class Size(VecBase):
         return 2
 
     def __getitem__(self, key: int) -> int:
-        assert isinstance(key, int), "int key ewidthpected, not {key_type}.".format(
-            key_type=key.__class__.__name__)
-        if 0 <= key < 2:
-            return (self._width, self._height)[key]
-        else:
-            raise IndexError("Indewidth out of bounds.")
+        if key == 0:
+            return self._width
+        elif key == 1:
+            return self._height
+        raise IndexError("Index out of bounds.")
 
     def __setitem__(self, key: int, value: int) -> None:
-        assert isinstance(key, int), "int key ewidthpected, not {key_type}.".format(
-            key_type=key.__class__.__name__)
-        if 0 <= key < 2:
-            if key == 0:
-                self._width = int(value)
-            else:
-                self._height = int(value)
+        if key == 0:
+            self._width = int(value)
+        elif key == 1:
+            self._height = int(value)
         else:
-            raise IndexError("Indewidth out of bounds.")
+            raise IndexError("Index out of bounds.")
 
     def __iter__(self):
         return (self._width, self._height).__iter__()
@@ -994,60 +1596,71 @@ class Spacing:
 
 # clsColor
 class Color:
-    __slots__ = '_rgb'
+    """Immutable RGB triple. `color` is its pygame form, built once and shared: do not modify it."""
+    __slots__ = '_rgb', '_color', '_inverse'
 
     def __init__(self, r: int, g: int, b: int) -> None:
-        self._rgb = bytearray((r, g, b))
+        assert 0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255, "value outside (0 .. 255) range."
+        self._rgb: Tuple[int, int, int] = (r, g, b)
+        self._color: pg.Color = pg.Color(r, g, b)
+        self._inverse: Optional['Color'] = None
 
     def __getitem__(self, key) -> int:
-        assert isinstance(key, int), "int key expected."
-        return self._rgb.__getitem__(key)
-
-    def __setitem__(self, key, value) -> int:
-        assert isinstance(key, int), "int key expected."
-        assert 0 <= value <= 255, "value outside (0 .. 255) range."
-        return self._rgb.__setitem__(key, value)
+        return self._rgb[key]
 
     def __len__(self) -> int:
         return 3
 
+    def __iter__(self):
+        return iter(self._rgb)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Color):
+            return self._rgb == other._rgb
+        if isinstance(other, (tuple, list, pg.Color)):
+            return self._rgb == tuple(other)[:3]
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._rgb)
+
+    def __repr__(self) -> str:
+        return "Color({}, {}, {})".format(*self._rgb)
+
     @property
     def rgb(self) -> tuple:
-        return self[0], self[1], self[2]
+        return self._rgb
+
+    @property
+    def color(self) -> pg.Color:
+        return self._color
 
     @property
     def r(self):
         return self._rgb[0]
 
-    @r.setter
-    def r(self, value):
-        self._rgb[0] = value
-
     @property
     def g(self):
         return self._rgb[1]
 
-    @g.setter
-    def g(self, value):
-        self._rgb[1] = value
-
     @property
     def b(self):
         return self._rgb[2]
 
-    @b.setter
-    def b(self, value):
-        self._rgb[2] = value
-
     def inverse(self) -> 'Color':
-        return self.__class__(255 - self.r, 255 - self.g, 255 - self.b)
+        if self._inverse is None:
+            r, g, b = self._rgb
+            self._inverse = self.__class__(255 - r, 255 - g, 255 - b)
+            self._inverse._inverse = self
+        return self._inverse
 
     def mix(self, other, ratio: float) -> 'Color':
-        r, g, b = other
+        r, g, b = self._rgb
+        r2, g2, b2 = other[0], other[1], other[2]
         return self.__class__(
-            int(self.r + (r - self.r) * ratio),
-            int(self.g + (g - self.g) * ratio),
-            int(self.b + (b - self.b) * ratio)
+            int(r + (r2 - r) * ratio),
+            int(g + (g2 - g) * ratio),
+            int(b + (b2 - b) * ratio)
         )
 
 
@@ -1062,6 +1675,38 @@ MAGENTA = Color(255, 0, 255)
 WHITE = Color(255, 255, 255)
 
 
+# plt
+PALETTE_KEYS: Tuple[str, ...] = ('color', 'backcolor', 'bordercolor', 'forecolor', 'trackcolor', 'rangecolor', 'checkmark')
+# states a skin element may omit, derived from its 'normal' colours: (toward, ratio)
+PALETTE_DERIVED: Dict[str, Tuple[Color, float]] = {
+    'hilighted': (WHITE, 0.25),
+    'pressed': (BLACK, 0.2),
+    'disabled': (GRAY, 0.5),
+}
+
+
+class Palette:
+    """One element state's colours in pygame form; the renderer builds these at skin load."""
+    __slots__ = PALETTE_KEYS
+
+    @classmethod
+    def from_state(cls, state: 'Namespace') -> 'Palette':
+        palette: Palette = cls()
+        for key in PALETTE_KEYS:
+            value: Any = state[key] if key in state else None
+            if isinstance(value, Namespace):
+                value = value.color if 'color' in value else None
+            setattr(palette, key, None if value is None else Color(value[0], value[1], value[2]).color)
+        return palette
+
+    def mix(self, other: Union['Color', Tuple[int, int, int]], ratio: float) -> 'Palette':
+        palette: Palette = self.__class__()
+        for key in PALETTE_KEYS:
+            value: Optional[pg.Color] = getattr(self, key)
+            setattr(palette, key, None if value is None else Color(value.r, value.g, value.b).mix(other, ratio).color)
+        return palette
+
+
 # rct
 class Rectangle:
 
@@ -1081,6 +1726,14 @@ class Rectangle:
         self._width: int = int(width)
         self._height: int = int(height)
 
+    def set(self, left: int, top: int, width: int, height: int) -> 'Rectangle':
+        """In place: replaces all four fields."""
+        self._left = int(left)
+        self._top = int(top)
+        self._width = int(width)
+        self._height = int(height)
+        return self
+
     def __str__(self) -> str:
         return "({0.left}x, {0.top}y, {0.width}w, {0.height}h)".format(self)
 
@@ -1201,7 +1854,8 @@ class Rectangle:
 
     def contains(self, other: Union[Point, Size, 'Rectangle']) -> bool:
         if isinstance(other, Point):
-            return self._left <= other.x < self.right and self._top <= other.y < self.bottom
+            return (self._left <= other._x < self._left + self._width and
+                    self._top <= other._y < self._top + self._height)
 
         elif isinstance(other, Size):
             return self._width >= other.width and self._height >= other.height
@@ -1225,25 +1879,36 @@ class Rectangle:
                 raise TypeError("Not rect/point like.")
 
     def intersects(self, other: 'Rectangle') -> bool:
-        sl, st, sw, sh = self
-        ol, ot, ow, oh = other
+        sl, st = self._left, self._top
+        if isinstance(other, Rectangle):
+            ol, ot, ow, oh = other._left, other._top, other._width, other._height
+        else:
+            ol, ot, ow, oh = other
 
-        if sl > ol + ow or ol > sl + sw or st > ot + oh or ot > st + sh:
+        if sl > ol + ow or ol > sl + self._width or st > ot + oh or ot > st + self._height:
             return False
         return True
 
-    def intersection(self, other: 'Rectangle') -> Optional['Rectangle']:
+    def intersection(self, other: 'Rectangle', out: Optional['Rectangle']=None) -> 'Rectangle':
+        """The overlapping area (empty if none); written to out when given."""
+        if out is None:
+            out = Rectangle(0, 0, 0, 0)
         if not self.intersects(other):
-            return Rectangle(0, 0, 0, 0)
+            return out.set(0, 0, 0, 0)
 
-        sl, st, sw, sh = self
-        ol, ot, ow, oh = other
-
-        return Rectangle(
-            max(sl, ol),
-            max(st, ot),
-            min(sl + sw, ol + ow),
-            min(st + sh, ot + oh)
+        sl, st = self._left, self._top
+        if isinstance(other, Rectangle):
+            ol, ot, ow, oh = other._left, other._top, other._width, other._height
+        else:
+            ol, ot, ow, oh = other
+
+        left: int = sl if sl > ol else ol
+        top: int = st if st > ot else ot
+        return out.set(
+            left,
+            top,
+            min(sl + self._width, ol + ow) - left,
+            min(st + self._height, ot + oh) - top
         )
 
     def to_local(self, point: Point) -> Point:
@@ -1301,34 +1966,34 @@ class Rectangle:
         )
 
     def expand(self, spacing: Spacing) -> 'Rectangle':
-        self.left -= spacing.left
-        self.width += spacing.hor
-        self.top -= spacing.top
-        self.height += spacing.ver
+        self._left -= spacing.left
+        self._width = max(0, self._width + spacing.left + spacing.right)
+        self._top -= spacing.top
+        self._height = max(0, self._height + spacing.top + spacing.bottom)
 
         return self
 
     def reduce(self, spacing: Spacing) -> 'Rectangle':
-        self.left += spacing.left
-        self.width -= spacing.hor
-        self.top += spacing.top
-        self.height -= spacing.ver
+        self._left += spacing.left
+        self._width = max(0, self._width - spacing.left - spacing.right)
+        self._top += spacing.top
+        self._height = max(0, self._height - spacing.top - spacing.bottom)
 
         return self
 
     def grow(self, amount: int) -> 'Rectangle':
-        self.left -= amount
-        self.width += amount * 2
-        self.top -= amount
-        self.height += amount * 2
+        self._left -= amount
+        self._width = max(0, self._width + amount * 2)
+        self._top -= amount
+        self._height = max(0, self._height + amount * 2)
 
         return self
 
     def shrink(self, amount: int) -> 'Rectangle':
-        self.left += amount
-        self.width -= amount * 2
-        self.top += amount
-        self.height -= amount * 2
+        self._left += amount
+        self._width = max(0, self._width - amount * 2)
+        self._top += amount
+        self._height = max(0, self._height - amount * 2)
 
         return self
 
@@ -1380,6 +2045,154 @@ class Rectangle:
         return self
 
 
+class ControlBounds(Rectangle):
+    """Bounds of a control. Moving or resizing any control bumps the geometry generation,
+    which expires the cached absolute origins and child bounds arrays."""
+
+    __slots__ = ()
+
+    generation: int = 0
+
+    @Rectangle.left.setter
+    def left(self, value: int) -> None:
+        self._left = int(value)
+        ControlBounds.generation += 1
+
+    @Rectangle.top.setter
+    def top(self, value: int) -> None:
+        self._top = int(value)
+        ControlBounds.generation += 1
+
+    @Rectangle.location.setter
+    def location(self, value: Point) -> None:
+        self._left, self._top = value
+        ControlBounds.generation += 1
+
+    @Rectangle.width.setter
+    def width(self, value: int) -> None:
+        self._width = max(0, int(value))
+        ControlBounds.generation += 1
+
+    @Rectangle.height.setter
+    def height(self, value: int) -> None:
+        self._height = max(0, int(value))
+        ControlBounds.generation += 1
+
+    @Rectangle.center.setter
+    def center(self, value: int) -> None:
+        Rectangle.center.fset(self, value)
+        ControlBounds.generation += 1
+
+    @Rectangle.middle.setter
+    def middle(self, value: int) -> None:
+        Rectangle.middle.fset(self, value)
+        ControlBounds.generation += 1
+
+    @Rectangle.right.setter
+    def right(self, value: int) -> None:
+        Rectangle.right.fset(self, value)
+        ControlBounds.generation += 1
+
+    @Rectangle.bottom.setter
+    def bottom(self, value: int) -> None:
+        Rectangle.bottom.fset(self, value)
+        ControlBounds.generation += 1
+
+    def set(self, left: int, top: int, width: int, height: int) -> 'Rectangle':
+        ControlBounds.generation += 1
+        return super().set(left, top, width, height)
+
+    def expand(self, spacing: Spacing) -> 'Rectangle':
+        ControlBounds.generation += 1
+        return super().expand(spacing)
+
+    def reduce(self, spacing: Spacing) -> 'Rectangle':
+        ControlBounds.generation += 1
+        return super().reduce(spacing)
+
+    def grow(self, amount: int) -> 'Rectangle':
+        ControlBounds.generation += 1
+        return super().grow(amount)
+
+    def shrink(self, amount: int) -> 'Rectangle':
+        ControlBounds.generation += 1
+        return super().shrink(amount)
+
+
+# brct
+RECT_BATCH_THRESHOLD = 64       # fewer children than this are tested one by one
+
+
+class RectArray:
+    """Rectangles kept in an (n, 4) int32 NumPy array of left, top, width and height.
+
+    Tests against a single rectangle or point run over the whole array at once and
+    follow the Rectangle semantics (touching edges intersect).
+    """
+
+    __slots__ = '_data'
+
+    def __init__(self, rects: Any=()) -> None:
+        if np is None:
+            raise RuntimeError("RectArray requires NumPy.")
+        self._data = np.array([(r._left, r._top, r._width, r._height) for r in rects],
+                              dtype=np.int32).reshape(-1, 4)
+
+    @classmethod
+    def from_array(cls, data: Any) -> 'RectArray':
+        rects: RectArray = cls()
+        rects._data = np.asarray(data, dtype=np.int32).reshape(-1, 4)
+        return rects
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, index: int) -> Rectangle:
+        return Rectangle(*self._data[index].tolist())
+
+    @property
+    def data(self) -> Any:
+        return self._data
+
+    def translate(self, dx: int, dy: int) -> 'RectArray':
+        """The rectangles moved by (dx, dy)."""
+        return RectArray.from_array(self._data + np.array((dx, dy, 0, 0), dtype=np.int32))
+
+    def expand(self, spacings: Any) -> 'RectArray':
+        """New array grown by an (n, 4) array of left, top, right and bottom spacings."""
+        spacings = np.asarray(spacings, dtype=np.int32).reshape(-1, 4)
+        data = self._data.copy()
+        data[:, 0] -= spacings[:, 0]
+        data[:, 1] -= spacings[:, 1]
+        data[:, 2] = np.maximum(0, data[:, 2] + spacings[:, 0] + spacings[:, 2])
+        data[:, 3] = np.maximum(0, data[:, 3] + spacings[:, 1] + spacings[:, 3])
+        return RectArray.from_array(data)
+
+    def intersects(self, rect: Rectangle) -> Any:
+        """Boolean mask of the rectangles intersecting rect."""
+        left, top, width, height = self._data.T
+        return ~((left > rect._left + rect._width) | (rect._left > left + width) |
+                 (top > rect._top + rect._height) | (rect._top > top + height))
+
+    def intersection(self, rect: Rectangle) -> 'RectArray':
+        """Overlap of every rectangle with rect; empty (all zeros) where they do not meet."""
+        left, top, width, height = self._data.T
+        new_left = np.maximum(left, rect._left)
+        new_top = np.maximum(top, rect._top)
+        data = np.stack((
+            new_left,
+            new_top,
+            np.minimum(left + width, rect._left + rect._width) - new_left,
+            np.minimum(top + height, rect._top + rect._height) - new_top), axis=1)
+        data[~self.intersects(rect)] = 0
+        return RectArray.from_array(data)
+
+    def contains_point(self, point: Point) -> Any:
+        """Boolean mask of the rectangles containing the point."""
+        left, top, width, height = self._data.T
+        return (left <= point._x) & (point._x < left + width) & (top <= point._y) & (point._y < top + height)
+
+
 class Namespace(object):
 
     _indent = 0
@@ -1399,19 +2212,19 @@ class Namespace(object):
     @classmethod
     def items(cls, ns):
         # type: (Namespace) -> tuple
-        assert ns.__class__ is cls, "'ns' is not a Namespace object."
+        assert isinstance(ns, cls), "'ns' is not a Namespace object."
         return ns._dict.items()
 
     @classmethod
     def keys(cls, ns):
         # type: (Namespace) -> tuple
-        assert ns.__class__ is cls, "'ns' is not a Namespace object."
+        assert isinstance(ns, cls), "'ns' is not a Namespace object."
         return ns._dict.keys()
 
     @classmethod
     def values(cls, ns):
         # type: (Namespace) -> tuple
-        assert ns.__class__ is cls, "'ns' is not a Namespace object."
+        assert isinstance(ns, cls), "'ns' is not a Namespace object."
         return ns._dict.values()
 
     def __init__(self, **kwargs):
@@ -1424,13 +2237,11 @@ class Namespace(object):
                 setattr(self, key, value)
 
     def __getattr__(self, name):
-        if name != '_dict':
-            if name in getattr(self, '_dict'):
-                return getattr(self, '_dict')[name]
-            else:
-                raise AttributeError("Namespace object has no '{}' attribute.".format(name))
-        else:
-            return self._dict
+        # only reached on a miss of the instance/class lookup
+        try:
+            return self.__dict__['_dict'][name]
+        except KeyError:
+            raise AttributeError("Namespace object has no '{}' attribute.".format(name)) from None
 
     def __setattr__(self, name, value):
         if name != '_dict':
@@ -1482,6 +2293,78 @@ class Namespace(object):
     def __contains__(self, name):
         return name in self._dict
 
+    def freeze(self) -> 'FrozenNamespace':
+        """A read-only copy, nested namespaces included."""
+        return FrozenNamespace(**self._dict)
+
+
+class FrozenNamespace(Namespace):
+    """Read-only Namespace. Entries live in the instance dict, so attribute access is
+    a plain lookup; nested dicts/namespaces are frozen and lists become tuples.
+
+    An entry named like a method (e.g. 'thaw') hides it on the instance: call the
+    method through the class then, FrozenNamespace.thaw(ns)."""
+
+    def __init__(self, **kwargs):
+        entries: dict = self.__dict__
+        for key in kwargs:
+            value = kwargs[key]
+            if isinstance(value, FrozenNamespace):
+                pass
+            elif isinstance(value, Namespace):
+                value = FrozenNamespace(**value._dict)
+            elif isinstance(value, (dict, OrderedDict)):
+                value = FrozenNamespace(**value)
+            elif isinstance(value, list):
+                value = tuple(value)
+            entries[key] = value
+
+    @property
+    def _dict(self):
+        return MappingProxyType(self.__dict__)
+
+    def __getattr__(self, name):
+        raise AttributeError("Namespace object has no '{}' attribute.".format(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenNamespace object is read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenNamespace object is read-only.")
+
+    def __getitem__(self, key):
+        return self.__dict__[key]
+
+    def __setitem__(self, key, value):
+        raise TypeError("FrozenNamespace object is read-only.")
+
+    def __delitem__(self, key):
+        raise TypeError("FrozenNamespace object is read-only.")
+
+    def __len__(self):
+        return len(self.__dict__)
+
+    def __iter__(self):
+        return iter(self.__dict__)
+
+    def __contains__(self, name):
+        return name in self.__dict__
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenNamespace):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+    __hash__ = None
+
+    def freeze(self) -> 'FrozenNamespace':
+        return self
+
+    def thaw(self) -> Namespace:
+        """A mutable deep copy."""
+        return Namespace(**{key: FrozenNamespace.thaw(value) if isinstance(value, FrozenNamespace) else value
+                            for key, value in self.__dict__.items()})
+
 
 #clsapp
 class Application(metaclass=SingletonMeta):
@@ -1491,18 +2374,33 @@ class Application(metaclass=SingletonMeta):
         self._display: pg.Surface = None
         self._clock: pg.time.Clock = pg.time.Clock()
         self._renderer: RendererBase = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set = set()
+        self._executors: Dict[str, Executor] = {}
 
     def get_renderer(self) -> RendererBase:
         return self._renderer
 
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def quit(self) -> None:
+        self._running = False
+
     @contextmanager
-    def start(self, **kwargs) -> None:
+    def setup(self, **kwargs) -> None:
+        """Initializes the display and lays out the controls created in the context,
+        without entering the main loop. Pair it with run_async() or a custom loop."""
         global this
+        if kwargs.get('headless', False):
+            # no window: SDL renders into an offscreen surface (replays, benchmarks)
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pg.init()
 
         self._display = pg.display.set_mode((960, 540))
         self._renderer = RendererBase.initialize_display(Size(960, 540), "GrUsIn - v0.1.0.a0", skin=DEFAULT_SKIN)
-        self._display.fill(WHITE)
+        self._display.fill(WHITE.color)
         self._renderer.clear(WHITE)
         self._renderer.flip()
         runtime: UIRuntime = UIRuntime()
@@ -1519,20 +2417,107 @@ class Application(metaclass=SingletonMeta):
                 runtime._active = active
                 runtime.bring_to_front(active)
                 active.process_message(Message.ACTIVATED)
-        while True:
-            runtime.process_events(pg.event.get())
-            runtime.validate()
-            self._clock.tick(60)
 
+    @contextmanager
+    def start(self, **kwargs) -> None:
+        with self.setup(**kwargs):
+            yield
+        runtime: UIRuntime = UIRuntime()
+        wait: bool = kwargs.get('wait', False)
+        try:
+            while self._running:
+                if wait:
+                    # sleeps until input or a UE_INVOKE wake up arrives
+                    events: List[pg.event.Event] = [pg.event.wait()]
+                    events.extend(pg.event.get())
+                    runtime.process_events(events)
+                else:
+                    runtime.process_events(pg.event.get())
+                runtime.validate()
+                self._clock.tick(kwargs.get('fps', 60))
+        finally:
+            self.shutdown_executors()
+
+    async def run_async(self, fps: int=60) -> None:
+        """Runs the main loop as a coroutine, yielding to the asyncio event loop
+        between frames so sockets, pipes and other tasks are served in the same thread."""
+        runtime: UIRuntime = UIRuntime()
+        self._loop = asyncio.get_running_loop()
+        frame_time: float = 1.0 / fps
+        try:
+            while self._running:
+                frame_start: float = self._loop.time()
+                runtime.process_events(pg.event.get())
+                runtime.validate()
+                elapsed: float = self._loop.time() - frame_start
+                await asyncio.sleep(max(0.0, frame_time - elapsed))
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            self._loop = None
+            self.shutdown_executors()
+
+    def create_task(self, coroutine) -> asyncio.Task:
+        if self._loop is None:
+            coroutine.close()
+            raise RuntimeError("Coroutine handlers require the loop started by Application.run_async().")
+        task: asyncio.Task = self._loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def get_executor(self, kind: str='thread') -> Executor:
+        if kind not in self._executors:
+            if kind == 'thread':
+                self._executors[kind] = ThreadPoolExecutor(thread_name_prefix='grusin')
+            elif kind == 'process':
+                self._executors[kind] = ProcessPoolExecutor()
+            else:
+                raise ValueError("Unknown executor kind: '{}'.".format(kind))
+        return self._executors[kind]
+
+    def run_in_background(self, owner: 'Control', func: Callable[..., Any], *args,
+                          kind: str='thread', callback: Callable[['Control', 'EventArgs'], Any]=None) -> Future:
+        """Runs func(*args) in a thread ('thread') or process ('process') pool.
+
+        The outcome is delivered in the UI thread as EventArgs(future, result, error),
+        either to callback(owner, evargs) or as a WORK_COMPLETED message to owner.
+        Pending work is cancelled, and never delivered, once owner is destroyed.
+        With kind='process', func and args must be picklable.
+        """
+        future: Future = self.get_executor(kind).submit(func, *args)
+        owner._pending_work.add(future)
+        future.add_done_callback(
+            lambda done: UIRuntime().invoke_async(self._deliver_work, owner, done, callback))
+        return future
+
+    def _deliver_work(self, owner: 'Control', future: Future, callback: Optional[Callable]) -> None:
+        owner._pending_work.discard(future)
+        if owner.destroyed or future.cancelled():
+            return
 
-#uirt
-class UIRuntime(metaclass=SingletonMeta):
+        error: Optional[BaseException] = future.exception()
+        evargs: EventArgs = Control.WorkCompletedEvent.Args(future, None if error else future.result(), error)
+        if callback:
+            callback(owner, evargs)
+        else:
+            owner.process_message(Message.WORK_COMPLETED, evargs)
+
+    def shutdown_executors(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+
+
+#uirt
+class UIRuntime(metaclass=SingletonMeta):
 
     def __init__(self) -> None:
         self._initialized: bool = False
         self._sentinel: object = object()
         self._init_stack: List['Control'] = [self._sentinel]
-        self._controls: List['Control'] = []
+        self._controls: ControlList = ControlList()
+        self._names: NameIndex = NameIndex()
         self._to_activate: 'Control' = None
         self._instance_counter: Dict[Type, int] = {}
         self._font: pg.font.SysFont = pg.font.SysFont("Arial", 32)
@@ -1560,6 +2545,30 @@ class UIRuntime(metaclass=SingletonMeta):
         # invalidated areas
         self._invalidated: List[pg.Rect] = []
 
+        # cross-thread invocation
+        self._ui_thread: int = threading.get_ident()
+        self._invoke_queue: deque = deque()     # deque append/popleft are atomic
+        self._invoke_posted: bool = False
+        self._invoke_budget: int = 4            # milliseconds per frame
+
+        # incremental layout
+        self._layout_pending: bool = False      # some control needs its children rearranged
+        self._layout_dirty: bool = False        # the topmost controls need rearranging
+
+        # input-to-photon latency
+        self._latency: Optional['LatencyMonitor'] = None
+
+        # event recording and replay
+        self._recorder: Optional['EventRecorder'] = None
+
+        # skin hot reload
+        self._skin_watcher: Optional['SkinWatcher'] = None
+        self._replay_state: Optional[Tuple[int, Tuple[int, int]]] = None   # ticks, mouse position
+
+        # bulk construction: (parent, layout cursor) while UIRuntime.build() runs
+        self._building: Optional[Tuple[Optional['ContainerControl'], LayoutCursor]] = None
+        self._spec_setters: Dict[Type, frozenset] = {}
+
     @property
     def initializing(self) -> bool:
         return (self._initialized is False and len(self._init_stack) > 0 and
@@ -1574,6 +2583,62 @@ class UIRuntime(metaclass=SingletonMeta):
 
         return None
 
+    @property
+    def invoke_budget(self) -> int:
+        return self._invoke_budget
+
+    @invoke_budget.setter
+    def invoke_budget(self, value: int) -> None:
+        self._invoke_budget = max(0, int(value))
+
+    def invoke(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs func in the UI thread and returns its result, blocking the calling thread."""
+        if threading.get_ident() == self._ui_thread:
+            return func(*args, **kwargs)
+        return self.invoke_async(func, *args, **kwargs).result()
+
+    def invoke_async(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queues func to run in the UI thread and returns a Future for its result."""
+        future: Future = Future()
+        self._invoke_queue.append((future, func, args, kwargs))
+        self._wake_up()
+        return future
+
+    def _wake_up(self) -> None:
+        if not self._invoke_posted:
+            self._invoke_posted = True
+            try:
+                pg.event.post(pg.event.Event(UE_INVOKE))
+            except pg.error:
+                pass    # display not initialized; the queue is drained on the next frame anyway
+
+    def process_invoked(self) -> None:
+        self._invoke_posted = False
+        deadline: float = time.perf_counter() + self._invoke_budget / 1000
+        while self._invoke_queue:
+            future, func, args, kwargs = self._invoke_queue.popleft()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except Exception as exc:
+                    future.set_exception(exc)
+            if time.perf_counter() >= deadline:
+                break
+
+        if self._invoke_queue:
+            # budget exhausted: resume in the next frame
+            self._wake_up()
+
+    def get_ticks(self) -> int:
+        if self._replay_state:
+            return self._replay_state[0]
+        return pg.time.get_ticks()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        if self._replay_state:
+            return self._replay_state[1]
+        return pg.mouse.get_pos()
+
     def get_cursor(self) -> Optional[LayoutCursor]:
         if self._cursor_stack:
             return self._cursor_stack[-1]
@@ -1585,10 +2650,11 @@ class UIRuntime(metaclass=SingletonMeta):
         return -1
 
     def find_by_name(self, name: str) -> Optional['Control']:
-        for control in self._controls:
-            if control.name == name:
-                return control
-        return None
+        return self._names.get(name)
+
+    def find(self, path: str) -> Optional['Control']:
+        """Finds a control by its path of names from the topmost level, e.g. 'form1/pushbutton2'."""
+        return find_path(self, path)
 
     def gen_name(self, control: 'Control') -> str:
         if not isinstance(control, Control):
@@ -1617,82 +2683,182 @@ class UIRuntime(metaclass=SingletonMeta):
         if self._init_stack:
             this = self._init_stack[-1]
 
+    def build(self, spec: Any, parent: Optional['ContainerControl']=None) -> List['Control']:
+        """Creates the controls described by spec in one batch, appending them to parent
+        (or as topmost controls). Returns the created controls, children excluded.
+
+        spec is an iterable of dicts (a list, a generator...) or a dict of dicts keyed by
+        control name. Each item has a 'type' (a Control subclass or its name) and, for
+        containers, optional 'children' (a nested spec). Keys naming a writable property
+        the constructor does not read (see Control._init_kwargs) are assigned after
+        construction; the remaining ones are passed to the constructor. The layout runs
+        once, at the next validation.
+        """
+        if isinstance(spec, dict):
+            spec = (dict(item, name=name) for name, item in spec.items())
+        cursor: LayoutCursor = self._cursor_stack[0] if parent is None else parent._layout_cursor
+        created: List[Control] = []
+        nested: List[Tuple[Control, Any]] = []
+        previous: Optional[Tuple[Optional[ContainerControl], LayoutCursor]] = self._building
+        self._building = parent, cursor
+        try:
+            for item in spec:
+                cls: Any = item['type']
+                if isinstance(cls, str):
+                    cls = globals().get(cls)
+                if not (isinstance(cls, type) and issubclass(cls, Control)):
+                    raise ValueError("Spec type must be a Control subclass or its name, not {!r}.".format(
+                        item['type']))
+                setters: frozenset = self._spec_setters.get(cls)
+                if setters is None:
+                    init_kwargs: set = {key for klass in cls.__mro__ for key in vars(klass).get('_init_kwargs', ())}
+                    setters = self._spec_setters[cls] = frozenset(
+                        name for name in dir(cls) if name not in init_kwargs and
+                        isinstance(getattr(cls, name), property) and getattr(cls, name).fset is not None)
+
+                kwargs: Dict[str, Any] = {}
+                values: List[Tuple[str, Any]] = []
+                for key, value in item.items():
+                    if key in setters:
+                        values.append((key, value))
+                    elif key != 'type' and key != 'children':
+                        kwargs[key] = value
+
+                name: str = kwargs.pop('name', DEFAULT)
+                control: Control = cls(DEFAULT, name, **kwargs)
+                for key, value in values:
+                    setattr(control, key, value)
+                created.append(control)
+                if 'children' in item:
+                    nested.append((control, item['children']))
+        finally:
+            self._building = previous
+
+        for control, children in nested:
+            self.build(children, control)
+        if parent is None:
+            self.invalidate_layout()
+        else:
+            parent.invalidate_measure()
+        return created
+
     def layout_topmost(self) -> None:
-        cursor: Optional[LayoutCursor] = self.get_cursor()
         renderer: RendererBase = Application().get_renderer()
-        left: int = renderer.default.padding[0]     # left
-        top: int = renderer.default.padding[1]      # top
-        bottom: int = top
-        previous: Control = None
-        for child, layout in cursor:
-            if child not in self._controls:
-                continue
+        self._layout_dirty = False
+        controls, xs, ys, _, _ = layout_flow(self._cursor_stack[0], self._controls,
+                                             renderer.default.padding[0], renderer.default.padding[1])
+        place_controls(controls, xs, ys)
+
+    def invalidate_layout(self) -> None:
+        self._layout_dirty = True
+        self._layout_pending = True
+
+    def update_layout(self) -> None:
+        """Per-frame layout pass: reflows only the levels marked by Control.invalidate_layout()."""
+        if not self._layout_pending:
+            return
 
-            if previous is None:
-                child.location = Point(left + child.margin.left, top + child.margin.top)
-                if bottom < child.bounds.bottom + child.margin.bottom:
-                    bottom = child.bounds.bottom + child.margin.bottom
-            else:
-                if layout is LON_SAMELINE:
-                    child.bounds.left = previous.bounds.right + previous.margin.right + child.margin.left
-                    child.bounds.top = top + child.margin.top
-                    if bottom < child.bounds.bottom + child.margin.bottom:
-                        bottom = child.bounds.bottom + child.margin.bottom
-
-                elif layout is LON_BELOW:
-                    child.bounds.left = previous.bounds.left - previous.margin.left + child.margin.left
-                    child.bounds.top = previous.bounds.bottom + previous.margin.bottom + child.margin.top
-                    if bottom < child.bounds.bottom + child.margin.bottom:
-                        bottom = child.bounds.bottom + child.margin.bottom
-
-                elif layout is LON_NEWLINE:
-                    child.bounds.left = left + child.margin.left
-                    child.bounds.top = bottom + child.margin.top
-                    bottom = child.bounds.bottom + child.margin.bottom
-
-                elif layout is LON_CASCADE:
-                    child.bounds.left = previous.bounds.left + 32
-                    child.bounds.top = previous.bounds.top + 32
-                    if bottom < child.bounds.bottom + child.margin.bottom:
-                        bottom = child.bounds.bottom + child.margin.bottom
-
-                elif layout is LON_MANUAL:
-                    pass        # do nothing...
-
-            previous = child
+        # children first: a container fitting its content may resize and dirty its parent
+        for control in self._controls:
+            if control._layout_dirty_child:
+                control.update_layout()
+        self._layout_pending = False
+
+        if self._layout_dirty:
+            renderer: RendererBase = Application().get_renderer()
+            previous_bounds: List[Tuple['Control', Rectangle]] = [
+                (control, control.get_render_bounds()) for control in self._controls]
+            self.layout_topmost()
+            erase_color: Color = renderer.erase_color
+            for control, old_bounds in previous_bounds:
+                if old_bounds != control.get_render_bounds():
+                    # the control moved away: clear the pixels it leaves behind
+                    renderer.push_cliprect(old_bounds)
+                    renderer.clear(erase_color)
+                    renderer.pop_cliprect()
+                    renderer.add_invalidated_rect(old_bounds)
 
     def set_parent(self, child: 'Control') -> bool:
         if self.context:
             parent = self.context
             return parent.process_message(Message.ADD_CHILD, child)
 
-        self._controls.append(child)
+        self._append_control(child)
         return False
 
     def add_control(self, control: 'Control') -> None:
         if control not in self._controls:
-            self._controls.append(control)
+            self._append_control(control)
+
+    def _append_control(self, control: 'Control') -> None:
+        self._controls.append(control)
+        self._names.add(control)
+        control._update_effective_state()
+
+    def remove_control(self, control: 'Control') -> None:
+        if control in self._controls:
+            self._controls.remove(control)
+            self._names.remove(control)
+            control._update_effective_state()
+
+    def release(self, control: 'Control') -> None:
+        # drop every reference the runtime keeps to a destroyed control
+        if self._hovered is control:
+            self._hovered = None
+        if self._captured is control:
+            self._captured = None
+            self._drag_button = MB_NONE
+        if self._focused is control:
+            self._focused = None
+        if self._drag_receiver is control:
+            self._drag_receiver = None
+            self._drag_accept = False
+        if self._active is control:
+            self._active = None
 
     def is_topmost(self, control: 'Control') -> bool:
         return control in self._controls
 
     def bring_to_front(self, control: 'Control') -> None:
-        self._controls.remove(control)
-        self._controls.append(control)
+        self._controls.move_to_end(control)
 
     @staticmethod
     def set_invalidated_rectangle(self, rectangle: Rectangle) -> None:
         Application().get_renderer().add_invalidated_rect(rectangle)
 
+    def apply_skin(self, element_names: set) -> None:
+        """Sends SKINCHANGED to the controls drawn with the given skin elements, which
+        re-read their skin values and reflow; the rest are left alone."""
+        renderer: RendererBase = Application().get_renderer()
+        affected: List[Control] = []
+        pending: List[Control] = list(self._controls)
+        while pending:
+            control: Control = pending.pop()
+            if renderer._render_methods.get(control.__class__.__name__) in element_names:
+                affected.append(control)
+            pending.extend(control._nonclients.values())
+            if isinstance(control, ContainerControl):
+                pending.extend(control._children)
+        for control in affected:
+            if not control.destroyed:   # e.g. a list row dropped by its list's SKINCHANGED
+                control.process_message(Message.SKINCHANGED)
+
     #refresher
     def validate(self) -> None:
         renderer: RendererBase = Application().get_renderer()
+        if self._skin_watcher is not None:
+            self._skin_watcher.poll()
+        self.update_layout()
+        if self._latency is not None:
+            self._latency.mark('layout')
         for control in self._controls:
             if control.visible:
                 control.process_message(Message.RENDER_BACKGROUND, renderer.get_cliprect())
                 control.process_message(Message.RENDER, renderer.get_cliprect())
                 control.process_message(Message.RENDER_FOREGROUND, renderer.get_cliprect())
 
+        if self._latency is not None:
+            self._latency.mark('render')
         renderer.update()
 
     def erase(self,control: 'Control', erase_rectangle: 'Rectangle') -> None:
@@ -1714,11 +2880,20 @@ class UIRuntime(metaclass=SingletonMeta):
     #procevt
     def process_events(self, evs: List[pg.event.Event]) -> None:
         pressed_now: List[bool] = [0, False, False, False]
-        current_time: int = pg.time.get_ticks()
+        current_time: int = self.get_ticks()
+        mouse_pos: Tuple[int, int] = self.get_mouse_pos()
+        if self._recorder is not None:
+            self._recorder.record(evs, current_time, mouse_pos)
+        if self._latency is not None:
+            self._latency.arrived(evs)
 
         for event in evs:
+            if self._latency is not None:
+                self._latency.dispatching(event)
+
             if event.type == pg.QUIT:
-                sys.exit()
+                # ends the running loop, start() or run_async(), after this frame
+                Application().quit()
 
             elif event.type == pg.ACTIVEEVENT:
                 pass
@@ -1730,7 +2905,7 @@ class UIRuntime(metaclass=SingletonMeta):
                 pass
 
             elif event.type == pg.MOUSEMOTION:
-                self._last_motion = pg.time.get_ticks()
+                self._last_motion = current_time
                 hovered = None
                 hittest = HT_NONE
                 for control in self._controls:
@@ -1828,9 +3003,13 @@ class UIRuntime(metaclass=SingletonMeta):
                             self._hovered = hovered
 
             elif event.type == pg.MOUSEBUTTONDOWN:
+                if self._is_mwheel(event.button):
+                    if self._hovered:
+                        self._hovered.process_message(Message.MOUSE_WHEEL, -1 if event.button == MB_WHEEL_UP else 1)
+
                 if self._is_mbutton(event.button):
                     self._drag_pos[event.button] = Point(*event.pos)
-                    self._press_time[event.button] = pg.time.get_ticks()
+                    self._press_time[event.button] = current_time
                     pressed_now[event.button] = True
 
                 if event.button == MB_LEFT:
@@ -1883,18 +3062,277 @@ class UIRuntime(metaclass=SingletonMeta):
             elif event.type == pg.VIDEOEXPOSE:
                 pass
 
+            elif event.type == UE_INVOKE:
+                pass    # queued calls are run below, once per frame
+
+        if self._latency is not None:
+            self._latency.dispatching(None)
+        if self._invoke_queue:
+            self.process_invoked()
+        if self._latency is not None:
+            self._latency.mark('input')
 
         if self._mbuttons[MB_LEFT] and not pressed_now[MB_LEFT]:
             if self._hovered:
-                self._hovered.process_message(Message.MOUSE_DOWN, MB_LEFT, Point(*pg.mouse.get_pos()))
+                self._hovered.process_message(Message.MOUSE_DOWN, MB_LEFT, Point(*mouse_pos))
 
         if self._mbuttons[MB_MIDDLE] and not pressed_now[MB_MIDDLE]:
             if self._hovered:
-                self._hovered.process_message(Message.MOUSE_DOWN, MB_MIDDLE, Point(*pg.mouse.get_pos()))
+                self._hovered.process_message(Message.MOUSE_DOWN, MB_MIDDLE, Point(*mouse_pos))
 
         if self._mbuttons[MB_RIGHT] and not pressed_now[MB_RIGHT]:
             if self._hovered:
-                self._hovered.process_message(Message.MOUSE_DOWN, MB_RIGHT, Point(*pg.mouse.get_pos()))
+                self._hovered.process_message(Message.MOUSE_DOWN, MB_RIGHT, Point(*mouse_pos))
+
+
+#lat
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in milliseconds (constant memory)."""
+
+    def __init__(self, resolution: float=0.25, limit: float=1000.0) -> None:
+        self._resolution: float = resolution
+        self._counts: List[int] = [0] * (int(limit / resolution) + 1)     # last bucket: overflow
+        self._count: int = 0
+        self._total: float = 0.0
+        self._max: float = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, duration: float) -> None:
+        index: int = min(int(duration / self._resolution), len(self._counts) - 1)
+        self._counts[max(0, index)] += 1
+        self._count += 1
+        self._total += duration
+        if duration > self._max:
+            self._max = duration
+
+    def percentile(self, percent: float) -> float:
+        if self._count == 0:
+            return 0.0
+        target: float = self._count * percent / 100
+        seen: int = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if count and seen >= target:
+                return min((index + 1) * self._resolution, self._max)
+        return self._max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self._count,
+            'mean': self._total / self._count if self._count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self._max,
+        }
+
+    def clear(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+
+class LatencyMonitor:
+    """Measures the time from an input event's arrival in UIRuntime.process_events to
+    the display update that shows its effect, split in input, layout, render and
+    present phases.
+
+    An input event is stamped with its arrival time when handling it invalidates
+    something: a control calls invalidate() or moves. The stamp is resolved by the
+    first RendererBase.update()/flip() after that. Events whose handling changes
+    nothing on screen are not measured.
+    """
+
+    PHASES = 'input', 'layout', 'render', 'present', 'total'
+    INPUT_EVENTS = frozenset((pg.MOUSEMOTION, pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP,
+                              pg.MOUSEWHEEL, pg.KEYDOWN, pg.KEYUP, pg.TEXTINPUT))
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in self.PHASES}
+        self._arrival: float = 0.0                  # when this frame's events were picked up
+        self._current: Optional[float] = None       # stamp of the input event being handled
+        self._generation: int = 0                   # ControlBounds.generation when it began
+        self._in_flight: List[float] = []   # stamps waiting for the display update
+        self._marks: Dict[str, float] = {}
+
+    def start(self) -> 'LatencyMonitor':
+        UIRuntime()._latency = self
+        Application().get_renderer()._latency = self
+        return self
+
+    def stop(self) -> None:
+        rt: UIRuntime = UIRuntime()
+        if rt._latency is self:
+            rt._latency = None
+        renderer: RendererBase = Application().get_renderer()
+        if renderer._latency is self:
+            renderer._latency = None
+
+    def arrived(self, events: List[pg.event.Event]) -> None:
+        self._arrival = time.perf_counter()
+
+    def dispatching(self, event: Optional[pg.event.Event]) -> None:
+        """Called before each event is handled, and with None after the last one."""
+        if self._current is not None and ControlBounds.generation != self._generation:
+            self._in_flight.append(self._current)   # handling the previous event moved a control
+        self._current = self._arrival if event is not None and event.type in self.INPUT_EVENTS else None
+        self._generation = ControlBounds.generation
+
+    def mark(self, phase: str) -> None:
+        self._marks[phase] = time.perf_counter()
+
+    def invalidated(self) -> None:
+        if self._current is not None:
+            self._in_flight.append(self._current)
+            self._current = None    # stamped once per event
+
+    def presented(self) -> None:
+        now: float = time.perf_counter()
+        if not self._in_flight:
+            return
+        input_end: float = self._marks.get('input', now)
+        layout_end: float = max(input_end, self._marks.get('layout', input_end))
+        render_end: float = max(layout_end, self._marks.get('render', layout_end))
+        histograms: Dict[str, LatencyHistogram] = self._histograms
+        for stamp in self._in_flight:
+            histograms['input'].add((max(stamp, input_end) - stamp) * 1000)
+            histograms['total'].add((now - stamp) * 1000)
+        # phases after input handling are shared by every event of the frame
+        histograms['layout'].add((layout_end - input_end) * 1000)
+        histograms['render'].add((render_end - layout_end) * 1000)
+        histograms['present'].add((now - render_end) * 1000)
+        self._in_flight.clear()
+
+    def get_histogram(self, phase: str='total') -> LatencyHistogram:
+        return self._histograms[phase]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {phase: self._histograms[phase].summary() for phase in self.PHASES}
+
+    def dump(self, stream: io.TextIOBase=None) -> str:
+        lines: List[str] = ["{:<8} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8}".format(
+            'phase', 'count', 'mean', 'p50', 'p95', 'p99', 'max')]
+        for phase, stats in self.summary().items():
+            lines.append("{:<8} {:>8} {:>8.2f} {:>8.2f} {:>8.2f} {:>8.2f} {:>8.2f}".format(
+                phase, stats['count'], stats['mean'], stats['p50'], stats['p95'], stats['p99'], stats['max']))
+        text: str = "\n".join(lines)
+        if stream is not None:
+            stream.write(text + "\n")
+        return text
+
+    def clear(self) -> None:
+        for histogram in self._histograms.values():
+            histogram.clear()
+
+
+#rec
+class EventRecorder:
+    """Captures the raw event stream fed to UIRuntime.process_events, one entry per
+    frame with the frame ticks and mouse position, so EventPlayer can replay it."""
+
+    MAGIC = b'GRUSINEV'
+    VERSION = 1
+
+    _plain_types = (int, float, str, bool, type(None))
+
+    def __init__(self) -> None:
+        self._frames: List[Tuple[int, Tuple[int, int], List[Tuple[int, dict]]]] = []
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def frames(self) -> List[Tuple[int, Tuple[int, int], List[Tuple[int, dict]]]]:
+        return self._frames
+
+    def start(self) -> 'EventRecorder':
+        UIRuntime()._recorder = self
+        return self
+
+    def stop(self) -> None:
+        rt: UIRuntime = UIRuntime()
+        if rt._recorder is self:
+            rt._recorder = None
+
+    def _plain(self, value: Any) -> Any:
+        if isinstance(value, self._plain_types):
+            return value
+        if isinstance(value, (tuple, list)) and all(isinstance(v, self._plain_types) for v in value):
+            return tuple(value)
+        raise TypeError
+
+    def record(self, events: List[pg.event.Event], ticks: int, mouse_pos: Tuple[int, int]) -> None:
+        recorded: List[Tuple[int, dict]] = []
+        for event in events:
+            if event.type == UE_INVOKE:
+                continue    # queued calls can't be replayed
+            attrs: dict = {}
+            for key, value in event.dict.items():
+                try:
+                    attrs[key] = self._plain(value)
+                except TypeError:
+                    pass    # e.g. window handles
+            recorded.append((event.type, attrs))
+        self._frames.append((ticks, tuple(mouse_pos), recorded))
+
+    def save(self, filename: str) -> None:
+        payload: bytes = zlib.compress(marshal.dumps((self.VERSION, self._frames)), 9)
+        with open(filename, 'wb') as recording:
+            recording.write(self.MAGIC)
+            recording.write(payload)
+
+
+class EventPlayer:
+    """Feeds a recording back to UIRuntime.process_events, at full speed or in real time.
+
+    For headless runs build the UI with Application().setup(headless=True)."""
+
+    @classmethod
+    def load(cls, filename: str) -> 'EventPlayer':
+        with open(filename, 'rb') as recording:
+            data: bytes = recording.read()
+        if not data.startswith(EventRecorder.MAGIC):
+            raise ValueError("'{}' is not an event recording.".format(filename))
+        version, frames = marshal.loads(zlib.decompress(data[len(EventRecorder.MAGIC):]))
+        if version != EventRecorder.VERSION:
+            raise ValueError("Unsupported event recording version: {}.".format(version))
+        return cls(frames)
+
+    def __init__(self, frames: List[Tuple[int, Tuple[int, int], List[Tuple[int, dict]]]]) -> None:
+        self._frames = frames
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def play(self, realtime: bool=False, render: bool=True) -> int:
+        """Replays the frames and returns how many were played. Stops at a QUIT event."""
+        rt: UIRuntime = UIRuntime()
+        played: int = 0
+        first_ticks: Optional[int] = None
+        wall_start: float = time.perf_counter()
+        try:
+            for ticks, mouse_pos, events in self._frames:
+                if realtime:
+                    if first_ticks is None:
+                        first_ticks = ticks
+                    delay: float = wall_start + (ticks - first_ticks) / 1000 - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+                evs: List[pg.event.Event] = [pg.event.Event(kind, attrs) for kind, attrs in events]
+                if any(event.type == pg.QUIT for event in evs):
+                    break
+                rt._replay_state = ticks, tuple(mouse_pos)
+                rt.process_events(evs)
+                if render:
+                    rt.validate()
+                played += 1
+        finally:
+            rt._replay_state = None
+        return played
 
 
 class EventBase:
@@ -1911,12 +3349,35 @@ class EventBase:
     def get_handler_name(cls) -> str:
         return "_on_{event}".format(event=cls.__name__.replace('Event', '').lower())
 
+    # event data: subclasses declaring `fields` get a slotted EventArgs subclass as `Args`,
+    # pooled when pool_size > 0 (for high frequency events)
+    fields: Tuple[str, ...] = ()
+    pool_size: int = 0
+    Args: Type['EventArgs'] = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if 'fields' in cls.__dict__:
+            cls.Args = EventArgs.define(cls.__name__ + 'Args', cls.fields, cls.pool_size)
+
     def __init__(self):
         self._handlers: List[Callable[['Control', 'Control'], Any]] = []
 
     def __call__(self, sender: 'Control', evargs: 'EventArgs') -> None:
         for handler in self._handlers:
-            handler(sender, evargs)
+            result = handler(sender, evargs)
+            if asyncio.iscoroutine(result):
+                # async handlers run as tasks in the loop driven by Application.run_async()
+                if Application()._loop is None:
+                    result.close()
+                    warnings.warn("{} handler {} is a coroutine but no loop is running: it was dropped; "
+                                  "use Application.run_async().".format(self.__class__.__name__,
+                                                                        getattr(handler, '__qualname__', handler)),
+                                  RuntimeWarning, stacklevel=2)
+                    continue
+                if evargs is not None:
+                    evargs.retain()
+                Application().create_task(result)
 
     def attach(self, handler_method) -> None:
         self._handlers.append(handler_method)
@@ -1927,16 +3388,90 @@ class EventBase:
 
 
 class EventArgs:
+    """Event data. EventArgs(**kwargs) carries ad hoc values, and handlers may add more;
+    event types that declare `fields` get a slotted subclass, made by define(), as their
+    `Args`. Those only have their fields: setting any other attribute raises AttributeError.
+
+    Instances from Args.acquire() are recycled once the event is dispatched: a handler
+    that keeps one after returning must keep a copy() instead.
+    """
+    __slots__ = '_values',
+
+    _fields: Tuple[str, ...] = ()
+    _pool: Optional[List['EventArgs']] = None
+    _pool_size: int = 0
+
+    @classmethod
+    def define(cls, name: str, fields: Tuple[str, ...], pool_size: int=0) -> Type['EventArgs']:
+        """A slotted EventArgs subclass taking `fields`, positionally or by keyword (default None)."""
+        fields = tuple(fields)
+
+        def __init__(self, *args, **kwargs) -> None:
+            if len(args) > len(fields):
+                raise TypeError("{}() takes at most {} arguments ({} given).".format(name, len(fields), len(args)))
+            self._pooled = False
+            for field, value in zip(fields, args):
+                setattr(self, field, value)
+            for field in fields[len(args):]:
+                setattr(self, field, kwargs.pop(field, None))
+            if kwargs:
+                raise TypeError("{}() got unexpected arguments: {}.".format(name, ", ".join(kwargs)))
+
+        return type(name, (cls,), {
+            '__slots__': fields + ('_pooled',),
+            '__init__': __init__,
+            '__setattr__': object.__setattr__,      # plain slot stores, no ad hoc values
+            '_fields': fields,
+            '_pool': [] if pool_size > 0 else None,
+            '_pool_size': pool_size,
+        })
+
+    @classmethod
+    def acquire(cls, *args, **kwargs) -> 'EventArgs':
+        """An instance from the pool when there is one; release() gives it back."""
+        pool: Optional[List[EventArgs]] = cls._pool
+        if pool:
+            evargs: EventArgs = pool.pop()
+            evargs.__init__(*args, **kwargs)
+        else:
+            evargs = cls(*args, **kwargs)
+        if pool is not None:
+            evargs._pooled = True
+        return evargs
 
     def __init__(self, **kwargs) -> None:
-        self._keys = []
-        for kw in kwargs:
-            self._keys.append(kw)
-            setattr(self, kw, kwargs[kw])
+        self._values = kwargs
+
+    def __getattr__(self, name: str) -> Any:
+        # ad hoc values; slotted subclasses never get here for their fields
+        if name != '_values':
+            try:
+                return self._values[name]
+            except KeyError:
+                pass
+        raise AttributeError("EventArgs object has no '{}' attribute.".format(name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == '_values':
+            object.__setattr__(self, name, value)
+        else:
+            self._values[name] = value
+
+    def release(self) -> None:
+        if self._fields and self._pooled:
+            self._pooled = False
+            if len(self._pool) < self._pool_size:
+                self._pool.append(self)
+
+    def retain(self) -> None:
+        """Keeps the instance out of the pool, e.g. for an async handler still running."""
+        if self._fields:
+            self._pooled = False
 
     def copy(self) -> 'EventArgs':
-        kwargs = {kw: getattr(self, kw) for kw in self._keys}
-        return EventArgs(**kwargs)
+        if self._fields:
+            return self.__class__(*[getattr(self, field) for field in self._fields])
+        return EventArgs(**self._values)
 
 
 #ctrlcls
@@ -1963,13 +3498,29 @@ class Control:
     class DefocusedEvent(EventBase):
         pass
 
+    class DestroyedEvent(EventBase):
+        pass
+
+    class WorkCompletedEvent(EventBase):
+        fields = 'future', 'result', 'error'
+
     _behavior: Behavior = BE_SELECTABLE
 
+    # keyword arguments read by the constructor: UIRuntime.build() passes them to it
+    _init_kwargs: Tuple[str, ...] = ('name', 'layout', 'owner')
+
     def __init__(self, parent: 'Control'=DEFAULT, name: str=DEFAULT, **kwargs):
         rt = UIRuntime()
         renderer: RendererBase = Application().get_renderer()
-        element: Namespace = renderer.get_element(self)
-        cursor: LayoutCursor = rt.get_cursor()
+        margin, padding, size, fit = renderer.get_layout_defaults(self)
+        building: Optional[Tuple[Optional[ContainerControl], LayoutCursor]] = rt._building
+        # only controls joining the init sequence being built are laid out by its cursor;
+        # the others (non-clients, rows recycled at runtime...) are placed by their parent
+        cursor: Optional[LayoutCursor] = None
+        if parent is DEFAULT:
+            cursor = rt.get_cursor() if building is None else building[1]
+        elif building is None and parent is not None and parent is rt.context:
+            cursor = rt.get_cursor()
         if isinstance(cursor, LayoutCursor):
             cursor(self, kwargs.get('layout', LON_NEWLINE))
 
@@ -1980,24 +3531,51 @@ class Control:
         self._tooltip: str = ""
 
         # spacing
-        self._margin: Spacing = Spacing(*element.layout.margin)
-        self._padding: Spacing = Spacing(*element.layout.padding)
+        self._margin: Spacing = Spacing(*margin)
+        self._padding: Spacing = Spacing(*padding)
         self._render_margin: Spacing = Spacing.all(0)
 
         # bounds
-        w, h = element.layout.size
+        w, h = size
 
         self._client_bounds: Rectangle = Rectangle(0, 0, w, h)
         self._client_alignment: Alignment = AL_CENTER | AL_MIDDLE
-        self._bounds: Rectangle = Rectangle(0, 0, w, h)
+        self._bounds: Rectangle = ControlBounds(0, 0, w, h)
+        # reused by the render messages: render bounds, bounds and invalidated area
+        self._render_rects: Tuple[Rectangle, Rectangle, Rectangle] = (
+            Rectangle(0, 0, 0, 0), Rectangle(0, 0, 0, 0), Rectangle(0, 0, 0, 0))
+        # absolute origin, valid while _origin_generation matches ControlBounds.generation
+        self._origin: Tuple[int, int] = (0, 0)
+        self._origin_generation: int = -1
 
         # state
         self._visible: bool = True
         self._enabled: bool = True
         self._validated: bool = False
         self._validating: bool = False
-
-        if parent is DEFAULT:
+        self._destroyed: bool = False
+        # own flags combined with the ancestors' (see _update_effective_state)
+        self._effective_visible: bool = False
+        self._effective_enabled: bool = False
+
+        # layout state: _layout_dirty means this control's children must be rearranged,
+        # _layout_dirty_child that itself or a descendant has _layout_dirty set
+        self._layout_dirty: bool = False
+        self._layout_dirty_child: bool = False
+        self._is_nonclient: bool = kwargs.get('owner') is not None
+        self._fit: bool = fit     # containers: size to the content
+
+        # background work started by Application.run_in_background()
+        self._pending_work: set = set()
+
+        if building is not None and parent is DEFAULT:
+            # UIRuntime.build(): the control is new, so no membership checks nor ADD_CHILD
+            self._parent = building[0]
+            if self._parent is None:
+                rt._append_control(self)
+            else:
+                self._parent._append_child(self)
+        elif parent is DEFAULT:
             if rt.context:
                 self.parent = rt.context
             else:
@@ -2013,6 +3591,7 @@ class Control:
                 self._name = self._parent.add_nonclient(self)
             else:
                 self.parent = parent
+        self._update_effective_state()
         self._get_events()
         # self._auto_layout()       # remove this later
 
@@ -2042,6 +3621,26 @@ class Control:
     def name(self) -> str:
         return self._name
 
+    @name.setter
+    def name(self, value: str) -> None:
+        if value == self._name:
+            return
+        previous: str = self._name
+        self._name = value
+        if self._is_nonclient:
+            nonclients: Dict[str, Control] = self._parent._nonclients
+            if nonclients.get(previous) is self:
+                del nonclients[previous]
+            nonclients[value] = self
+        elif self._parent:
+            self._parent._names.rename(self, previous)
+        elif self.is_topmost:
+            UIRuntime()._names.rename(self, previous)
+
+    @property
+    def destroyed(self) -> bool:
+        return self._destroyed
+
     @property
     def parent(self) -> Optional['Control']:
         return self._parent
@@ -2049,6 +3648,7 @@ class Control:
     @parent.setter
     def parent(self, value: 'Control') -> None:
         if self._parent is not value:
+            ControlBounds.generation += 1
             if self._parent:
                 self.send_message(self, Message.REMOVE_CHILD, self)
 
@@ -2057,6 +3657,7 @@ class Control:
                     self._parent = value
             else:
                 self._parent = None
+            self._update_effective_state()
 
     @property
     def selected_child(self) -> Optional['Control']:
@@ -2084,6 +3685,13 @@ class Control:
     def margin(self) -> Spacing:
         return self._margin
 
+    @margin.setter
+    def margin(self, value: Union[Spacing, Tuple[int, int, int, int]]) -> None:
+        if not isinstance(value, Spacing):
+            value = Spacing(*value)
+        self._margin = value
+        self.invalidate_layout()
+
     @property
     def padding(self) -> Spacing:
         return self._padding
@@ -2094,29 +3702,47 @@ class Control:
 
     @property
     def visible(self) -> bool:
-        if self.parent:
-            if self.parent.visible:
-                return self._visible
-        elif self.is_topmost:
-            return self._visible
-        return False
+        return self._effective_visible
 
     @visible.setter
     def visible(self, value: bool) -> None:
-        self._visible = value
+        if value != self._visible:
+            self._visible = value
+            self._update_effective_state()
+            self.invalidate_layout()
+            self.invalidate()
 
     @property
     def enabled(self) -> bool:
-        if self.parent:
-            if self.parent.enabled:
-                return self._enabled
-        elif self.is_topmost:
-            return self._enabled
-        return False
+        return self._effective_enabled
 
     @enabled.setter
     def enabled(self, value: bool) -> None:
-        self._enabled = value
+        if value != self._enabled:
+            self._enabled = value
+            self._update_effective_state()
+            self.invalidate()
+
+    def _update_effective_state(self) -> None:
+        # a control is visible/enabled if it and all its ancestors are, up to a topmost one;
+        # changes are pushed down, so reading the properties never walks the tree
+        parent: Optional[Control] = self._parent
+        if parent is not None:
+            visible: bool = self._visible and parent._effective_visible
+            enabled: bool = self._enabled and parent._effective_enabled
+        else:
+            topmost: bool = self.is_topmost
+            visible = self._visible and topmost
+            enabled = self._enabled and topmost
+
+        if visible is not self._effective_visible or enabled is not self._effective_enabled:
+            self._effective_visible = visible
+            self._effective_enabled = enabled
+            self._propagate_state()
+
+    def _propagate_state(self) -> None:
+        for nonclient in self._nonclients.values():
+            nonclient._update_effective_state()
 
     @property
     def location(self) -> Point:
@@ -2125,12 +3751,11 @@ class Control:
     @location.setter
     def location(self, value: Point) -> None:
         self._bounds.location = value
+        self._drop_scroll_backing()
 
     @property
     def position(self) -> Point:
-        if self._parent:
-            return self.parent.position + self._bounds.location
-        return self._bounds.location
+        return Point(*self.get_origin())
 
     @position.setter
     def position(self, value: Point) -> None:
@@ -2138,6 +3763,7 @@ class Control:
             self._bounds.location = value - self.parent.position
         else:
             self._bounds.location = value
+        self._drop_scroll_backing()
 
     @property
     def size(self) -> Size:
@@ -2154,7 +3780,9 @@ class Control:
             self._bounds.height = height
             changed = True
         if changed:
+            self._drop_scroll_backing()
             self.process_message(Message.SIZECHANGED, Size(width, height))
+            self.invalidate_layout()
 
     @property
     def rectangle(self) -> Rectangle:
@@ -2210,11 +3838,17 @@ class Control:
             self._nonclients[nonclient.name] = nonclient
         return nonclient.name
 
+    _event_types: Dict[Type, List[Tuple[str, Type[EventBase]]]] = {}
+
     def _get_events(self):
-        for name in self.__class__.__dict__:
-            event = self.__class__.__dict__[name]
-            if name != "EventBase" and name.endswith("Event"):
-                setattr(self, event.get_handler_name(), event())
+        cls: Type = self.__class__
+        events: Optional[List[Tuple[str, Type[EventBase]]]] = Control._event_types.get(cls)
+        if events is None:
+            events = Control._event_types[cls] = [
+                (event.get_handler_name(), event) for name, event in cls.__dict__.items()
+                if name != "EventBase" and name.endswith("Event")]
+        for handler_name, event in events:
+            setattr(self, handler_name, event())
 
         try:
             super()._get_events()
@@ -2239,37 +3873,106 @@ class Control:
         rect.location = self.local_to_screen(rect.location)
         return rect
 
+    def get_origin(self) -> Tuple[int, int]:
+        """Screen coordinates of the control's top-left corner.
+
+        Cached until a control moves, so repeated calls cost O(1) and allocate nothing.
+        """
+        if self._origin_generation != ControlBounds.generation:
+            bounds: Rectangle = self._bounds
+            if self._parent:
+                x, y = self._parent.get_origin() if self._is_nonclient else self._parent.get_content_origin()
+                self._origin = (x + bounds._left, y + bounds._top)
+            else:
+                self._origin = (bounds._left, bounds._top)
+            self._origin_generation = ControlBounds.generation
+        return self._origin
+
+    def get_content_origin(self) -> Tuple[int, int]:
+        """Screen coordinates the children's locations are relative to; scrolling shifts it."""
+        return self.get_origin()
+
     def client_to_screen(self, point: Point) -> Point:
-        if self.parent:
-            return self.parent.client_to_screen(self.location) + point
-        return self.location + point
+        x, y = self.get_origin()
+        return Point(x + point.x, y + point.y)
 
     def screen_to_client(self, point: Point) -> Point:
-        if self.parent:
-            return point - self.parent.client_to_screen(self.location)
-        return point - self.location
+        x, y = self.get_origin()
+        return Point(point.x - x, point.y - y)
 
     def local_to_screen(self, point: Point) -> Point:
-        if self.parent:
-            return self.parent.client_to_screen(point - self.location)
+        if self._parent:
+            x, y = self._parent.get_origin()
+            return Point(x + point.x - self._bounds._left, y + point.y - self._bounds._top)
         return point
 
     def screen_to_local(self, point: Point) -> Point:
-        if self.parent:
-            return point - self.parent.client_to_screen(Point(0, 0))
+        if self._parent:
+            x, y = self._parent.get_origin()
+            return Point(point.x - x, point.y - y)
         return point
 
-    def get_bounds(self) -> 'Rectangle':
-        return Rectangle.join(self.position, self.size)
+    def get_bounds(self, out: Optional[Rectangle]=None) -> 'Rectangle':
+        """Bounds in screen coordinates; written to out when given."""
+        x, y = self.get_origin()
+        bounds: Rectangle = self._bounds
+        if out is None:
+            return Rectangle(x, y, bounds._width, bounds._height)
+        return out.set(x, y, bounds._width, bounds._height)
+
+    def contains(self, position: Point) -> bool:
+        """Whether the screen position is inside the control's bounds."""
+        x, y = self.get_origin()
+        bounds: Rectangle = self._bounds
+        return x <= position._x < x + bounds._width and y <= position._y < y + bounds._height
+
+    def invalidate_layout(self) -> None:
+        """Marks this control's level for reflow in the next UIRuntime.update_layout() pass."""
+        if self._is_nonclient:
+            return      # non-clients are placed by their owner
+        parent: Optional[Control] = self._parent
+        if parent is None:
+            if self.is_topmost:
+                UIRuntime().invalidate_layout()
+            return
+
+        parent.invalidate_measure()
+
+    def measure(self) -> Size:
+        """Desired size of the control, as used by its parent's layout."""
+        return self._bounds.size
 
-    def get_render_bounds(self) -> 'Rectangle':
-        return self.get_bounds().expand(self._margin)
+    def update_layout(self) -> None:
+        self._layout_dirty = False
+        self._layout_dirty_child = False
+
+    def get_render_bounds(self, out: Optional[Rectangle]=None) -> 'Rectangle':
+        return self.get_bounds(out).expand(self._margin)
 
     def send_message(self, receiver: 'Control', message: Message, *params) -> Any:
         return receiver.process_message(message, *params)
 
+    def destroy(self) -> None:
+        if not self._destroyed:
+            self.process_message(Message.DESTROYED)
+
     def invalidate(self) -> None:
-        pass
+        """Tells the runtime the control looks different; input latency is measured to
+        the next display update. Scrollable ancestors showing it repaint their viewport
+        in full, see _drop_scroll_backing()."""
+        self._drop_scroll_backing()
+        latency: Optional[LatencyMonitor] = UIRuntime()._latency
+        if latency is not None:
+            latency.invalidated()
+
+    def _drop_scroll_backing(self) -> None:
+        # the blit-scroll pixels of scrollable ancestors showing the control are outdated:
+        # it changed its looks, moved or was resized
+        control: Control = self
+        while control._parent is not None:
+            if not control._is_nonclient and isinstance(control._parent, ScrollableControl):
+                control._parent._backing_rect = None
+            control = control._parent
 
     def _render_nonclient(self, bounds: Rectangle, render_bounds: Rectangle) -> None:
         #fullclip
@@ -2287,9 +3990,40 @@ class Control:
             handler = getattr(self, '_on_created', lambda sender, evargs: None)
             handler(self, None)
 
+        elif message is Message.SKINCHANGED:
+            margin, padding, _, _ = Application().get_renderer().get_layout_defaults(self)
+            self._margin = Spacing(*margin)
+            self._padding = Spacing(*padding)
+            self.invalidate_layout()
+
+        elif message is Message.DESTROYED:
+            self._destroyed = True
+            for future in self._pending_work:
+                future.cancel()
+            self._pending_work.clear()
+            for name in self._nonclients:
+                self._nonclients[name].process_message(Message.DESTROYED)
+
+            handler = getattr(self, '_on_destroyed', lambda sender, evargs: None)
+            handler(self, None)
+
+            rt: UIRuntime = UIRuntime()
+            if self._parent:
+                self._parent.process_message(Message.REMOVE_CHILD, self)
+                self._parent = None
+            else:
+                rt.remove_control(self)
+            rt.release(self)
+            return True
+
+        elif message is Message.WORK_COMPLETED:
+            handler = getattr(self, '_on_workcompleted', lambda sender, evargs: None)
+            handler(self, params[0])
+            return True
+
         elif message is Message.HIT_TEST:
             position: Point = params[0]
-            if self.get_bounds().contains(position) and self._visible:
+            if self._visible and self.contains(position):
                 return self, HT_CLIENT
             return None, HT_NONE
 
@@ -2326,6 +4060,12 @@ class Control:
         elif message is Message.MOUSE_HOVER:
             return self._tooltip
 
+        elif message is Message.MOUSE_WHEEL:
+            # bubbles up until a scrollable control handles it
+            if self._parent:
+                return self._parent.process_message(message, *params)
+            return False
+
         elif message is Message.SELECTED:
             # the control was clicked: whether it can receive focus or not, depends on this message return value
             # return None if it can't (or makes no sense to) receive focus, or a child than can.
@@ -2353,9 +4093,10 @@ class Control:
             if not renderer.get_render_layers(self) & RL_BACKGROUND == RL_BACKGROUND:
                 return True
             clip_area: Rectangle = params[0]  # received from the parent
-            render_bounds: Rectangle = self.get_render_bounds()
-            bounds: Rectangle = self.get_bounds()
-            invalidated: Rectangle = clip_area.intersection(render_bounds)
+            render_rect, bounds_rect, invalidated_rect = self._render_rects
+            render_bounds: Rectangle = self.get_render_bounds(render_rect)
+            bounds: Rectangle = self.get_bounds(bounds_rect)
+            invalidated: Rectangle = clip_area.intersection(render_bounds, invalidated_rect)
 
             if invalidated.empty:
                 return True
@@ -2372,9 +4113,10 @@ class Control:
         elif message is Message.RENDER:
             renderer: RendererBase = Application().get_renderer()
             clip_area: Rectangle = params[0]  # received from the parent
-            render_bounds: Rectangle = self.get_render_bounds()
-            bounds: Rectangle = self.get_bounds()
-            invalidated: Rectangle = clip_area.intersection(render_bounds)
+            render_rect, bounds_rect, invalidated_rect = self._render_rects
+            render_bounds: Rectangle = self.get_render_bounds(render_rect)
+            bounds: Rectangle = self.get_bounds(bounds_rect)
+            invalidated: Rectangle = clip_area.intersection(render_bounds, invalidated_rect)
             rendered: bool = False
             layer: RenderLayer = renderer.get_render_layers(self)
 
@@ -2406,9 +4148,10 @@ class Control:
                 return True
 
             clip_area: Rectangle = params[0]  # received from the parent
-            render_bounds: Rectangle = self.get_render_bounds()
-            bounds: Rectangle = self.get_bounds()
-            invalidated: Rectangle = clip_area.intersection(render_bounds)
+            render_rect, bounds_rect, invalidated_rect = self._render_rects
+            render_bounds: Rectangle = self.get_render_bounds(render_rect)
+            bounds: Rectangle = self.get_bounds(bounds_rect)
+            invalidated: Rectangle = clip_area.intersection(render_bounds, invalidated_rect)
 
             if invalidated.empty:
                 return True
@@ -2457,22 +4200,27 @@ class ButtonBase(Control):
         if message is Message.MOUSE_ENTER:
             if self.enabled:
                 self._pressed_state = BPS_HILIGHTED
+                self.invalidate()
 
         elif message is Message.MOUSE_PRESS:
             if self.enabled:
                 self._pressed_state = BPS_PRESSED
+                self.invalidate()
 
         elif message is Message.MOUSE_RELEASE:
             if self.enabled:
                 is_hovering: bool = params[0]
                 if is_hovering:
                     self._pressed_state = BPS_HILIGHTED
+                    self.invalidate()
                 else:
                     self._pressed_state = BPS_NORMAL
+                    self.invalidate()
 
         elif message is Message.MOUSE_LEAVE:
             if self.enabled:
                 self._pressed_state = BPS_NORMAL
+                self.invalidate()
 
         return super().process_message(message, *params)
 
@@ -2486,21 +4234,43 @@ class PushButton(ButtonBase):
     def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
         super(PushButton, self).__init__(parent, name, **kwargs)
         renderer: RendererBase = Application().get_renderer()
-        self._padding = Spacing(*renderer.get_element(self).layout.padding)
+        self._padding = Spacing(*renderer.get_layout_defaults(self)[1])
         size: Size = renderer.measure_text(self, self.text)
         self._bounds.size = size
         self._bounds.expand(self._padding)
 
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        if value != self._text:
+            self._text = value
+            self.invalidate()
+            self.process_message(Message.TEXTCHANGED, value)
+
     def process_message(self, message: Message, *params) -> Any:
 
-        if message is Message.MOUSE_RELEASE:
+        if message is Message.TEXTCHANGED:
+            renderer: RendererBase = Application().get_renderer()
+            size: Size = renderer.measure_text(self, params[0])
+            self.size = Size(size.width + self._padding.hor, size.height + self._padding.ver)
+
+        elif message is Message.SKINCHANGED:
+            super().process_message(message, *params)
+            return self.process_message(Message.TEXTCHANGED, self._text)
+
+        elif message is Message.MOUSE_RELEASE:
             if self.enabled:
                 is_hovering: bool = params[0]
                 if is_hovering:
                     self._pressed_state = BPS_HILIGHTED
+                    self.invalidate()
                     self._on_pressed(self, None)
                 else:
                     self._pressed_state = BPS_NORMAL
+                    self.invalidate()
 
         return super().process_message(message, *params)
 
@@ -2515,7 +4285,7 @@ class CheckBox(ButtonBase):
         pass
 
     class CheckChangedEvent(EventBase):
-        pass
+        fields = 'check_state',
 
     _behavior = Control._behavior | BE_FIXED_HEIGHT
 
@@ -2532,6 +4302,7 @@ class CheckBox(ButtonBase):
     def text(self, value: str) -> None:
         if value != self._text:
             self._text = value
+            self.invalidate()
             self.process_message(Message.TEXTCHANGED, value)
 
     @property
@@ -2552,15 +4323,18 @@ class CheckBox(ButtonBase):
             self._toggle_state = BTS_ON
         else:
             self._toggle_state = BTS_OFF
+        self.invalidate()
 
     def check(self) -> None:
         if self.check_state is not CBS_CHECKED:
             self._toggle_state = BTS_ON
+            self.invalidate()
             self._on_checked(self, None)
 
     def uncheck(self) -> None:
         if self.check_state is not CBS_UNCHECKED:
             self._toggle_state = BTS_OFF
+            self.invalidate()
             self._on_unchecked(self, None)
 
     def _get_base_size(self, text: str) -> Size:
@@ -2577,20 +4351,26 @@ class CheckBox(ButtonBase):
                 is_hovering: bool = params[0]
                 if is_hovering:
                     self._pressed_state = BPS_HILIGHTED
+                    self.invalidate()
                     if self._toggle_state is BTS_ON:
                         self._toggle_state = BTS_OFF
                         self._on_unchecked(self, None)
                     else:
                         self._toggle_state = BTS_ON
                         self._on_checked(self, None)
-                    self._on_checkchanged(self, EventArgs(check_state=CBS_CHECKED))
+                    self._on_checkchanged(self, CheckBox.CheckChangedEvent.Args(CBS_CHECKED))
                 else:
                     self._pressed_state = BPS_NORMAL
+                    self.invalidate()
 
         elif message is Message.TEXTCHANGED:
             text: str = params[0]
             self.size = self._get_base_size(text)
 
+        elif message is Message.SKINCHANGED:
+            super().process_message(message, *params)
+            return self.process_message(Message.TEXTCHANGED, self._text)
+
         elif message is Message.SIZECHANGED:
             size: Size = params[0]
             if self.is_topmost:
@@ -2618,7 +4398,7 @@ class RadioButton(ButtonBase):
         pass
 
     class CheckChangedEvent(EventBase):
-        pass
+        fields = 'check_state',
 
     _behavior = Control._behavior | BE_FIXED_HEIGHT
 
@@ -2635,6 +4415,7 @@ class RadioButton(ButtonBase):
     def text(self, value: str) -> None:
         if value != self._text:
             self._text = value
+            self.invalidate()
             self.process_message(Message.TEXTCHANGED, value)
 
     @property
@@ -2655,15 +4436,18 @@ class RadioButton(ButtonBase):
             self._toggle_state = BTS_ON
         else:
             self._toggle_state = BTS_OFF
+        self.invalidate()
 
     def check(self) -> None:
         if self.check_state is not CBS_CHECKED:
             self._toggle_state = BTS_ON
+            self.invalidate()
             self._on_checked(self, None)
 
     def uncheck(self) -> None:
         if self.check_state is not CBS_UNCHECKED:
             self._toggle_state = BTS_OFF
+            self.invalidate()
             self._on_unchecked(self, None)
 
     def _get_base_size(self, text: str) -> Size:
@@ -2680,17 +4464,23 @@ class RadioButton(ButtonBase):
                 is_hovering: bool = params[0]
                 if is_hovering:
                     self._pressed_state = BPS_HILIGHTED
+                    self.invalidate()
                     if self._toggle_state is BTS_OFF:
                         self._toggle_state = BTS_ON
                         self._on_checked(self, None)
                     # self._on_checkchanged(self, EventArgs(check_state=CBS_CHECKED))
                 else:
                     self._pressed_state = BPS_NORMAL
+                    self.invalidate()
 
         elif message is Message.TEXTCHANGED:
             text: str = params[0]
             self.size = self._get_base_size(text)
 
+        elif message is Message.SKINCHANGED:
+            super().process_message(message, *params)
+            return self.process_message(Message.TEXTCHANGED, self._text)
+
         elif message is Message.SIZECHANGED:
             size: Size = params[0]
             if self.is_topmost:
@@ -2727,6 +4517,7 @@ class BarBase(Control):
     @value.setter
     def value(self, value: int) -> None:
         self._value = value
+        self.invalidate()
 
     @property
     def minimum(self) -> int:
@@ -2748,6 +4539,14 @@ class BarBase(Control):
             raise ValueError("Maximum value must be larger than minimum.")
         self._maximum = value
 
+    @property
+    def increment(self) -> int:
+        return self._increment
+
+    @increment.setter
+    def increment(self, value: int) -> None:
+        self._increment = max(1, int(value))
+
     @property
     def length(self) -> int:
         return self._maximum - self._minimum
@@ -2793,10 +4592,18 @@ class VScrollBar(BarBase):
             self._bounds.location = location
             self._bounds.size = Size(element.thickness, length)
 
+        def process_message(self, message: Message, *params) -> Any:
+            if message is Message.MOUSE_RELEASE:
+                if self.enabled and params[0]:
+                    self._parent.scroll(self._parent.value - self._parent.increment)
+
+            return super().process_message(message, *params)
+
     class VSSlider(ButtonBase):
 
         def __init__(self, owner: 'VScrollbar'=None, name: str=DEFAULT, **kwargs) -> None:
             super().__init__(None, name, owner=owner)
+            self._drag_value: int = 0
 
         def set_bounds(self, location: Point, length: int) -> None:
             renderer: RendererBase = Application().get_renderer()
@@ -2804,6 +4611,18 @@ class VScrollBar(BarBase):
             self._bounds.location = location
             self._bounds.size = Size(element.thickness, length)
 
+        def process_message(self, message: Message, *params) -> Any:
+            if message is Message.MOUSE_STARTDRAG:
+                self._drag_value = self._parent.value
+
+            elif message is Message.MOUSE_DRAGGING or message is Message.MOUSE_DRAGMOVE:
+                if self.enabled:
+                    start_position: Point = params[1]
+                    position: Point = params[2]
+                    self._parent.slide(self._drag_value, position.y - start_position.y)
+
+            return super().process_message(message, *params)
+
     class VSDownButton(ButtonBase):
 
         def __init__(self, owner: 'VScrollbar'=None, name: str=DEFAULT, **kwargs) -> None:
@@ -2815,8 +4634,16 @@ class VScrollBar(BarBase):
             self._bounds.location = location
             self._bounds.size = Size(element.thickness, length)
 
+        def process_message(self, message: Message, *params) -> Any:
+            if message is Message.MOUSE_RELEASE:
+                if self.enabled and params[0]:
+                    self._parent.scroll(self._parent.value + self._parent.increment)
+
+            return super().process_message(message, *params)
+
     def __init__(self, parent: 'Control'=None, name: str=DEFAULT, **kwargs) -> None:
         super().__init__(None, name, **kwargs)
+        self._scroll_length: int = 0    # pixels the slider can travel
         VScrollBar.VSUpButton(self, "_up_button")
         VScrollBar.VSSlider(self, "_slider")
         VScrollBar.VSDownButton(self, "_down_button")
@@ -2839,12 +4666,15 @@ class VScrollBar(BarBase):
 
         bar_length: int = length - (element.thickness * 2)
         if bar_length > 0:
-            pos = self._value / (self._maximum - self._minimum)
+            pos: float = (self._value - self._minimum) / self.length if self.length else 0.0
             large_val: int = bar_length
-            small_val: int = int((self._small_value / self._large_value) * bar_length)
+            small_val: int = bar_length
+            if self._large_value > 0:
+                small_val = int(min(1.0, self._small_value / self._large_value) * bar_length)
+            small_val = max(small_val, min(8, bar_length))
             scroll_len: int = large_val - small_val
             scroll_pos: int = int(pos * scroll_len)
-            # print('->', scroll_len, pos, [self._value, self._minimum, self._maximum])
+            self._scroll_length = scroll_len
 
             # if the slider length is smaller than 4, hide it.
             self._slider.visible = small_val > 4
@@ -2855,19 +4685,33 @@ class VScrollBar(BarBase):
 
         else:
             height: int = length // 2
+            self._scroll_length = 0
             self._up_button.set_bounds(Point(0, 0), height)
             self._down_button.set_bounds(Point(0, length - height), height)
 
     def _update_slider(self) -> None:
         # set the slider position accordingly to the scroll value
-        pass
+        self.set_bounds(self._bounds.location, self._bounds.height)
+
+    def scroll(self, value: int) -> None:
+        previous: int = self._value
+        super().scroll(value)
+        if self._value != previous:
+            self._update_slider()
+            if self._parent:
+                self._parent.process_message(Message.SCROLLED, self, previous)
+
+    def slide(self, start_value: int, offset: int) -> None:
+        # moves the slider offset pixels from where it was when the drag began
+        if self._scroll_length > 0:
+            self.scroll(start_value + offset * self.length / self._scroll_length)
 
     def process_message(self, message: Message, *params) -> Any:
         if message is Message.HIT_TEST:
             position: Point = params[0]
 
             obj, test = None, HT_NONE
-            if self.get_bounds().contains(position):
+            if self._visible and self.contains(position):
                 obj, test = self._up_button.process_message(message, *params)
 
                 if obj is None:
@@ -2878,8 +4722,18 @@ class VScrollBar(BarBase):
 
                 if obj is None:
                     return self, HT_NONCLIENT
-                else:
-                    return obj, test
+            return obj, test
+
+        elif message is Message.MOUSE_PRESS:
+            # a click in the track scrolls one page towards the click position
+            if self.enabled:
+                position: Point = params[1]
+                if position.y < self._slider.get_bounds().top:
+                    self.scroll(self._value - self._small_value)
+                elif position.y >= self._slider.get_bounds().bottom:
+                    self.scroll(self._value + self._small_value)
+            return super().process_message(message, *params)
+
         else:
             return super().process_message(message, *params)
 
@@ -2888,16 +4742,19 @@ class VScrollBar(BarBase):
 class HSlider(BarBase):
 
     class ValueChangingEvent(EventBase):
-        pass
+        fields = 'new', 'actual'
+        pool_size = 4   # one per drag motion
 
     class ValueChangingCancelEvent(EventBase):
         pass
 
     class ValueChangedEvent(EventBase):
-        pass
+        fields = 'previous', 'actual'
 
     _behavior: Behavior = BarBase._behavior | BE_FIXED_HEIGHT
 
+    _init_kwargs: Tuple[str, ...] = ('minimum', 'maximum', 'value', 'precision', 'small_value', 'large_value', 'length')
+
     def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
         super().__init__(parent, name, **kwargs)
         self._minimum = int(kwargs.get('minimum', 0))
@@ -2950,10 +4807,12 @@ class HSlider(BarBase):
                 slider_rect: Rectangle = self.get_slider_rect()
                 if slider_rect.contains(local_position):
                     self._state = 'hilighted'
+                    self.invalidate()
 
         if message is Message.MOUSE_LEAVE:
             if self.enabled:
                 self._state = 'normal'
+                self.invalidate()
 
         elif message is Message.MOUSE_MOVE:
             if self.enabled:
@@ -2963,6 +4822,7 @@ class HSlider(BarBase):
                 if slider_rect.contains(local_position):
                     if not self._sliding:
                         self._state = 'hilighted'
+                        self.invalidate()
 
         elif message is Message.MOUSE_PRESS:
             if self.enabled:
@@ -2977,10 +4837,12 @@ class HSlider(BarBase):
                         self._drag_offset = local_position - slider_rect.location
                         self._sliding = True
                         self._state = 'pressed'
+                        self.invalidate()
 
                     elif bar_rect.contains(local_position):
                         self._sliding = False
                         self._drag_pos = local_position.x
+                        self.invalidate()
                         ratio: float = self._drag_pos / self.size.width
                         value: Union[int, float] = self._minimum + (self._maximum - self._minimum) * ratio
                         if self._precision > 0:
@@ -2990,9 +4852,10 @@ class HSlider(BarBase):
 
                         old_value = self._value
                         self._value = value
+                        self.invalidate()
 
                         if old_value != self._value:
-                            self._on_valuechanged(self, EventArgs(previous=old_value, actual=self._value))
+                            self._on_valuechanged(self, HSlider.ValueChangedEvent.Args(old_value, self._value))
 
         elif message is Message.MOUSE_DRAGGING:
             if self.enabled:
@@ -3005,6 +4868,7 @@ class HSlider(BarBase):
 
                 if self._sliding:
                     self._drag_pos = local_position.x
+                    self.invalidate()
                     ratio: float = self._drag_pos / self.size.width
                     value: Union[int, float] = self._minimum + (self._maximum - self._minimum) * ratio
                     if self._precision > 0:
@@ -3013,7 +4877,9 @@ class HSlider(BarBase):
                         value = int(value)
 
                     if value != self._value:
-                        self._on_valuechanging(self, EventArgs(new=value, actual=self._value))
+                        evargs: EventArgs = HSlider.ValueChangingEvent.Args.acquire(value, self._value)
+                        self._on_valuechanging(self, evargs)
+                        evargs.release()
 
         elif message is Message.MOUSE_STOPDRAG:
             if self.enabled:
@@ -3028,8 +4894,10 @@ class HSlider(BarBase):
                     self._sliding = False
                     if slider_rect.contains(local_position):
                         self._state = 'hilighted'
+                        self.invalidate()
                     else:
                         self._state = 'normal'
+                        self.invalidate()
                     if not dragged_outside:
                         ratio: float = self._drag_pos / self.size.width
                         value: Union[int, float] = self._minimum + (self._maximum - self._minimum) * ratio
@@ -3040,9 +4908,10 @@ class HSlider(BarBase):
 
                         old_value: Union[int, float] = self._value
                         self._value = value
+                        self.invalidate()
 
                         if old_value != self._value:
-                            self._on_valuechanged(self, EventArgs(previous=old_value, actual=self._value))
+                            self._on_valuechanged(self, HSlider.ValueChangedEvent.Args(old_value, self._value))
                     else:
                         self._on_valuechangingcancel(self, None)
 
@@ -3056,8 +4925,16 @@ class ContainerControl(Control):
 
     def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
         # client controls (children)
-        self._children: List[Control] = []
+        self._children: ControlList = ControlList()
+        self._names: NameIndex = NameIndex()
         self._selected: int = -1    # index of the child with
+        self._layout_cursor: LayoutCursor = LayoutCursor()
+        # measure/arrange: desired size and child placements, valid until children change
+        self._desired_size: Optional[Size] = None
+        self._placements: Tuple[List[Control], Any, Any] = ([], [], [])
+        self._content_extent: Tuple[int, int] = (0, 0)     # right/bottom of the last flow, local
+        # screen bounds of the children for batched culling/hit testing, see get_children_rects()
+        self._children_rects: Optional[Tuple[int, int, RectArray, RectArray]] = None
         super().__init__(parent, name, **kwargs)
 
     def __getattr__(self, name: str) -> 'Control':
@@ -3066,6 +4943,58 @@ class ContainerControl(Control):
             return super().__getattr__(name)
         return child
 
+    @property
+    def size(self) -> Size:
+        return self._bounds.size
+
+    @size.setter
+    def size(self, value: Size) -> None:
+        self._fit = False   # an explicit size disables fitting to the content
+        self._desired_size = None
+        Control.size.fset(self, value)
+
+    @property
+    def fit(self) -> bool:
+        return self._fit
+
+    @fit.setter
+    def fit(self, value: bool) -> None:
+        if value != self._fit:
+            self._fit = value
+            self.invalidate_measure()
+
+    def invalidate_measure(self) -> None:
+        """Drops the cached desired size and schedules the children to be rearranged."""
+        self._desired_size = None
+        self._layout_dirty = True
+        node: Optional[Control] = self
+        while node is not None and not node._layout_dirty_child:
+            node._layout_dirty_child = True
+            node = node._parent
+        if node is None:
+            UIRuntime()._layout_pending = True
+
+    def measure(self) -> Size:
+        if self._desired_size is None:
+            controls, xs, ys, right, bottom = layout_flow(self._layout_cursor, self._children,
+                                                          self._padding.left, self._padding.top)
+            self._placements = controls, xs, ys
+            self._content_extent = right, bottom
+            if self._fit and controls:
+                self._desired_size = Size(right + self._padding.right, bottom + self._padding.bottom)
+            else:
+                self._desired_size = self._bounds.size
+        return self._desired_size
+
+    def update_layout(self) -> None:
+        # post-order: children settle their sizes before this control arranges them
+        for child in self._children:
+            if child._layout_dirty_child:
+                child.update_layout()
+        if self._layout_dirty:
+            self.process_message(Message.LAYOUT_CHILDREN, None)
+        self._layout_dirty_child = False
+
     @property
     def selected_child(self) -> Optional['Control']:
         if len(self._children):
@@ -3076,11 +5005,67 @@ class ContainerControl(Control):
         self._selected = -1
         return super(ContainerControl, self).selected_child
 
+    def get_children_clip(self, render_bounds: Rectangle) -> Rectangle:
+        # screen area the children are allowed to paint on
+        return render_bounds
+
+    def render_children(self, clip: Rectangle) -> None:
+        for child in self.children_in(clip):
+            if child._effective_visible:
+                child.process_message(Message.RENDER_BACKGROUND, clip)
+                child.process_message(Message.RENDER, clip)
+                child.process_message(Message.RENDER_FOREGROUND, clip)
+
     def find_by_name(self, name: str) -> Optional['Control']:
-        for control in self._children:
-            if control.name == name:
-                return control
-        return None
+        return self._names.get(name)
+
+    def find(self, path: str) -> Optional['Control']:
+        """Finds a descendant by its path of names, e.g. 'panel1/pushbutton2'."""
+        return find_path(self, path)
+
+    def get_children_rects(self) -> Optional[Tuple[RectArray, RectArray]]:
+        """Screen bounds of the children, plain and expanded by their padding, in child
+        order. None when there are too few children to batch (or NumPy is missing)."""
+        if np is None or len(self._children) < RECT_BATCH_THRESHOLD:
+            return None
+        cached = self._children_rects
+        if cached is None or cached[0] != ControlBounds.generation or cached[1] != self._children.version:
+            # local bounds straight from the fields, moved to the screen in one go
+            bounds: RectArray = RectArray.from_array(
+                [(b._left, b._top, b._width, b._height) for b in [child._bounds for child in self._children]]
+            ).translate(*self.get_content_origin())
+            paddings: Any = [(c._padding.left, c._padding.top, c._padding.right, c._padding.bottom)
+                             for c in self._children]
+            cached = (ControlBounds.generation, self._children.version, bounds, bounds.expand(paddings))
+            self._children_rects = cached
+        return cached[2], cached[3]
+
+    def children_at(self, position: Point) -> List['Control']:
+        """Children whose bounds contain the screen position, in child order."""
+        rects: Optional[Tuple[RectArray, RectArray]] = self.get_children_rects()
+        if rects is None:
+            return [child for child in self._children if child.contains(position)]
+        children: ControlList = self._children
+        return [children[i] for i in np.flatnonzero(rects[0].contains_point(position)).tolist()]
+
+    def children_in(self, clip: Rectangle) -> List['Control']:
+        """Children whose padded bounds meet the screen rectangle, in child order."""
+        rects: Optional[Tuple[RectArray, RectArray]] = self.get_children_rects()
+        if rects is None:
+            padded: Rectangle = Rectangle(0, 0, 0, 0)
+            return [child for child in self._children
+                    if clip.intersects(child.get_bounds(padded).expand(child._padding))]
+        children: ControlList = self._children
+        return [children[i] for i in np.flatnonzero(rects[1].intersects(clip)).tolist()]
+
+    def _append_child(self, child: 'Control') -> None:
+        self._children.append(child)
+        self._names.add(child)
+
+    def _propagate_state(self) -> None:
+        super()._propagate_state()
+        for child in self._children:
+            child._update_effective_state()
 
     # ctnrmsg
     def process_message(self, message: Message, *params):
@@ -3089,10 +5074,10 @@ class ContainerControl(Control):
             position: Point = params[0]
             ht_object: Optional[Control] = None
             ht_result: HitTest = HT_NONE
-            if self.get_bounds().contains(position) and self._visible:
+            if self._visible and self.contains(position):
                 ht_object = self
                 ht_result = HT_CLIENT
-                for child in self._children:
+                for child in self.children_at(position):
                     hit, hittest = child.process_message(message, *params)
                     if hit:
                         ht_object = hit
@@ -3100,6 +5085,11 @@ class ContainerControl(Control):
 
             return ht_object, ht_result
 
+        elif message is Message.SKINCHANGED:
+            result: Any = super().process_message(message, *params)
+            self.invalidate_measure()     # the padding may have changed
+            return result
+
         elif message is Message.CHILD_INDEX:
             child: 'Control' = params[0]
             if child in self._children:
@@ -3110,7 +5100,8 @@ class ContainerControl(Control):
         elif message is Message.ADD_CHILD:
             child: 'Control' = params[0]
             if child not in self._children:
-                self._children.append(child)
+                self._append_child(child)
+                self.invalidate_measure()
             return True
 
         elif message is Message.REMOVE_CHILD:
@@ -3119,55 +5110,33 @@ class ContainerControl(Control):
                 if self._selected >= 0 and self._children.index(child) <= self._selected:
                     self._selected -= 1
                 self._children.remove(child)
+                self._names.remove(child)
+                self.invalidate_measure()
+
+        elif message is Message.DESTROYED:
+            for child in list(self._children):
+                child.process_message(Message.DESTROYED)
+            return super().process_message(message, *params)
 
         elif message is Message.REMOVE_CHILDREN:
             self._children.clear()
+            self._names.clear()
             self._selected = -1
+            self.invalidate_measure()
             # self.invalidate()
 
         elif message is Message.LAYOUT_CHILDREN:
+            # arrange: measure (cached) and move the children to their placements
             cursor: Optional[LayoutCursor] = params[0]
-            left: int = self.padding.left
-            top: int = self.padding.top
-            bottom: int = self.padding.top
-            previous: Control = None
-            for child, layout in cursor:
-                if child not in self._children:
-                    continue
+            if cursor is not None and cursor is not self._layout_cursor:
+                self._layout_cursor = cursor    # reflows reuse the sequence from initialization
+                self._desired_size = None
+            self._layout_dirty = False
+            desired: Size = self.measure()
+            place_controls(*self._placements)
 
-                if not previous:
-                    child.location = Point(left + child.margin.left, top + child.margin.top)
-                    if bottom < child.bounds.bottom + child.margin.bottom:
-                        bottom = child.bounds.bottom + child.margin.bottom
-                else:
-                    if layout is LON_SAMELINE:
-                        child.bounds.left = previous.bounds.right + previous.margin.right + child.margin.left
-                        child.bounds.top = top + child.margin.top
-                        if bottom < child.bounds.bottom + child.margin.bottom:
-                            bottom = child.bounds.bottom + child.margin.bottom
-
-                    elif layout is LON_BELOW:
-                        child.bounds.left = previous.bounds.left - previous.margin.left + child.margin.left
-                        child.bounds.top = previous.bounds.bottom + previous.margin.bottom + child.margin.top
-                        if bottom < child.bounds.bottom + child.margin.bottom:
-                            bottom = child.bounds.bottom + child.margin.bottom
-
-                    elif layout is LON_CASCADE:
-                        child.bounds.left = previous.bounds.left + 32
-                        child.bounds.top = previous.bounds.top + 32
-                        if bottom < child.bounds.bottom + child.margin.bottom:
-                            bottom = child.bounds.bottom + child.margin.bottom
-
-                    elif layout is LON_NEWLINE:
-                        child.bounds.left = left + child.margin.left
-                        child.bounds.top = bottom + child.margin.top
-                        bottom = child.bounds.bottom + child.margin.bottom
-
-                    elif layout is LON_MANUAL:
-                        pass        # do nothing...
-
-                # child.process_message(Message.LAYOUT_POS, left, top)
-                previous = child
+            if self._fit and (desired.width != self._bounds.width or desired.height != self._bounds.height):
+                Control.size.fset(self, desired)
 
         elif message is Message.SELECT:
             child: 'Control' = params[0]
@@ -3210,9 +5179,10 @@ class ContainerControl(Control):
             if not renderer.get_render_layers(self) & RL_BACKGROUND == RL_BACKGROUND:
                 return True
             clip_area: Rectangle = params[0]  # received from the parent
-            render_bounds: Rectangle = self.get_render_bounds()
-            bounds: Rectangle = self.get_bounds()
-            invalidated: Rectangle = clip_area.intersection(render_bounds)
+            render_rect, bounds_rect, invalidated_rect = self._render_rects
+            render_bounds: Rectangle = self.get_render_bounds(render_rect)
+            bounds: Rectangle = self.get_bounds(bounds_rect)
+            invalidated: Rectangle = clip_area.intersection(render_bounds, invalidated_rect)
 
             if invalidated.empty:
                 return True
@@ -3229,9 +5199,10 @@ class ContainerControl(Control):
         elif message is Message.RENDER:
             renderer: RendererBase = Application().get_renderer()
             clip_area: Rectangle = params[0]  # received from the parent
-            render_bounds: Rectangle = self.get_render_bounds()
-            bounds: Rectangle = self.get_bounds()
-            invalidated: Rectangle = clip_area.intersection(render_bounds)
+            render_rect, bounds_rect, invalidated_rect = self._render_rects
+            render_bounds: Rectangle = self.get_render_bounds(render_rect)
+            bounds: Rectangle = self.get_bounds(bounds_rect)
+            invalidated: Rectangle = clip_area.intersection(render_bounds, invalidated_rect)
             rendered: bool = False
             layer: RenderLayer = renderer.get_render_layers(self)
 
@@ -3244,14 +5215,7 @@ class ContainerControl(Control):
             if layer & RL_ABOVE_BACKGROUND == RL_ABOVE_BACKGROUND:
                 renderer.render(self, render_bounds, bounds, RL_ABOVE_BACKGROUND)
                 rendered = True
-            for child in self._children:
-                child_render_bounds: Rectangle = child.get_bounds().expand(child.padding)
-                if render_bounds.intersects(child_render_bounds) and child.visible:
-                    child.process_message(message.RENDER_BACKGROUND, render_bounds)
-                    child.process_message(message.RENDER, render_bounds)
-                    child.process_message(message.RENDER_FOREGROUND, render_bounds)
-                else:
-                    raise RuntimeError()
+            self.render_children(self.get_children_clip(render_bounds))
             if layer & RL_BELOW_FOREGROUND == RL_BELOW_FOREGROUND:
                 if rendered:
                     this = GrUsInRendererError(
@@ -3271,9 +5235,10 @@ class ContainerControl(Control):
                 return True
 
             clip_area: Rectangle = params[0]  # received from the parent
-            render_bounds: Rectangle = self.get_render_bounds()
-            bounds: Rectangle = self.get_bounds()
-            invalidated: Rectangle = clip_area.intersection(render_bounds)
+            render_rect, bounds_rect, invalidated_rect = self._render_rects
+            render_bounds: Rectangle = self.get_render_bounds(render_rect)
+            bounds: Rectangle = self.get_bounds(bounds_rect)
+            invalidated: Rectangle = clip_area.intersection(render_bounds, invalidated_rect)
 
             if invalidated.empty:
                 return True
@@ -3318,16 +5283,1021 @@ class Panel(ContainerControl):
 class ScrollableControl(ContainerControl):
     # has display_bounds, scroll_position, scrollbars (non-clients)
     # not necessarily a container
+    #
+    # blit-scroll: after rendering its children the control keeps a copy of the viewport
+    # pixels. When the next frame finds the content scrolled, it moves that copy by the
+    # scroll delta and repaints only the exposed strip. A descendant's invalidate() drops
+    # the copy, so a frame where children changed repaints the viewport in full.
+
+    class ScrolledEvent(EventBase):
+        fields = 'previous', 'actual'
+        pool_size = 4   # one per wheel step or thumb motion
+
+    _init_kwargs: Tuple[str, ...] = ('scrollbars',)
+
     def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
         # client/display bounds and scrolling
         self._display_bounds: Rectangle = Rectangle(0, 0, 32, 32)
+        self._content_size: Size = Size(0, 0)
         # non-client controls
-        self._scrollbars: Scrollbars = SB_AUTO
+        self._scrollbars: Scrollbars = kwargs.get('scrollbars', SB_AUTO)
         self._vscrollbar: 'VScrollbar' = None
         self._hscrollbar: 'HScrollbar' = None
+        # blit-scroll: viewport pixels of the last frame, where and at which offset
+        self._backing: Optional[pg.Surface] = None
+        self._backing_rect: Optional[Tuple[int, int, int, int]] = None
+        self._backing_offset: Tuple[int, int] = (0, 0)
 
         super(ScrollableControl, self).__init__(parent, name, **kwargs)
+        self._vscrollbar = VScrollBar(None, 'vscroll', owner=self)
+        self._update_scrollbars()
+
+    @property
+    def display_bounds(self) -> Rectangle:
+        """The visible part of the content, in content coordinates."""
+        return self._display_bounds
+
+    @property
+    def scroll_position(self) -> Point:
+        return self._display_bounds.location
+
+    @property
+    def content_size(self) -> Size:
+        return self._content_size
+
+    @content_size.setter
+    def content_size(self, value: Size) -> None:
+        self._content_size = Size(*value)
+        self._update_scrollbars()
+
+    def scroll_to(self, y: int) -> None:
+        self._vscrollbar.scroll(y)
+
+    def get_viewport(self) -> Rectangle:
+        # client area left for the content, in local coordinates
+        width: int = self._bounds.width - self._padding.hor
+        if self._vscrollbar is not None and self._vscrollbar._visible:
+            width -= self._vscrollbar.bounds.width
+        return Rectangle(self._padding.left, self._padding.top, width, self._bounds.height - self._padding.ver)
+
+    def get_content_origin(self) -> Tuple[int, int]:
+        x, y = self.get_origin()
+        return x - self._display_bounds._left, y - self._display_bounds._top
+
+    def get_children_clip(self, render_bounds: Rectangle) -> Rectangle:
+        viewport: Rectangle = self.get_viewport()
+        viewport.location = self.position + viewport.location
+        return viewport.intersection(render_bounds)
+
+    def render_children(self, clip: Rectangle) -> None:
+        renderer: RendererBase = Application().get_renderer()
+        viewport: Rectangle = self.get_viewport()
+        x, y = self.get_origin()
+        viewport.set(x + viewport._left, y + viewport._top, viewport._width, viewport._height)
+        # the whole viewport gets painted: its pixels can be kept for the next frame
+        whole: bool = clip == viewport and renderer.get_cliprect().intersection(viewport) == viewport
+        exposed: Optional[Rectangle] = self._blit_scroll(renderer, viewport) if whole else None
+        if exposed is not None:
+            clip = exposed
+        if not clip.empty:
+            self.render_content(clip)
+        if whole and self._vscrollbar._visible:
+            self._store_backing(renderer, viewport)
+        else:
+            self._backing_rect = None
+
+    def render_content(self, clip: Rectangle) -> None:
+        """Paints the content within the screen rectangle: the children, by default."""
+        super().render_children(clip)
+
+    def _blit_scroll(self, renderer: RendererBase, viewport: Rectangle) -> Optional[Rectangle]:
+        """Moves last frame's viewport pixels by the scroll delta; returns the strip left
+        to repaint, or None when they can't be reused."""
+        if self._backing_rect != (viewport._left, viewport._top, viewport._width, viewport._height):
+            return None
+        dx: int = self._display_bounds._left - self._backing_offset[0]
+        dy: int = self._display_bounds._top - self._backing_offset[1]
+        if dx != 0 or dy == 0 or abs(dy) >= viewport._height:
+            return None     # horizontal, still or a whole page: repaint in full
+        surface: pg.Surface = renderer.get_render_target()
+        kept: int = viewport._height - abs(dy)
+        if dy > 0:
+            surface.blit(self._backing, (viewport._left, viewport._top), (0, dy, viewport._width, kept))
+            return Rectangle(viewport._left, viewport._top + kept, viewport._width, dy)
+        surface.blit(self._backing, (viewport._left, viewport._top - dy), (0, 0, viewport._width, kept))
+        return Rectangle(viewport._left, viewport._top, viewport._width, -dy)
+
+    def _store_backing(self, renderer: RendererBase, viewport: Rectangle) -> None:
+        size: Tuple[int, int] = (viewport._width, viewport._height)
+        target: pg.Surface = renderer.get_render_target()
+        if self._backing is None or self._backing.get_size() != size:
+            self._backing = pg.Surface(size, 0, target)
+        self._backing.blit(target, (0, 0),
+                           (viewport._left, viewport._top, viewport._width, viewport._height))
+        self._backing_rect = (viewport._left, viewport._top, viewport._width, viewport._height)
+        self._backing_offset = (self._display_bounds._left, self._display_bounds._top)
+
+    def _update_scrollbars(self) -> None:
+        vscrollbar: VScrollBar = self._vscrollbar
+        height: int = self.get_viewport()._height
+        if self._scrollbars & SB_ALWAYS_VERTICAL == SB_ALWAYS_VERTICAL:
+            vscrollbar.visible = True
+        elif self._scrollbars & SB_NEVER_VERTICAL == SB_NEVER_VERTICAL:
+            vscrollbar.visible = False
+        else:
+            vscrollbar.visible = self._content_size.height > height
+
+        vscrollbar._minimum = 0
+        vscrollbar._maximum = max(0, self._content_size.height - height)
+        vscrollbar._value = max(0, min(vscrollbar._value, vscrollbar._maximum))
+        vscrollbar.set_values(height, max(height, self._content_size.height))
+        vscrollbar.increment = max(1, height // 10)
+        vscrollbar.set_bounds(Point(self._bounds.width - vscrollbar.bounds.width, 0), self._bounds.height)
+
+        viewport: Rectangle = self.get_viewport()
+        self._display_bounds = Rectangle(0, vscrollbar.value, viewport.width, viewport.height)
+        ControlBounds.generation += 1   # the children's screen positions follow the offset
+
+    def process_message(self, message: Message, *params) -> Any:
+        if message is Message.HIT_TEST:
+            position: Point = params[0]
+            if self._vscrollbar is not None and self._visible and self._vscrollbar.visible:
+                obj, test = self._vscrollbar.process_message(message, *params)
+                if obj is not None:
+                    return obj, test
+            return super().process_message(message, *params)
+
+        elif message is Message.MOUSE_WHEEL:
+            if self._vscrollbar._visible:
+                steps: int = params[0]
+                self._vscrollbar.scroll(self._vscrollbar.value + steps * self._vscrollbar.increment * 3)
+                return True
+            return super().process_message(message, *params)
+
+        elif message is Message.SCROLLED:
+            self._display_bounds.top = self._vscrollbar.value
+            ControlBounds.generation += 1
+            handler = getattr(self, '_on_scrolled', lambda sender, evargs: None)
+            evargs: EventArgs = ScrollableControl.ScrolledEvent.Args.acquire(params[1], self._vscrollbar.value)
+            handler(self, evargs)
+            evargs.release()
+            return True
+
+        elif message is Message.SIZECHANGED:
+            result: Any = super().process_message(message, *params)
+            self._update_scrollbars()
+            return result
+
+        elif message is Message.LAYOUT_CHILDREN:
+            result: Any = super().process_message(message, *params)
+            right, bottom = self._content_extent
+            self.content_size = Size(max(0, right - self._padding.left), max(0, bottom - self._padding.top))
+            return result
+
+        else:
+            return super().process_message(message, *params)
+
+
+# vlst
+class VirtualListBox(ScrollableControl):
+    """List of any length that only creates and renders the rows the viewport shows.
+
+    The source is any sequence (len() and indexing); rows are recycled while scrolling.
+    """
+
+    class SelectionChangedEvent(EventBase):
+        fields = 'previous', 'actual'
+
+    class ListRow(ButtonBase):
+
+        _behavior: Behavior = BE_SELECTABLE
+
+        def __init__(self, parent: 'VirtualListBox'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
+            super().__init__(parent, name, layout=LON_MANUAL)
+            self._index: int = -1
+
+        @property
+        def index(self) -> int:
+            return self._index
+
+        def get_state(self) -> str:
+            if not self.enabled:
+                return 'disabled'
+            if self._index >= 0 and self._index == self._parent.selected_index:
+                return 'pressed'
+            if self._pressed_state is BPS_HILIGHTED:
+                return 'hilighted'
+            return 'normal'
+
+        def process_message(self, message: Message, *params) -> Any:
+            if message is Message.MOUSE_RELEASE:
+                if self.enabled and params[0]:
+                    self._parent.selected_index = self._index
+
+            return super().process_message(message, *params)
 
+    _init_kwargs: Tuple[str, ...] = ('source', 'formatter', 'row_height')
+
+    def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
+        self._rows: List[VirtualListBox.ListRow] = []
+        self._source: Any = kwargs.get('source', ())
+        self._formatter: Callable[[Any], str] = kwargs.get('formatter', str)
+        self._row_height: int = 0
+        self._auto_row_height: bool = 'row_height' not in kwargs
+        self._selected_index: int = -1
+        super().__init__(parent, name, **kwargs)
+
+        renderer: RendererBase = Application().get_renderer()
+        self._row_height = int(kwargs.get('row_height', renderer.measure_text(self, "Ag").height + 4))
+        self._update_rows()
+
+    @property
+    def source(self) -> Any:
+        return self._source
+
+    @source.setter
+    def source(self, value: Any) -> None:
+        self._source = value
+        if self._selected_index >= len(value):
+            self._selected_index = -1
+        self._update_rows()
+
+    @property
+    def row_height(self) -> int:
+        return self._row_height
+
+    @property
+    def selected_index(self) -> int:
+        return self._selected_index
+
+    @selected_index.setter
+    def selected_index(self, value: int) -> None:
+        if value != self._selected_index:
+            previous: int = self._selected_index
+            self._selected_index = value
+            self.invalidate()
+            handler = getattr(self, '_on_selectionchanged', lambda sender, evargs: None)
+            handler(self, VirtualListBox.SelectionChangedEvent.Args(previous, value))
+
+    @property
+    def selected_item(self) -> Any:
+        if 0 <= self._selected_index < len(self._source):
+            return self._source[self._selected_index]
+        return None
+
+    def refresh(self) -> None:
+        """Re-reads the visible rows from the source (e.g. after it was modified in place)."""
+        self._update_rows()
+
+    def scroll_into_view(self, index: int) -> None:
+        top: int = index * self._row_height
+        if top < self._display_bounds.top:
+            self.scroll_to(top)
+        elif top + self._row_height > self._display_bounds.bottom:
+            self.scroll_to(top + self._row_height - self._display_bounds.height)
+
+    def get_content_origin(self) -> Tuple[int, int]:
+        return self.get_origin()    # rows are placed in viewport coordinates by _bind_rows()
+
+    def _update_rows(self) -> None:
+        if not self._row_height:
+            return      # still initializing
+        self.content_size = Size(0, len(self._source) * self._row_height)
+        viewport: Rectangle = self.get_viewport()
+        needed: int = viewport.height // self._row_height + 2
+
+        # the pool only grows or shrinks with the viewport, never with the source
+        while len(self._rows) < needed:
+            self._rows.append(VirtualListBox.ListRow(self))
+        while len(self._rows) > needed:
+            self._rows.pop().destroy()
+
+        for row in self._rows:
+            row._bounds.size = Size(viewport.width, self._row_height)
+        self._bind_rows()
+
+    def _bind_rows(self) -> None:
+        viewport: Rectangle = self.get_viewport()
+        offset: int = self._display_bounds.top
+        first: int = offset // self._row_height
+        shift: int = offset % self._row_height
+        count: int = len(self._source)
+        for i, row in enumerate(self._rows):
+            index: int = first + i
+            if index < count:
+                row._index = index
+                row._text = self._formatter(self._source[index])
+                # rows move with the scroll, their pixels with the blit: not row.location
+                row._bounds.location = Point(viewport.left, viewport.top + i * self._row_height - shift)
+                visible: bool = True
+            else:
+                row._index = -1
+                visible = False
+            if visible is not row._visible:
+                # rows are placed here, not by the layout: skip the visible setter's reflow
+                row._visible = visible
+                row._update_effective_state()
+
+    def process_message(self, message: Message, *params) -> Any:
+        if message is Message.SCROLLED:
+            result: Any = super().process_message(message, *params)
+            self._bind_rows()
+            return result
+
+        elif message is Message.SIZECHANGED:
+            result: Any = super().process_message(message, *params)
+            self._update_rows()
+            return result
+
+        elif message is Message.SKINCHANGED:
+            result: Any = super().process_message(message, *params)
+            if self._auto_row_height:
+                self._row_height = Application().get_renderer().measure_text(self, "Ag").height + 4
+                self._update_rows()
+            return result
+
+        elif message is Message.LAYOUT_CHILDREN:
+            return True     # rows are placed by _bind_rows()
+
+        else:
+            return super().process_message(message, *params)
+
+
+# txtv
+class LineViewBase(ScrollableControl, metaclass=ABCMeta):
+    """Read-only view of text lines of a single style, drawn from an LRU cache of line surfaces.
+
+    Subclasses provide line_count and get_line(); only the visible lines are drawn, so
+    scrolling costs O(visible lines) whatever the number of lines.
+    """
+
+    MAX_LINE_CHARS: int = 512       # longer lines are cut when displayed
+
+    _init_kwargs: Tuple[str, ...] = ('cache_size', 'font')
+
+    def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
+        self._line_height: int = 0
+        self._line_cache: OrderedDict = OrderedDict()
+        self._line_cache_state: str = 'normal'     # surfaces carry the state's text colour
+        self._cache_size: int = kwargs.get('cache_size', 256)
+        super().__init__(parent, name, **kwargs)
+
+        renderer: RendererBase = Application().get_renderer()
+        self._font_kind: str = kwargs.get('font', self._get_font_kind(renderer))
+        self._line_height = renderer.get_font(self, self._font_kind).get_linesize()
+
+    def _get_font_kind(self, renderer: RendererBase) -> str:
+        style: Namespace = renderer.get_element(self).style
+        return style.font if 'font' in style else 'code'
+
+    def get_state(self) -> str:
+        return 'normal' if self.enabled else 'disabled'
+
+    @property
+    def line_count(self) -> int:
+        return 0
+
+    @property
+    def line_height(self) -> int:
+        return self._line_height
+
+    @abstractmethod
+    def get_line(self, index: int) -> str:
+        """The text of the line, without its line break."""
+
+    def get_line_key(self, index: int) -> Any:
+        """Identifies the line's text in the surface cache; the index, by default."""
+        return index
+
+    def scroll_to_line(self, index: int) -> None:
+        self.scroll_to(index * self._line_height)
+
+    def _update_content_size(self) -> None:
+        if self._vscrollbar is not None:
+            self.content_size = Size(0, self.line_count * self._line_height)
+
+    def _get_line_surface(self, renderer: RendererBase, index: int) -> pg.Surface:
+        cache: OrderedDict = self._line_cache
+        key: Any = self.get_line_key(index)
+        surface: Optional[pg.Surface] = cache.get(key)
+        if surface is None:
+            surface = renderer.render_text(self, self.get_line(index), self._font_kind)
+            cache[key] = surface
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return surface
+
+    def render_content(self, clip: Rectangle) -> None:
+        count: int = self.line_count
+        if not count:
+            return
+        renderer: RendererBase = Application().get_renderer()
+        state: str = self.get_state()
+        if state != self._line_cache_state:
+            self._line_cache.clear()
+            self._line_cache_state = state
+        x, y = self.get_origin()
+        viewport: Rectangle = self.get_viewport()
+        left: int = x + viewport._left
+        top: int = y + viewport._top - self._display_bounds._top     # of the first line
+        height: int = self._line_height
+        first: int = max(0, (clip._top - top) // height)
+        last: int = min(count, (clip._top + clip._height - top) // height + 1)
+        if first >= last:
+            return
+
+        surface: pg.Surface = renderer.get_render_target()
+        renderer.push_cliprect(clip)
+        for index in range(first, last):
+            surface.blit(self._get_line_surface(renderer, index), (left, top + index * height))
+        renderer.pop_cliprect()
+
+    def process_message(self, message: Message, *params) -> Any:
+        if message is Message.SKINCHANGED:
+            result: Any = super().process_message(message, *params)
+            renderer: RendererBase = Application().get_renderer()
+            self._line_height = renderer.get_font(self, self._font_kind).get_linesize()
+            self._line_cache.clear()
+            self._update_content_size()
+            return result
+
+        elif message is Message.LAYOUT_CHILDREN:
+            return True     # no children: the content size follows the lines
+
+        else:
+            return super().process_message(message, *params)
+
+
+class TextView(LineViewBase):
+    """Read-only view of a text file of any size.
+
+    The file is memory-mapped. Its first lines are indexed on open and the rest by a
+    background task, which feeds the line starts to the UI thread as it goes.
+    """
+
+    FIRST_CHUNK: int = 1 << 16      # bytes indexed synchronously on open
+    INDEX_CHUNK: int = 4 << 20      # bytes indexed between two progress updates
+
+    _init_kwargs: Tuple[str, ...] = ('filename', 'encoding')
+
+    def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
+        self._filename: Optional[str] = None
+        self._encoding: str = kwargs.get('encoding', 'utf-8')
+        self._file: Optional[io.BufferedReader] = None
+        self._map: Optional[mmap.mmap] = None
+        self._size: int = 0
+        self._line_starts: array = array('q', [0])
+        self._indexing: bool = False
+        self._index_stop: Optional[threading.Event] = None
+        self._index_future: Optional[Future] = None
+        self._index_generation: int = 0     # tells a closed file's late progress apart
+        super().__init__(parent, name, **kwargs)
+
+        if kwargs.get('filename'):
+            self.open(kwargs['filename'])
+
+    @property
+    def filename(self) -> Optional[str]:
+        return self._filename
+
+    @property
+    def indexing(self) -> bool:
+        """Whether the line index is still being built."""
+        return self._indexing
+
+    @property
+    def line_count(self) -> int:
+        count: int = len(self._line_starts) - 1
+        if not self._indexing and self._size > self._line_starts[-1]:
+            count += 1      # the last line has no line break
+        return count
+
+    def open(self, filename: str) -> None:
+        self.close()
+        self._filename = filename
+        self._file = open(filename, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        if self._size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # the first screen is indexed right away, the rest in the background
+        first: int = min(self._size, self.FIRST_CHUNK)
+        self._line_starts.frombytes(self._scan(self._map, 0, first))
+        self._indexing = first < self._size
+        if self._indexing:
+            self._index_stop = threading.Event()
+            self._index_future = Application().get_executor().submit(
+                self._index_lines, self._index_generation, self._map, first, self._size, self._index_stop)
+        self._update_content_size()
+
+    def close(self) -> None:
+        data: Optional[mmap.mmap] = self._map
+        file: Optional[io.BufferedReader] = self._file
+        self._map = None
+        self._file = None
+        future: Optional[Future] = self._index_future
+        if future is not None:
+            self._index_stop.set()
+            self._index_future = None
+        if future is None or future.cancel():
+            self._close_map(data, file)
+        else:
+            # the running chunk still reads the map: it is closed once the task ends
+            future.add_done_callback(lambda done: UIRuntime().invoke_async(self._close_map, data, file))
+        self._index_generation += 1
+        self._indexing = False
+        self._filename = None
+        self._size = 0
+        self._line_starts = array('q', [0])
+        self._line_cache.clear()
+        self._update_content_size()
+
+    @staticmethod
+    def _close_map(data: Optional[mmap.mmap], file: Optional[io.BufferedReader]) -> None:
+        if data is not None:
+            data.close()
+        if file is not None:
+            file.close()
+
+    @staticmethod
+    def _scan(data: Optional[mmap.mmap], start: int, end: int) -> bytes:
+        # starts of the lines following each line break in data[start:end], as int64 bytes
+        if data is None or start >= end:
+            return b''
+        if np is not None:
+            breaks: Any = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+            found: bytes = (np.flatnonzero(breaks == 10) + (start + 1)).astype(np.int64).tobytes()
+            del breaks      # release the buffer so the map can be closed
+            return found
+        starts: array = array('q')
+        position: int = data.find(b'\n', start, end)
+        while position != -1:
+            starts.append(position + 1)
+            position = data.find(b'\n', position + 1, end)
+        return starts.tobytes()
+
+    def _index_lines(self, generation: int, data: mmap.mmap, start: int, end: int,
+                     stop: threading.Event) -> None:
+        # runs in a worker thread; the UI thread merges each chunk in _add_line_starts()
+        rt: UIRuntime = UIRuntime()
+        while start < end and not stop.is_set():
+            chunk_end: int = min(end, start + self.INDEX_CHUNK)
+            rt.invoke_async(self._add_line_starts, generation, self._scan(data, start, chunk_end),
+                            chunk_end >= end)
+            start = chunk_end
+
+    def _add_line_starts(self, generation: int, starts: bytes, done: bool) -> None:
+        if generation != self._index_generation:
+            return      # progress of a file closed since
+        self._line_starts.frombytes(starts)
+        if done:
+            self._indexing = False
+            self._index_future = None
+        self._update_content_size()
+
+    def get_line(self, index: int) -> str:
+        """The text of the line, without its line break; tabs are expanded."""
+        starts: array = self._line_starts
+        start: int = starts[index]
+        end: int = starts[index + 1] - 1 if index + 1 < len(starts) else self._size
+        end = min(end, start + self.MAX_LINE_CHARS * 4)     # enough bytes for MAX_LINE_CHARS
+        text: str = self._map[start:end].decode(self._encoding, 'replace').rstrip('\r')
+        return text.expandtabs(4)[:self.MAX_LINE_CHARS]
+
+    def process_message(self, message: Message, *params) -> Any:
+        if message is Message.DESTROYED:
+            self.close()
+            return super().process_message(message, *params)
+
+        else:
+            return super().process_message(message, *params)
+
+
+# logc
+class LogConsole(LineViewBase):
+    """Scrolling log of the last `capacity` lines, fed from any thread.
+
+    Lines are stored in a fixed-size ring, so memory stays bounded however long the
+    stream runs. append_lines() only queues its batch: the queue is merged once per
+    frame on the UI thread, and while the view follows the tail, the new lines scroll
+    in through blit-scroll.
+    """
+
+    _init_kwargs: Tuple[str, ...] = ('capacity', 'auto_scroll')
+
+    def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
+        self._capacity: int = max(1, int(kwargs.get('capacity', 10000)))
+        self._lines: List[Optional[str]] = [None] * self._capacity
+        self._first: int = 0    # serial number of the oldest line kept
+        self._total: int = 0    # serial number of the next line
+        self._auto_scroll: bool = kwargs.get('auto_scroll', True)
+        # lines appended by other threads, waiting for the next frame
+        self._pending: List[str] = []
+        self._pending_dropped: int = 0      # queued lines dropped before they were shown
+        self._pending_lock: threading.Lock = threading.Lock()
+        self._flush_posted: bool = False
+        super().__init__(parent, name, **kwargs)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def auto_scroll(self) -> bool:
+        """Whether the view follows new lines while it is scrolled to the end."""
+        return self._auto_scroll
+
+    @auto_scroll.setter
+    def auto_scroll(self, value: bool) -> None:
+        self._auto_scroll = bool(value)
+
+    @property
+    def line_count(self) -> int:
+        return self._total - self._first
+
+    @property
+    def total_lines(self) -> int:
+        """Lines appended since the console was created or cleared, dropped ones included."""
+        return self._total
+
+    def get_line(self, index: int) -> str:
+        return self._lines[(self._first + index) % self._capacity].expandtabs(4)[:self.MAX_LINE_CHARS]
+
+    def get_line_key(self, index: int) -> int:
+        return self._first + index      # stays with the line while older ones are dropped
+
+    def append(self, text: str) -> None:
+        self.append_lines((text,))
+
+    def append_lines(self, lines: Iterable[str]) -> None:
+        """Queues the lines for display; safe to call from any thread.
+
+        Line breaks within an item split it; the lines show up on the next frame.
+        """
+        batch: List[str] = []
+        for text in lines:
+            text = str(text)
+            if '\n' in text or '\r' in text:
+                batch.extend(line[:self.MAX_LINE_CHARS] for line in text.splitlines())
+            else:
+                batch.append(text[:self.MAX_LINE_CHARS])
+        if not batch:
+            return
+        with self._pending_lock:
+            pending: List[str] = self._pending
+            pending.extend(batch)
+            if len(pending) > self._capacity:
+                self._pending_dropped += len(pending) - self._capacity
+                del pending[:len(pending) - self._capacity]     # would be dropped on arrival
+            post: bool = not self._flush_posted
+            self._flush_posted = True
+        if post:
+            UIRuntime().invoke_async(self._flush)
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self._pending = []
+            self._pending_dropped = 0
+        self._lines = [None] * self._capacity
+        self._first = self._total = 0
+        self._line_cache.clear()
+        self._update_content_size()
+
+    def _flush(self) -> None:
+        # runs in the UI thread, once per frame however many batches were queued
+        with self._pending_lock:
+            batch: List[str] = self._pending
+            dropped: int = self._pending_dropped
+            self._pending = []
+            self._pending_dropped = 0
+            self._flush_posted = False
+        if not batch or self._destroyed or self._vscrollbar is None:
+            return
+
+        vscrollbar: VScrollBar = self._vscrollbar
+        following: bool = self._auto_scroll and vscrollbar._value >= vscrollbar._maximum
+        capacity: int = self._capacity
+        lines: List[Optional[str]] = self._lines
+        first: int = self._first
+        self._total += dropped
+        # the batch is at most `capacity` lines: it wraps around the ring at most once
+        start: int = self._total % capacity
+        head: int = min(len(batch), capacity - start)
+        lines[start:start + head] = batch[:head]
+        lines[:len(batch) - head] = batch[head:]
+        self._total += len(batch)
+        self._first = max(first, self._total - capacity)
+
+        # dropping lines moves the rest up: so do last frame's pixels and the scroll position
+        shift: int = (self._first - first) * self._line_height
+        if shift:
+            self._backing_offset = (self._backing_offset[0], self._backing_offset[1] - shift)
+            vscrollbar._value = max(0, vscrollbar._value - shift)
+        self._update_content_size()
+        if following:
+            self.scroll_to(vscrollbar._maximum)
+
+    def process_message(self, message: Message, *params) -> Any:
+        if message is Message.DESTROYED:
+            self.clear()
+            return super().process_message(message, *params)
+
+        else:
+            return super().process_message(message, *params)
+
+
+# grid
+class DataGrid(ScrollableControl):
+    """Table view of a columnar data source of any size.
+
+    The source is a dict of columns, a sequence of columns (NumPy arrays or sequences
+    of the same length), a 2D array read as (rows, columns) or a structured array. Only
+    the visible cells are drawn, each column keeping an LRU cache of its cell surfaces;
+    resizing a column moves its cells without rasterising them again.
+    """
+
+    MIN_COLUMN_WIDTH: int = 16
+    RESIZE_GRIP: int = 3        # pixels either side of a header edge that start a resize
+    CELL_PADDING: int = 4
+
+    class ColumnResizedEvent(EventBase):
+        fields = 'column', 'previous', 'actual'
+
+    class Column:
+        """A source column and how it is shown; call DataGrid.refresh() after changing
+        its data or formatter."""
+        __slots__ = 'name', 'data', 'width', 'formatter', 'align', '_cache', '_header'
+
+        def __init__(self, name: str, data: Any, width: int) -> None:
+            self.name: str = name
+            self.data: Any = data
+            self.width: int = width
+            numeric: bool = DataGrid._is_numeric(data)
+            floating: bool = np is not None and isinstance(data, np.ndarray) and data.dtype.kind == 'f'
+            self.formatter: Callable[[Any], str] = '{:.6g}'.format if floating else str
+            self.align: str = 'RIGHT' if numeric else 'LEFT'
+            self._cache: OrderedDict = OrderedDict()     # row -> text surface
+            self._header: Optional[pg.Surface] = None
+
+    _init_kwargs: Tuple[str, ...] = ('source', 'column_names', 'column_width', 'cache_size', 'row_height')
+
+    def __init__(self, parent: 'ContainerControl'=DEFAULT, name: str=DEFAULT, **kwargs) -> None:
+        self._columns: List[DataGrid.Column] = []
+        self._column_lefts: List[int] = [0]     # content x of each column edge
+        self._row_count: int = 0
+        self._row_height: int = 0
+        self._auto_row_height: bool = 'row_height' not in kwargs
+        self._column_width: int = kwargs.get('column_width', 96)
+        self._cache_size: int = kwargs.get('cache_size', 128)
+        self._cache_state: str = 'normal'  # surfaces carry the state's text colour
+        self._scroll_left: int = 0
+        self._resizing: Optional[Tuple[int, int]] = None   # column index and width at press
+        super().__init__(parent, name, **kwargs)
+
+        renderer: RendererBase = Application().get_renderer()
+        self._row_height = int(kwargs.get('row_height', renderer.get_font(self).get_linesize() + 2))
+        self.set_source(kwargs.get('source', ()), kwargs.get('column_names'))
+
+    @staticmethod
+    def _is_numeric(data: Any) -> bool:
+        if np is not None and isinstance(data, np.ndarray):
+            return data.dtype.kind in 'iuf'
+        return len(data) > 0 and isinstance(data[0], (int, float)) and not isinstance(data[0], bool)
+
+    @property
+    def source(self) -> List[Any]:
+        return [column.data for column in self._columns]
+
+    @source.setter
+    def source(self, value: Any) -> None:
+        self.set_source(value)
+
+    def set_source(self, source: Any, column_names: Optional[Sequence[str]]=None) -> None:
+        names: List[str] = []
+        if isinstance(source, dict):
+            names, columns = list(source.keys()), list(source.values())
+        elif np is not None and isinstance(source, np.ndarray):
+            if source.dtype.names:
+                names, columns = list(source.dtype.names), [source[name] for name in source.dtype.names]
+            elif source.ndim == 2:
+                columns = [source[:, index] for index in range(source.shape[1])]
+            else:
+                columns = [source]
+        else:
+            columns = list(source)
+        if column_names is not None:
+            names = list(column_names)
+        lengths: set = {len(column) for column in columns}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+
+        names += ["Column {}".format(index + 1) for index in range(len(names), len(columns))]
+        self._columns = [DataGrid.Column(str(names[index]), column, self._column_width)
+                         for index, column in enumerate(columns)]
+        self._row_count = lengths.pop() if lengths else 0
+        self._update_columns()
+
+    @property
+    def columns(self) -> Tuple['DataGrid.Column', ...]:
+        return tuple(self._columns)
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    @property
+    def row_height(self) -> int:
+        return self._row_height
+
+    @property
+    def header_height(self) -> int:
+        return self._row_height
+
+    @property
+    def scroll_left(self) -> int:
+        """The horizontal scroll offset, in pixels."""
+        return self._scroll_left
+
+    @scroll_left.setter
+    def scroll_left(self, value: int) -> None:
+        limit: int = max(0, self._column_lefts[-1] - self.get_viewport().width)
+        value = max(0, min(int(value), limit))
+        if value != self._scroll_left:
+            self._scroll_left = value
+            self._backing_rect = None   # blit-scroll is vertical only
+
+    def get_state(self) -> str:
+        return 'normal' if self.enabled else 'disabled'
+
+    def get_column_width(self, index: int) -> int:
+        return self._columns[index].width
+
+    def set_column_width(self, index: int, width: int) -> None:
+        column: DataGrid.Column = self._columns[index]
+        width = max(self.MIN_COLUMN_WIDTH, int(width))
+        if width != column.width:
+            previous: int = column.width
+            column.width = width
+            self._update_columns()
+            handler = getattr(self, '_on_columnresized', lambda sender, evargs: None)
+            handler(self, DataGrid.ColumnResizedEvent.Args(index, previous, width))
+
+    def get_cell_text(self, row: int, column: int) -> str:
+        col: DataGrid.Column = self._columns[column]
+        return col.formatter(col.data[row])
+
+    def refresh(self) -> None:
+        """Drops the cached cells (e.g. after the source was modified in place)."""
+        for column in self._columns:
+            column._cache.clear()
+            column._header = None
+        self._backing_rect = None
+
+    def scroll_to_row(self, index: int) -> None:
+        self.scroll_to(index * self._row_height)
+
+    def get_viewport(self) -> Rectangle:
+        viewport: Rectangle = super().get_viewport()
+        header: int = min(self._row_height, viewport._height)
+        return viewport.set(viewport._left, viewport._top + header, viewport._width, viewport._height - header)
+
+    def get_header_cells(self) -> List[Tuple[Rectangle, pg.Surface, str]]:
+        """Screen rectangles, text surfaces and alignments of the visible column headers."""
+        renderer: RendererBase = Application().get_renderer()
+        x, y = self.get_origin()
+        viewport: Rectangle = self.get_viewport()
+        left: int = x + viewport._left - self._scroll_left
+        cells: List[Tuple[Rectangle, pg.Surface, str]] = []
+        for index in self._get_visible_columns(viewport):
+            column: DataGrid.Column = self._columns[index]
+            if column._header is None:
+                column._header = renderer.render_text(self, column.name)
+            cell: Rectangle = Rectangle(left + self._column_lefts[index], y + viewport._top - self._row_height,
+                                        column.width, self._row_height)
+            cells.append((cell, column._header, column.align))
+        return cells
+
+    def _get_visible_columns(self, viewport: Rectangle) -> range:
+        lefts: List[int] = self._column_lefts
+        first: int = max(0, bisect.bisect_right(lefts, self._scroll_left) - 1)
+        last: int = bisect.bisect_left(lefts, self._scroll_left + viewport._width)
+        return range(first, min(last, len(self._columns)))
+
+    def _update_columns(self) -> None:
+        lefts: List[int] = [0]
+        for column in self._columns:
+            lefts.append(lefts[-1] + column.width)
+        self._column_lefts = lefts
+        self._backing_rect = None
+        if self._vscrollbar is not None:
+            self.content_size = Size(lefts[-1], self._row_count * self._row_height)
+            self.scroll_left = self._scroll_left
+
+    def _get_cell_surface(self, renderer: RendererBase, column: 'DataGrid.Column', row: int) -> pg.Surface:
+        cache: OrderedDict = column._cache
+        surface: Optional[pg.Surface] = cache.get(row)
+        if surface is None:
+            surface = renderer.render_text(self, column.formatter(column.data[row]))
+            cache[row] = surface
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(row)
+        return surface
+
+    def _get_edge_at(self, position: Point) -> int:
+        # index of the column whose right header edge is under the position, or -1
+        local: Point = self.screen_to_client(position)
+        viewport: Rectangle = self.get_viewport()
+        if not viewport._top - self._row_height <= local.y < viewport._top:
+            return -1
+        x: int = local.x - viewport._left + self._scroll_left
+        for index in reversed(self._get_visible_columns(viewport)):
+            if abs(x - self._column_lefts[index + 1]) <= self.RESIZE_GRIP:
+                return index
+        return -1
+
+    def render_content(self, clip: Rectangle) -> None:
+        if not self._row_count or not self._columns:
+            return
+        renderer: RendererBase = Application().get_renderer()
+        state: str = self.get_state()
+        if state != self._cache_state:
+            self.refresh()
+            self._cache_state = state
+        x, y = self.get_origin()
+        viewport: Rectangle = self.get_viewport()
+        left: int = x + viewport._left - self._scroll_left     # of the first column
+        top: int = y + viewport._top - self._display_bounds._top    # of the first row
+        height: int = self._row_height
+        first: int = max(0, (clip._top - top) // height)
+        last: int = min(self._row_count, (clip._top + clip._height - top) // height + 1)
+        if first >= last:
+            return
+
+        surface: pg.Surface = renderer.get_render_target()
+        gridcolor: pg.Color = renderer.get_palette(self).bordercolor
+        padding: int = self.CELL_PADDING
+        cell_clip: Rectangle = Rectangle(0, 0, 0, 0)
+        for index in self._get_visible_columns(viewport):
+            column: DataGrid.Column = self._columns[index]
+            cell_left: int = left + self._column_lefts[index]
+            clip.intersection(Rectangle(cell_left, clip._top, column.width - 1, clip._height), cell_clip)
+            if cell_clip.empty:
+                continue
+            renderer.push_cliprect(cell_clip)
+            right: bool = column.align == 'RIGHT'
+            for row in range(first, last):
+                text: pg.Surface = self._get_cell_surface(renderer, column, row)
+                tx: int = cell_left + column.width - padding - text.get_width() if right else cell_left + padding
+                surface.blit(text, (tx, top + row * height + (height - text.get_height()) // 2))
+            renderer.pop_cliprect()
+
+            renderer.push_cliprect(clip)
+            edge: int = cell_left + column.width - 1
+            pg.draw.line(surface, gridcolor, (edge, clip._top), (edge, clip._top + clip._height - 1))
+            renderer.pop_cliprect()
+
+    def process_message(self, message: Message, *params) -> Any:
+        if message is Message.MOUSE_PRESS:
+            button: int = params[0]
+            if self.enabled and button == MB_LEFT:
+                index: int = self._get_edge_at(params[1])
+                self._resizing = (index, self._columns[index].width) if index >= 0 else None
+            return super().process_message(message, *params)
+
+        elif message is Message.MOUSE_DRAGGING:
+            if self._resizing is not None:
+                start: Point = params[1]
+                position: Point = params[2]
+                index, width = self._resizing
+                self.set_column_width(index, width + position.x - start.x)
+            return super().process_message(message, *params)
+
+        elif message is Message.MOUSE_RELEASE or message is Message.MOUSE_STOPDRAG:
+            self._resizing = None
+            return super().process_message(message, *params)
+
+        elif message is Message.SIZECHANGED:
+            result: Any = super().process_message(message, *params)
+            self.scroll_left = self._scroll_left
+            return result
+
+        elif message is Message.SKINCHANGED:
+            result: Any = super().process_message(message, *params)
+            if self._auto_row_height:
+                self._row_height = Application().get_renderer().get_font(self).get_linesize() + 2
+            self.refresh()
+            self._update_columns()
+            return result
+
+        elif message is Message.LAYOUT_CHILDREN:
+            return True     # no children: the content size follows the source
+
+        else:
+            return super().process_message(message, *params)
 
 if __name__ == '__main__':
     with Application().start(main_form='form1'):
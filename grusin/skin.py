@@ -471,4 +471,198 @@ DEFAULT_SKIN = {
             'image_kind': 'IMK_NINEPATCH'
         },
     },
+    'ListBox': {
+        'size': (160, 200),
+        'method': 'render_listbox',
+        'image_index': 0,
+        'image_border': (2, 2, 2, 2),
+        'erase_background': True,
+        'render_layers': ('BACKGROUND', 'FOREGROUND'),
+        'style': {
+            'size': 'small',
+            'valign': 'MIDDLE',
+            'halign': 'LEFT',
+            'bold': False,
+            'italic': False,
+            'underline': False,
+        },
+        'layout': {
+            'size': (160, 200),
+            'padding': (1, 1, 1, 1),
+            'margin': (2, 2, 2, 2),
+            'fit': False,
+        },
+        'normal': {
+            'color': (32, 32, 32),
+            'backcolor': (255, 255, 255),
+            'bordercolor': (32, 32, 32),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+        'disabled': {
+            'color': (128, 128, 128),
+            'backcolor': (160, 160, 160),
+            'bordercolor': (128, 128, 128),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+    },
+    'ListRow': {
+        'method': 'render_listrow',
+        'image_index': 0,
+        'image_border': (0, 0, 0, 0),
+        'erase_background': False,
+        'render_layers': ('BACKGROUND', 'ABOVE_BACKGROUND'),
+        'style': {
+            'size': 'small',
+            'valign': 'MIDDLE',
+            'halign': 'LEFT',
+            'bold': False,
+            'italic': False,
+            'underline': False,
+        },
+        'layout': {
+            'size': (160, 18),
+            'padding': (4, 1, 4, 1),
+            'margin': (0, 0, 0, 0),
+            'fit': False,
+        },
+        'normal': {
+            'color': (32, 32, 32),
+            'backcolor': (255, 255, 255),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+        'hilighted': {
+            'color': (0, 0, 0),
+            'backcolor': (224, 232, 255),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+        'pressed': {
+            'color': (255, 255, 255),
+            'backcolor': (32, 32, 248),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+        'disabled': {
+            'color': (128, 128, 128),
+            'backcolor': (160, 160, 160),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+    },
+    'TextView': {
+        'size': (320, 240),
+        'method': 'render_textview',
+        'image_index': 0,
+        'image_border': (2, 2, 2, 2),
+        'erase_background': True,
+        'render_layers': ('BACKGROUND', 'FOREGROUND'),
+        'style': {
+            'font': 'code',     # gui, text or code
+            'size': 'small',
+            'valign': 'TOP',
+            'halign': 'LEFT',
+            'bold': False,
+            'italic': False,
+            'underline': False,
+        },
+        'layout': {
+            'size': (320, 240),
+            'padding': (4, 2, 4, 2),
+            'margin': (2, 2, 2, 2),
+            'fit': False,
+        },
+        'normal': {
+            'color': (32, 32, 32),
+            'backcolor': (255, 255, 255),
+            'bordercolor': (32, 32, 32),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+        'disabled': {
+            'color': (128, 128, 128),
+            'backcolor': (160, 160, 160),
+            'bordercolor': (128, 128, 128),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+    },
+    'LogConsole': {
+        'size': (320, 160),
+        'method': 'render_textview',
+        'image_index': 0,
+        'image_border': (2, 2, 2, 2),
+        'erase_background': True,
+        'render_layers': ('BACKGROUND', 'FOREGROUND'),
+        'style': {
+            'font': 'code',     # gui, text or code
+            'size': 'small',
+            'valign': 'TOP',
+            'halign': 'LEFT',
+            'bold': False,
+            'italic': False,
+            'underline': False,
+        },
+        'layout': {
+            'size': (320, 160),
+            'padding': (4, 2, 4, 2),
+            'margin': (2, 2, 2, 2),
+            'fit': False,
+        },
+        'normal': {
+            'color': (208, 208, 208),
+            'backcolor': (24, 24, 24),
+            'bordercolor': (32, 32, 32),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+        'disabled': {
+            'color': (128, 128, 128),
+            'backcolor': (64, 64, 64),
+            'bordercolor': (128, 128, 128),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+    },
+    'DataGrid': {
+        'size': (480, 240),
+        'method': 'render_datagrid',
+        'image_index': 0,
+        'image_border': (2, 2, 2, 2),
+        'erase_background': True,
+        'render_layers': ('BACKGROUND', 'ABOVE_BACKGROUND', 'FOREGROUND'),
+        'style': {
+            'font': 'gui',
+            'size': 'small',
+            'valign': 'MIDDLE',
+            'halign': 'LEFT',
+            'bold': False,
+            'italic': False,
+            'underline': False,
+        },
+        'layout': {
+            'size': (480, 240),
+            'padding': (1, 1, 1, 1),
+            'margin': (2, 2, 2, 2),
+            'fit': False,
+        },
+        'normal': {
+            'color': (32, 32, 32),
+            'backcolor': (255, 255, 255),
+            'forecolor': (224, 224, 224),   # header
+            'bordercolor': (160, 160, 160),     # grid lines
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+        'disabled': {
+            'color': (128, 128, 128),
+            'backcolor': (160, 160, 160),
+            'forecolor': (176, 176, 176),
+            'bordercolor': (128, 128, 128),
+            'image_area': (0, 0, 1, 1),
+            'image_kind': 'IMK_NINEPATCH'
+        },
+    },
 }
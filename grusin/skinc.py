@@ -0,0 +1,180 @@
+"""Skin compiler.
+
+Validates a skin source (a Python dict literal, as read by Namespace.load) and writes
+its compiled form: a marshal dump of the plain skin records behind a content hash,
+which loads without parsing. The compiled file records the hash of its source, so
+load_skin() falls back to the source when the two have diverged.
+
+usage: python skinc.py SOURCE [-o OUTPUT] [--check]
+"""
+import argparse
+import ast
+import hashlib
+import marshal
+import os
+import sys
+import time
+import zlib
+from typing import Any, Optional, Tuple
+
+__all__ = [
+    'SkinError',
+    'COMPILED_EXT',
+    'compiled_path',
+    'validate_skin',
+    'compile_skin',
+    'read_compiled',
+    'load_skin',
+]
+
+MAGIC: bytes = b'GRUSINSKIN'
+VERSION: int = 1
+COMPILED_EXT: str = '.skinc'
+DIGEST_SIZE: int = 16
+
+STATES: Tuple[str, ...] = ('normal', 'hilighted', 'pressed', 'disabled')
+SECTIONS: Tuple[str, ...] = ('meta', 'metrics')
+
+
+class SkinError(ValueError):
+    pass
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def compiled_path(source: str) -> str:
+    return os.path.splitext(source)[0] + COMPILED_EXT
+
+
+def _plain(value: Any) -> Any:
+    # lists become tuples, as FrozenNamespace would make them anyway
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return tuple(_plain(item) for item in value)
+    return value
+
+
+def _check_ints(where: str, value: Any, count: int, low: int=None, high: int=None) -> None:
+    if not isinstance(value, (tuple, list)) or len(value) != count or \
+            not all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+        raise SkinError("{}: expected {} integers, got {!r}.".format(where, count, value))
+    if low is not None and not all(low <= v <= high for v in value):
+        raise SkinError("{}: values outside ({} .. {}) range: {!r}.".format(where, low, high, value))
+
+
+def _check_colors(where: str, state: dict) -> None:
+    for key, value in state.items():
+        if key.endswith('color'):
+            count: int = 4 if isinstance(value, (tuple, list)) and len(value) == 4 else 3
+            _check_ints("{}.{}".format(where, key), value, count, 0, 255)
+        elif isinstance(value, dict):
+            _check_colors("{}.{}".format(where, key), value)
+
+
+def validate_skin(skin: Any) -> dict:
+    """Checks the skin's structure and colours; returns it as plain, tuple-only records."""
+    if not isinstance(skin, dict):
+        raise SkinError("A skin is a dict, not {}.".format(skin.__class__.__name__))
+    for section in SECTIONS:
+        if not isinstance(skin.get(section), dict):
+            raise SkinError("Missing '{}' section.".format(section))
+    if 'name' not in skin['meta']:
+        raise SkinError("meta: missing 'name'.")
+    for name, element in skin.items():
+        if name in SECTIONS:
+            continue
+        if not isinstance(element, dict):
+            raise SkinError("{}: expected a dict, got {}.".format(name, element.__class__.__name__))
+        for key in ('method', 'render_layers', 'normal'):
+            if key not in element:
+                raise SkinError("{}: missing '{}'.".format(name, key))
+        layout: dict = element.get('layout', {})
+        for key, count in (('margin', 4), ('padding', 4), ('size', 2)):
+            if key in layout:
+                _check_ints("{}.layout.{}".format(name, key), layout[key], count)
+        for state in STATES:
+            if state in element:
+                _check_colors("{}.{}".format(name, state), element[state])
+    return _plain(skin)
+
+
+def compile_skin(source: str, output: Optional[str]=None) -> str:
+    """Validates the skin source file and writes its compiled form; returns the output path."""
+    with open(source, 'rb') as src:
+        data: bytes = src.read()
+    try:
+        skin: Any = ast.literal_eval(data.decode('utf-8'))
+    except (SyntaxError, ValueError) as error:
+        raise SkinError("{}: not a skin literal ({}).".format(source, error)) from None
+    payload: bytes = marshal.dumps((VERSION, _digest(data), validate_skin(skin)))
+    output = output or compiled_path(source)
+    with open(output, 'wb') as compiled:
+        compiled.write(MAGIC)
+        compiled.write(_digest(payload))
+        compiled.write(zlib.compress(payload, 9))
+    return output
+
+
+def read_compiled(filename: str) -> Tuple[bytes, dict]:
+    """The source hash and skin records of a compiled skin."""
+    with open(filename, 'rb') as compiled:
+        data: bytes = compiled.read()
+    if not data.startswith(MAGIC):
+        raise SkinError("'{}' is not a compiled skin.".format(filename))
+    start: int = len(MAGIC) + DIGEST_SIZE
+    payload: bytes = zlib.decompress(data[start:])
+    if _digest(payload) != data[len(MAGIC):start]:
+        raise SkinError("'{}' is corrupt.".format(filename))
+    version, source_digest, skin = marshal.loads(payload)
+    if version != VERSION:
+        raise SkinError("Unsupported compiled skin version: {}.".format(version))
+    return source_digest, skin
+
+
+def load_skin(filename: str) -> dict:
+    """Loads a skin file as plain records: compiled files directly, sources through
+    their compiled form when it is up to date, else by parsing the source."""
+    if filename.endswith(COMPILED_EXT):
+        return read_compiled(filename)[1]
+    with open(filename, 'rb') as src:
+        data: bytes = src.read()
+    compiled: str = compiled_path(filename)
+    if os.path.exists(compiled):
+        try:
+            source_digest, skin = read_compiled(compiled)
+        except (SkinError, ValueError, EOFError, zlib.error):
+            pass
+        else:
+            if source_digest == _digest(data):
+                return skin
+    return _plain(ast.literal_eval(data.decode('utf-8')))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='skinc', description="Validates and compiles a grusin skin.")
+    parser.add_argument('source', help="skin source: a Python dict literal")
+    parser.add_argument('-o', '--output', help="compiled file (default: SOURCE with a {} extension)".format(COMPILED_EXT))
+    parser.add_argument('--check', action='store_true', help="validate only")
+    args = parser.parse_args(argv)
+    try:
+        if args.check:
+            with open(args.source, encoding='utf-8') as src:
+                validate_skin(ast.literal_eval(src.read()))
+            print("{}: ok".format(args.source))
+        else:
+            output: str = compile_skin(args.source, args.output)
+            start: float = time.perf_counter()
+            read_compiled(output)
+            print("{} -> {} ({} bytes, loads in {:.2f} ms)".format(
+                args.source, output, os.path.getsize(output), (time.perf_counter() - start) * 1000))
+    except (SkinError, OSError, SyntaxError, ValueError) as error:
+        print("skinc: {}".format(error), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
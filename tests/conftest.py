@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# grusin imports its skin modules as top-level ones
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'grusin')]
+
+import pygame as pg
+import grusin
+
+
+@pytest.fixture(scope='session')
+def app() -> grusin.Application:
+    application: grusin.Application = grusin.Application()
+    with application.setup(headless=True):
+        pass
+    yield application
+    application.shutdown_executors()
+    pg.quit()
+
+
+@pytest.fixture
+def runtime(app: grusin.Application) -> grusin.UIRuntime:
+    """The UI runtime; topmost controls a test creates are destroyed after it."""
+    rt: grusin.UIRuntime = grusin.UIRuntime()
+    existing: list = list(rt._controls)
+    yield rt
+    for control in [control for control in rt._controls if control not in existing]:
+        control.destroy()
+    rt.validate()
@@ -0,0 +1,52 @@
+import random
+import time
+
+from grusin import ControlList
+
+
+class Item:
+    pass
+
+
+def test_control_list_matches_a_plain_list_under_random_edits():
+    rng = random.Random(7)
+    items = [Item() for _ in range(300)]
+    controls = ControlList(items[:200])
+    model = items[:200]
+    for step in range(3000):
+        action: int = rng.randrange(5)
+        if action == 0 and len(model) < len(items):
+            item = rng.choice([item for item in items if item not in controls])
+            controls.append(item)
+            model.append(item)
+        elif action == 1 and model:
+            item = rng.choice(model)
+            controls.remove(item)
+            model.remove(item)
+        elif action == 2 and model:
+            item = rng.choice(model)
+            controls.move_to_end(item)
+            model.remove(item)
+            model.append(item)
+        elif action == 3 and model:
+            item = rng.choice(model)
+            assert controls.index(item) == model.index(item)
+            position: int = rng.randrange(-len(model), len(model))
+            assert controls[position] is model[position]
+        elif step % 50 == 0:
+            assert list(controls) == model
+        assert len(controls) == len(model)
+    assert list(reversed(controls)) == model[::-1]
+
+
+def test_bring_to_front_and_removal_scale_with_thousands_of_controls():
+    items = [Item() for _ in range(100000)]
+    controls = ControlList(items)
+    started = time.perf_counter()
+    for item in items[::2]:
+        controls.move_to_end(item)
+        controls.index(item)
+    for item in items[1::2]:
+        controls.remove(item)
+    assert time.perf_counter() - started < 2.5
+    assert list(controls) == items[::2]
@@ -0,0 +1,54 @@
+import pytest
+
+from grusin import EventArgs, EventBase
+
+MoveArgs = EventArgs.define('MoveArgs', ('new', 'actual'), pool_size=2)
+
+
+def test_defined_args_take_fields_by_position_or_keyword():
+    evargs = MoveArgs(1, actual=2)
+    assert (evargs.new, evargs.actual) == (1, 2)
+    assert MoveArgs().new is None
+    with pytest.raises(TypeError):
+        MoveArgs(1, 2, 3)
+    with pytest.raises(TypeError):
+        MoveArgs(old=1)
+
+
+def test_handlers_may_set_ad_hoc_attributes_on_plain_args():
+    evargs = EventArgs(value=1)
+    evargs.handled = True
+    assert (evargs.value, evargs.handled) == (1, True)
+    assert evargs.copy().handled
+
+
+def test_defined_args_stay_slotted():
+    evargs = MoveArgs(1, 2)
+    assert not hasattr(evargs, '__dict__')
+    with pytest.raises(AttributeError):
+        evargs.handled = True
+
+
+def test_pooled_args_are_recycled():
+    evargs = MoveArgs.acquire(1, 2)
+    evargs.release()
+    recycled = MoveArgs.acquire(3, 4)
+    assert recycled is evargs
+    assert (recycled.new, recycled.actual) == (3, 4)
+
+
+def test_coroutine_handlers_are_dropped_with_a_warning_without_a_loop(app):
+    class PokeEvent(EventBase):
+        pass
+
+    calls = []
+
+    async def async_handler(sender, evargs):
+        calls.append('async')
+
+    event = PokeEvent()
+    event.attach(async_handler)
+    event.attach(lambda sender, evargs: calls.append('sync'))
+    with pytest.warns(RuntimeWarning, match='no loop is running'):
+        event(None, EventArgs())
+    assert calls == ['sync']
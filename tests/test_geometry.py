@@ -0,0 +1,47 @@
+import operator
+
+import pytest
+
+from grusin import Point, Size, VecBase
+
+BINARY = [operator.add, operator.sub, operator.floordiv, operator.truediv, operator.mod, operator.mul]
+INPLACE = [operator.iadd, operator.isub, operator.ifloordiv, operator.itruediv, operator.imod, operator.imul]
+
+
+@pytest.mark.parametrize('cls', [Point, Size])
+@pytest.mark.parametrize('op', BINARY)
+@pytest.mark.parametrize('other', [3, 2.5, (4, 5), [4, 5], Point(4, 5), Size(4, 5)])
+def test_binary_operators_work_per_component(cls, op, other):
+    pair = (other, other) if isinstance(other, (int, float)) else tuple(other)
+    result = op(cls(17, 23), other)
+    assert type(result) is cls
+    assert tuple(result) == (int(op(17, pair[0])), int(op(23, pair[1])))
+    # the reflected forms keep the vector on the left, as they always did
+    if not isinstance(other, (Point, Size)):
+        reflected = getattr(cls(17, 23), '__r{}__'.format(op.__name__.strip('_')))(other)
+        assert tuple(reflected) == tuple(result)
+
+
+@pytest.mark.parametrize('cls', [Point, Size])
+@pytest.mark.parametrize('op', INPLACE)
+@pytest.mark.parametrize('other', [3, (4, 5), Point(4, 5), Size(4, 5)])
+def test_inplace_operators_update_the_same_object(cls, op, other):
+    pair = (other, other) if isinstance(other, int) else tuple(other)
+    value = cls(17, 23)
+    result = op(value, other)
+    assert result is value
+    assert tuple(value) == (int(op(17, pair[0])), int(op(23, pair[1])))
+
+
+def test_value_types_are_slotted():
+    with pytest.raises(AttributeError):
+        Point(1, 2).z = 3
+    with pytest.raises(AttributeError):
+        Size(1, 2).depth = 3
+
+
+@pytest.mark.parametrize('name', ['__add__', '__sub__', '__floordiv__', '__truediv__', '__mod__', '__mul__',
+                                  '__iadd__', '__isub__', '__ifloordiv__', '__itruediv__', '__imod__', '__imul__'])
+def test_point_and_size_share_the_vector_operators(name):
+    assert name not in vars(Point) and name not in vars(Size)
+    assert getattr(Point, name) is getattr(VecBase, name) is getattr(Size, name)
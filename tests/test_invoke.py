@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pygame as pg
+import pytest
+
+from grusin import UE_INVOKE
+
+
+def test_invoke_runs_inline_on_the_ui_thread(runtime):
+    assert runtime.invoke(lambda a, b=0: a + b, 1, b=2) == 3
+    assert not runtime._invoke_queue
+
+
+def test_invoke_from_a_worker_posts_a_wake_up_and_runs_on_the_ui_thread(runtime):
+    pg.event.clear()
+    ran_on = []
+    result = []
+    worker = threading.Thread(target=lambda: result.append(runtime.invoke(
+        lambda: ran_on.append(threading.get_ident()) or 'done')))
+    worker.start()
+
+    deadline: float = time.perf_counter() + 5
+    while worker.is_alive() and time.perf_counter() < deadline:
+        events = pg.event.get()
+        if events:
+            assert UE_INVOKE in [event.type for event in events]
+        runtime.process_events(events)
+        time.sleep(0.001)
+    worker.join(1)
+    assert result == ['done']
+    assert ran_on == [threading.get_ident()]
+
+
+def test_invoke_budget_spreads_the_queue_over_frames(runtime):
+    previous: int = runtime.invoke_budget
+    runtime.invoke_budget = 0
+    try:
+        futures = [runtime.invoke_async(lambda index=index: index) for index in range(3)]
+        runtime.process_invoked()
+        assert [future.done() for future in futures] == [True, False, False]
+        assert runtime._invoke_posted       # woken up again for the rest
+        runtime.process_invoked()
+        runtime.process_invoked()
+        assert [future.result() for future in futures] == [0, 1, 2]
+    finally:
+        runtime.invoke_budget = previous
+        pg.event.clear()
+
+
+def test_invoked_exceptions_reach_the_future(runtime):
+    future = runtime.invoke_async(lambda: 1 // 0)
+    runtime.process_invoked()
+    with pytest.raises(ZeroDivisionError):
+        future.result(0)
@@ -0,0 +1,73 @@
+import pygame as pg
+
+from grusin import Application, ControlBounds, LatencyMonitor, PushButton, Size
+
+MOTION = pg.event.Event(pg.MOUSEMOTION, pos=(900, 500), rel=(1, 0), buttons=(0, 0, 0))
+KEY = pg.event.Event(pg.KEYDOWN, key=pg.K_a, mod=0, unicode='a', scancode=4)
+
+
+def _frame(monitor: LatencyMonitor, events: list, changes) -> None:
+    # what UIRuntime.process_events and the renderer report for one frame
+    monitor.arrived(events)
+    for event in events:
+        monitor.dispatching(event)
+        changes(event)
+    monitor.dispatching(None)
+    monitor.mark('input')
+    monitor.mark('layout')
+    monitor.mark('render')
+    monitor.presented()
+
+
+def test_input_is_measured_only_when_it_changes_the_screen():
+    monitor = LatencyMonitor()
+    _frame(monitor, [MOTION, MOTION], lambda event: None)
+    assert len(monitor.get_histogram()) == 0
+
+    _frame(monitor, [MOTION, KEY], lambda event: event is KEY and monitor.invalidated())
+    assert len(monitor.get_histogram()) == 1
+    assert len(monitor.get_histogram('input')) == 1
+    assert len(monitor.get_histogram('present')) == 1
+
+
+def test_an_event_is_stamped_once_however_much_it_invalidates():
+    monitor = LatencyMonitor()
+    _frame(monitor, [KEY], lambda event: (monitor.invalidated(), monitor.invalidated()))
+    assert len(monitor.get_histogram()) == 1
+
+
+def test_moving_a_control_counts_as_a_change():
+    monitor = LatencyMonitor()
+
+    def move(event) -> None:
+        ControlBounds.generation += 1
+
+    _frame(monitor, [KEY], move)
+    assert len(monitor.get_histogram()) == 1
+
+
+def test_non_input_events_are_not_measured():
+    monitor = LatencyMonitor()
+    _frame(monitor, [pg.event.Event(pg.USEREVENT + 5)], lambda event: monitor.invalidated())
+    assert len(monitor.get_histogram()) == 0
+
+
+def test_runtime_reports_to_a_started_monitor(runtime):
+    button = PushButton()
+    button.size = Size(80, 24)
+    runtime.validate()
+    renderer = Application().get_renderer()
+    monitor = LatencyMonitor().start()
+    try:
+        runtime.process_events([MOTION])
+        renderer.update()
+        assert len(monitor.get_histogram()) == 0
+
+        position = button.position
+        runtime.process_events([pg.event.Event(pg.MOUSEMOTION, pos=(position.x + 4, position.y + 4),
+                                               rel=(1, 0), buttons=(0, 0, 0))])
+        runtime.validate()
+        renderer.update()
+        assert len(monitor.get_histogram()) == 1
+    finally:
+        monitor.stop()
@@ -0,0 +1,52 @@
+from grusin import LON_BELOW, LON_SAMELINE, Panel, PushButton
+
+
+def _row(runtime, count: int=3) -> Panel:
+    panel = Panel(layout=LON_BELOW)
+    with panel:
+        for index in range(count):
+            button = PushButton(layout=LON_SAMELINE)
+            button.text = 'b{}'.format(index)
+    runtime.validate()
+    return panel
+
+
+def test_text_change_reflows_the_following_siblings_and_refits_the_parent(runtime):
+    panel = _row(runtime)
+    first, second, third = panel._children
+    width, left, panel_width = first.size.width, second.location.x, panel.size.width
+    gap: int = third.location.x - second.location.x
+
+    first.text = 'a much longer caption'
+    runtime.validate()
+
+    grown: int = first.size.width - width
+    assert grown > 0
+    assert second.location.x == left + grown
+    assert third.location.x == second.location.x + gap
+    assert panel.size.width == panel_width + grown
+
+
+def test_hidden_controls_take_no_space(runtime):
+    panel = _row(runtime)
+    first, second, third = panel._children
+    second_left, third_left = second.location.x, third.location.x
+
+    second.visible = False
+    runtime.validate()
+    assert third.location.x == second_left
+
+    second.visible = True
+    runtime.validate()
+    assert (second.location.x, third.location.x) == (second_left, third_left)
+
+
+def test_a_change_remeasures_only_its_own_branch(runtime):
+    changed, untouched = _row(runtime), _row(runtime)
+    cached = untouched._desired_size
+
+    changed._children[0].text = 'longer caption'
+    runtime.validate()
+
+    assert changed._desired_size is not None
+    assert untouched._desired_size is cached
@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+from grusin import LON_BELOW, LON_CASCADE, LON_NEWLINE, LON_SAMELINE, _solve_layout, _solve_layout_batch
+
+pytest.importorskip('numpy')
+
+CODES = [LON_SAMELINE.value, LON_BELOW.value, LON_NEWLINE.value, LON_CASCADE.value]
+
+
+def test_batch_solver_matches_the_plain_loop():
+    rng = random.Random(34)
+    for case in range(3000):
+        count: int = rng.randint(1, 40)
+        codes = [rng.choice(CODES) for _ in range(count)]
+        widths = [rng.randint(0, 200) for _ in range(count)]
+        heights = [rng.randint(0, 80) for _ in range(count)]
+        margins = tuple([rng.randint(0, 12) for _ in range(count)] for _ in range(4))
+        left, top = rng.randint(0, 50), rng.randint(0, 50)
+
+        xs, ys, right, bottom = _solve_layout([None] * count, codes, widths, heights, margins, left, top)
+        batch_xs, batch_ys, batch_right, batch_bottom = _solve_layout_batch(codes, widths, heights, margins,
+                                                                            left, top)
+        assert (batch_xs.tolist(), batch_ys.tolist(), batch_right, batch_bottom) == (xs, ys, right, bottom), case
@@ -0,0 +1,46 @@
+import pytest
+
+from grusin import FrozenNamespace, Namespace, RendererBase
+from skin import DEFAULT_SKIN
+
+
+def test_freeze_and_thaw_round_trip_the_skin():
+    frozen = FrozenNamespace(**DEFAULT_SKIN)
+    thawed = FrozenNamespace.thaw(frozen)
+    assert type(thawed) is Namespace and type(thawed.metrics.font) is Namespace
+    assert thawed.freeze() == frozen
+    assert frozen.metrics.image.skin.filenames == ()        # lists become tuples
+
+
+def test_frozen_namespaces_are_read_only():
+    frozen = FrozenNamespace(a=1, nested={'b': 2})
+    with pytest.raises(AttributeError):
+        frozen.a = 2
+    with pytest.raises(AttributeError):
+        frozen.nested.b = 3
+    with pytest.raises(TypeError):
+        frozen['a'] = 2
+    with pytest.raises(AttributeError):
+        del frozen.a
+    assert frozen.freeze() is frozen
+
+
+def test_thawed_copies_do_not_touch_the_frozen_original():
+    frozen = FrozenNamespace(nested={'b': 2})
+    thawed = FrozenNamespace.thaw(frozen)
+    thawed.nested.b = 3
+    assert frozen.nested.b == 2 and thawed.freeze().nested.b == 3
+
+
+def test_keys_that_shadow_method_names():
+    frozen = FrozenNamespace(freeze=1, thaw={'items': 2, 'keys': 3}, values=4)
+    assert (frozen.freeze, frozen.thaw.items, frozen.values) == (1, 2, 4)
+    assert sorted(frozen) == ['freeze', 'thaw', 'values']
+    internal = FrozenNamespace(_dict=5)
+    assert internal['_dict'] == 5 and internal._dict['_dict'] == 5     # the property still wins
+
+    thawed = FrozenNamespace.thaw(frozen)
+    assert thawed['freeze'] == 1 and thawed['thaw']['keys'] == 3
+    assert thawed.freeze() == frozen
+    assert RendererBase._to_skin(frozen) is frozen
+    assert RendererBase._to_skin(Namespace(freeze=1))['freeze'] == 1
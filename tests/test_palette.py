@@ -0,0 +1,63 @@
+import copy
+
+import pytest
+
+from grusin import (Application, BLACK, BPS_HILIGHTED, BPS_NORMAL, BPS_PRESSED, CheckBox, Color, FrozenNamespace,
+                    PALETTE_DERIVED, PushButton, RendererBase, VirtualListBox)
+from skin import DEFAULT_SKIN
+from skinc import STATES
+
+
+def test_every_element_has_a_palette_for_every_state(app):
+    renderer = Application().get_renderer()
+    for element in set(renderer._render_methods.values()):
+        if element in DEFAULT_SKIN:
+            assert set(STATES) <= set(renderer._palettes[element]), element
+
+
+@pytest.mark.parametrize('control_class', [PushButton, CheckBox])
+def test_buttons_find_a_palette_in_every_state(runtime, control_class):
+    renderer = Application().get_renderer()
+    button = control_class()
+    palettes = renderer._palettes[renderer._render_methods[control_class.__name__]]
+    seen = set()
+    for pressed in (BPS_NORMAL, BPS_HILIGHTED, BPS_PRESSED):
+        button._pressed_state = pressed
+        seen.add(button.get_state())
+        assert renderer.get_palette(button) is palettes[button.get_state()]
+    button.enabled = False
+    seen.add(button.get_state())
+    renderer.get_palette(button)
+    assert seen == set(STATES)
+
+
+def test_list_rows_and_scrollbars_find_their_palettes(runtime):
+    renderer = Application().get_renderer()
+    listbox = VirtualListBox(source=list(range(100)))
+    runtime.validate()
+    for control in [listbox, listbox._vscrollbar] + listbox._rows:
+        renderer.get_palette(control)
+        control.enabled = False
+        renderer.get_palette(control)
+    listbox.enabled = True
+
+
+def test_omitted_states_are_derived_from_normal():
+    skin = copy.deepcopy(DEFAULT_SKIN)
+    skin['PushButton'].pop('pressed', None)
+    skin['PushButton']['disabled'] = copy.deepcopy(skin['PushButton']['normal'])
+    palettes = RendererBase._make_palettes(FrozenNamespace(**skin), ['PushButton'])['PushButton']
+
+    toward, ratio = PALETTE_DERIVED['pressed']
+    normal, pressed = palettes['normal'].backcolor, palettes['pressed'].backcolor
+    assert pressed == Color(normal.r, normal.g, normal.b).mix(toward, ratio).color
+    assert toward is BLACK
+    assert palettes['disabled'].backcolor == normal       # given explicitly: not derived
+
+
+def test_colors_are_immutable():
+    color = Color(10, 20, 30)
+    with pytest.raises(AttributeError):
+        color.r = 0
+    assert color.inverse().inverse() is color
+    assert hash(color) == hash(Color(10, 20, 30))
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from grusin import LON_SAMELINE, Panel, Point, PushButton, RECT_BATCH_THRESHOLD, RectArray, Rectangle, Size
+
+pytest.importorskip('numpy')
+
+
+def _random_rects(rng: random.Random, count: int) -> list:
+    return [Rectangle(rng.randint(-20, 200), rng.randint(-20, 200), rng.randint(0, 60), rng.randint(0, 60))
+            for _ in range(count)]
+
+
+def test_rect_array_tests_follow_rectangle_semantics():
+    rng = random.Random(41)
+    rects = _random_rects(rng, 300)
+    array = RectArray(rects)
+    for _ in range(200):
+        clip: Rectangle = _random_rects(rng, 1)[0]
+        point: Point = Point(rng.randint(-20, 260), rng.randint(-20, 260))
+        assert array.intersects(clip).tolist() == [rect.intersects(clip) for rect in rects]
+        assert array.contains_point(point).tolist() == [rect.contains(point) for rect in rects]
+        overlaps: RectArray = array.intersection(clip)
+        assert [tuple(overlaps[i]) for i in range(len(rects))] == [tuple(rect.intersection(clip)) for rect in rects]
+
+
+def test_translate_and_expand():
+    array = RectArray([Rectangle(10, 20, 30, 40)])
+    assert tuple(array.translate(5, -5)[0]) == (15, 15, 30, 40)
+    assert tuple(array.expand([(1, 2, 3, 4)])[0]) == (9, 18, 34, 46)
+
+
+def test_batched_hit_testing_matches_the_children_one_by_one(runtime):
+    panel = Panel()
+    with panel:
+        for index in range(RECT_BATCH_THRESHOLD * 2):
+            PushButton(layout=LON_SAMELINE).text = str(index)
+    panel.size = Size(600, 400)
+    runtime.validate()
+    assert panel.get_children_rects() is not None
+
+    rng = random.Random(7)
+    origin: Point = panel.position
+    found: int = 0
+    for _ in range(200):
+        position: Point = origin + Point(rng.randint(-10, 610), rng.randint(-10, 410))
+        hits = panel.children_at(position)
+        assert hits == [child for child in panel._children if child.contains(position)]
+        found += bool(hits)
+        clip = Rectangle(position.x, position.y, rng.randint(0, 80), rng.randint(0, 80))
+        padded: Rectangle = Rectangle(0, 0, 0, 0)
+        assert panel.children_in(clip) == [child for child in panel._children
+                                           if clip.intersects(child.get_bounds(padded).expand(child._padding))]
+    assert found > 0
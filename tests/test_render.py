@@ -0,0 +1,64 @@
+import pygame as pg
+import pytest
+
+from grusin import Application, CheckBox, DataGrid, LON_BELOW, LON_SAMELINE, Point, PushButton, ScrollableControl, Size
+
+
+class ScrollPanel(ScrollableControl):
+    pass
+
+
+def _screen() -> bytes:
+    return pg.image.tostring(pg.display.get_surface(), 'RGB')
+
+
+def _scroll_panel(runtime, control_class: type=CheckBox) -> ScrollPanel:
+    Application().get_renderer().add_renderer('ScrollPanel', 'Panel')
+    panel = ScrollPanel(layout=LON_SAMELINE)
+    panel.size = Size(300, 200)
+    with panel:
+        for index in range(60):
+            control = control_class(layout=LON_BELOW if index % 3 == 0 else LON_SAMELINE)
+            control.text = 'c{}'.format(index)
+    runtime.validate()
+    runtime.validate()
+    return panel
+
+
+def test_children_changed_while_scrolling_are_repainted(runtime):
+    panel = _scroll_panel(runtime)
+
+    for delta in (7, -5, 9):
+        panel.scroll_to(panel.display_bounds.top + delta)
+        for checkbox in panel._children[:12]:
+            checkbox.checked = not checkbox.checked
+        runtime.validate()
+        scrolled: bytes = _screen()
+        panel._backing_rect = None
+        runtime.validate()
+        assert scrolled == _screen()
+
+
+def test_grid_scrolls_to_its_last_row_and_no_further(runtime):
+    grid = DataGrid(source={'a': list(range(100)), 'b': list(range(100))})
+    grid.size = Size(300, 200)
+    runtime.validate()
+
+    assert grid.content_size.height == grid.row_count * grid.row_height
+    assert grid._vscrollbar._maximum == grid.content_size.height - grid.get_viewport().height
+
+
+@pytest.mark.parametrize('change', [
+    lambda child: setattr(child, 'location', child.location + Point(9, 4)),
+    lambda child: setattr(child, 'size', Size(150, 20)),
+], ids=['move', 'resize'])
+def test_children_moved_while_scrolling_are_repainted(runtime, change):
+    panel = _scroll_panel(runtime, PushButton)
+    for delta in (5, -5, 5):
+        panel.scroll_to(panel.display_bounds.top + delta)
+        change(panel._children[3 + panel.display_bounds.top // 30 * 3])
+        runtime.validate()
+        scrolled: bytes = _screen()
+        panel._backing_rect = None
+        runtime.validate()
+        assert scrolled == _screen()
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from grusin import Control, HSlider, Size, VirtualListBox
+
+
+def test_recycled_rows_stay_out_of_the_layout_sequence(runtime):
+    cursor = runtime._cursor_stack[0]
+    listbox = VirtualListBox(source=list(range(1000)))
+    runtime.validate()
+    registered = len(cursor)
+
+    for step in range(50):
+        listbox.size = Size(200, 100 + step * 10)
+        runtime.validate()
+
+    assert len(cursor) == registered
+    assert len(listbox._rows) == listbox.get_viewport().height // listbox.row_height + 2
+
+
+def test_build_passes_constructor_keywords_to_the_constructor(runtime, monkeypatch):
+    renamed = []
+    setter = Control.name.fset
+    monkeypatch.setattr(Control, 'name', Control.name.setter(lambda self, value: (renamed.append(value),
+                                                                                   setter(self, value))))
+    runtime._spec_setters.clear()
+    panel, = runtime.build([{'type': 'Panel', 'name': 'built_panel',
+                             'children': [{'type': HSlider, 'name': 'built_slider', 'value': 30}]}])
+    runtime._spec_setters.clear()
+
+    assert renamed == []
+    assert runtime.find_by_name('built_panel') is panel
+    assert panel.find_by_name('built_slider').value == 30
+
+
+@pytest.mark.parametrize('spec_type', ['NoSuchControl', 'Rectangle', 'find_path', 42])
+def test_build_rejects_types_that_are_not_controls(runtime, spec_type):
+    with pytest.raises(ValueError):
+        runtime.build([{'type': spec_type}])
+
+
+def test_named_siblings_build_and_destroy_in_linear_time(runtime):
+    count = 5000
+    start = time.perf_counter()
+    panel, = runtime.build([{'type': 'Panel', 'name': 'named_siblings',
+                             'children': [{'type': 'PushButton', 'name': 'named%d' % i} for i in range(count)]}])
+    for child in list(panel._children)[::2]:
+        child.name = child.name + '_renamed'
+    for child in list(panel._children):
+        child.destroy()
+    elapsed = time.perf_counter() - start
+
+    assert len(panel._children) == 0
+    assert panel.find_by_name('named1') is None
+    assert elapsed < 2.0, "{} named siblings took {:.2f} s".format(count, elapsed)
+
+
+def test_repeated_names_resolve_to_the_earliest_registered(runtime):
+    panel, = runtime.build([{'type': 'Panel', 'children': [
+        {'type': 'PushButton', 'name': 'twin'}, {'type': 'PushButton', 'name': 'twin'}]}])
+    first, second = panel._children
+    assert panel.find_by_name('twin') is first
+    first.destroy()
+    assert panel.find_by_name('twin') is second
+    second.name = 'single'
+    assert panel.find_by_name('twin') is None and panel.find_by_name('single') is second
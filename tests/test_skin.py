@@ -0,0 +1,35 @@
+import copy
+import pprint
+
+import pytest
+
+from grusin import Application, SkinReloadWarning, SkinWatcher
+from skin import DEFAULT_SKIN
+
+
+def _broken_missing_image(skin: dict) -> None:
+    skin['metrics']['image']['skin']['filenames'] = ['no-such-image.png']
+    skin['PushButton']['normal']['backcolor'] = (200, 0, 0)
+
+
+def _broken_missing_style(skin: dict) -> None:
+    del skin['PushButton']['style']
+    skin['metrics']['default']['erase_color'] = (1, 2, 3)
+
+
+@pytest.mark.parametrize('breakage', [_broken_missing_image, _broken_missing_style])
+def test_failed_skin_reload_warns_and_keeps_the_current_skin(runtime, tmp_path, breakage):
+    renderer = Application().get_renderer()
+    skin: dict = copy.deepcopy(DEFAULT_SKIN)
+    breakage(skin)
+    path = tmp_path / 'broken.skin'
+    path.write_text(pprint.pformat(skin))
+    current, fonts, palettes = renderer._skin, renderer.gui_font, dict(renderer._palettes)
+    erase_color = renderer.erase_color
+
+    with pytest.warns(SkinReloadWarning):
+        assert not SkinWatcher(str(path)).reload()
+    assert renderer._skin is current
+    assert renderer.gui_font is fonts
+    assert renderer._palettes == palettes
+    assert renderer.erase_color == erase_color
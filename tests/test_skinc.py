@@ -0,0 +1,52 @@
+import copy
+import pprint
+
+import pytest
+
+import skinc
+from skin import DEFAULT_SKIN
+from skinc import SkinError, compile_skin, compiled_path, load_skin, read_compiled, validate_skin
+
+
+def _source(tmp_path, skin: dict=DEFAULT_SKIN) -> str:
+    path = tmp_path / 'test.skin'
+    path.write_text(pprint.pformat(skin))
+    return str(path)
+
+
+def test_compiled_skin_round_trips(tmp_path):
+    source: str = _source(tmp_path)
+    output: str = compile_skin(source)
+    assert output == compiled_path(source) == str(tmp_path / 'test.skinc')
+
+    expected: dict = validate_skin(copy.deepcopy(DEFAULT_SKIN))
+    assert read_compiled(output)[1] == expected
+    assert load_skin(output) == expected
+    assert load_skin(source) == expected
+
+
+def test_an_up_to_date_compiled_skin_loads_without_parsing(tmp_path, monkeypatch):
+    source: str = _source(tmp_path)
+    compile_skin(source)
+    monkeypatch.setattr(skinc.ast, 'literal_eval', lambda text: pytest.fail("source parsed"))
+    assert load_skin(source)['meta']['name'] == DEFAULT_SKIN['meta']['name']
+
+
+def test_a_changed_source_falls_back_to_parsing(tmp_path):
+    source: str = _source(tmp_path)
+    compile_skin(source)
+    skin: dict = copy.deepcopy(DEFAULT_SKIN)
+    skin['meta']['name'] = 'edited'
+    _source(tmp_path, skin)
+    assert load_skin(source)['meta']['name'] == 'edited'
+
+
+def test_a_corrupt_compiled_skin_falls_back_to_parsing(tmp_path):
+    source: str = _source(tmp_path)
+    output: str = compile_skin(source)
+    with open(output, 'r+b') as compiled:
+        compiled.seek(len(skinc.MAGIC))
+        compiled.write(bytes(skinc.DIGEST_SIZE))
+    with pytest.raises(SkinError):
+        read_compiled(output)
+    assert load_skin(source) == validate_skin(copy.deepcopy(DEFAULT_SKIN))
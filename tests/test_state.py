@@ -0,0 +1,47 @@
+from grusin import Panel, PushButton, VirtualListBox
+
+
+def _nested(runtime):
+    outer = Panel()
+    with outer:
+        inner = Panel()
+        with inner:
+            button = PushButton()
+    runtime.validate()
+    return outer, inner, button
+
+
+def test_disabling_an_ancestor_disables_the_subtree(runtime):
+    outer, inner, button = _nested(runtime)
+    button.enabled = False
+    outer.enabled = False
+    assert not inner.enabled and not button.enabled
+
+    outer.enabled = True
+    assert inner.enabled
+    assert not button.enabled       # its own flag still holds
+    button.enabled = True
+    assert button.enabled
+
+
+def test_hiding_an_ancestor_hides_the_subtree(runtime):
+    outer, inner, button = _nested(runtime)
+    inner.visible = False
+    assert outer.visible and not button.visible
+
+    with inner:
+        late = PushButton()
+    assert not late.visible
+
+    inner.visible = True
+    assert button.visible and late.visible
+
+
+def test_non_clients_follow_their_owner(runtime):
+    listbox = VirtualListBox(source=list(range(100)))
+    runtime.validate()
+    scrollbar = listbox._vscrollbar
+    listbox.enabled = False
+    assert not scrollbar.enabled
+    listbox.enabled = True
+    assert scrollbar.enabled
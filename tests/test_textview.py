@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from grusin import LineViewBase, LogConsole, Size, TextView
+
+
+def test_line_views_must_provide_get_line(runtime):
+    with pytest.raises(TypeError):
+        LineViewBase()
+
+
+def test_close_does_not_wait_for_the_indexing_task(runtime, tmp_path, monkeypatch):
+    path = tmp_path / 'big.log'
+    path.write_bytes(b'line\n' * (TextView.FIRST_CHUNK // 2))
+    gate = threading.Event()
+    scan = TextView._scan
+
+    def gated_scan(data, start, end):
+        if start >= TextView.FIRST_CHUNK:
+            gate.wait(5)
+        return scan(data, start, end)
+
+    monkeypatch.setattr(TextView, '_scan', staticmethod(gated_scan))
+    view = TextView(filename=str(path))
+    data, future = view._map, view._index_future
+    assert view.indexing
+
+    started = time.perf_counter()
+    view.close()
+    assert time.perf_counter() - started < 1.0
+    assert view._map is None and not data.closed
+
+    gate.set()
+    future.result(5)
+    deadline: float = time.perf_counter() + 5
+    while not data.closed and time.perf_counter() < deadline:
+        runtime.process_events([])      # runs the close queued by the task's completion
+        time.sleep(0.001)
+    assert data.closed
+
+
+def _lines(console) -> list:
+    return [console.get_line(index) for index in range(console.line_count)]
+
+
+def test_log_console_ring_wraps_around(runtime):
+    console = LogConsole(capacity=5)
+    console.size = Size(200, 100)
+    runtime.validate()
+
+    console.append_lines(['l0', 'l1', 'l2'])
+    console.append_lines(['l3\nl4', 'l5'])     # merged once, on the next frame
+    assert console.line_count == 0
+    runtime.process_invoked()
+    assert (console.line_count, console.total_lines) == (5, 6)
+    assert _lines(console) == ['l1', 'l2', 'l3', 'l4', 'l5']
+    assert console.get_line_key(0) == 1
+
+    for index in range(6, 9):
+        console.append('l{}'.format(index))
+    runtime.process_invoked()
+    assert _lines(console) == ['l4', 'l5', 'l6', 'l7', 'l8']
+    assert console._first % console.capacity != 0      # the oldest line is mid-ring
+
+
+def test_log_console_drops_a_batch_longer_than_the_ring(runtime):
+    console = LogConsole(capacity=5)
+    console.size = Size(200, 100)
+    runtime.validate()
+
+    console.append_lines('l{}'.format(index) for index in range(13))
+    runtime.process_invoked()
+    assert (console.line_count, console.total_lines) == (5, 13)
+    assert _lines(console) == ['l8', 'l9', 'l10', 'l11', 'l12']
+    assert [console.get_line_key(index) for index in (0, 4)] == [8, 12]
+
+    console.clear()
+    assert (console.line_count, console.total_lines) == (0, 0)